@@ -20,12 +20,17 @@ import pygame
 import math
 import random
 import sys
-import struct
-import io
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass, field, fields
 
 # Web version - no file saving, no networking
 WEB_VERSION = True
 
+# Per-frame features switched off while tracking down browser freezes
+CLOUD_LOGIN_CHECK_ENABLED = False
+ONLINE_SYNC_ENABLED = False
+
 pygame.init()
 # Disable mixer for web (causes issues)
 try:
@@ -34,101 +39,148 @@ except:
     pass
 
 
+def _beat_segments(num_samples, sample_rate, beat_duration):
+    """Yield (beat_index, start, end) sample ranges that fall inside each beat"""
+    start = 0
+    beat_index = 0
+    while start < num_samples:
+        # First sample of the next beat, nudged to match int(t / beat_duration) exactly
+        end = min(num_samples, int((beat_index + 1) * beat_duration * sample_rate))
+        while end < num_samples and int(end / sample_rate / beat_duration) <= beat_index:
+            end += 1
+        while end > start + 1 and int((end - 1) / sample_rate / beat_duration) > beat_index:
+            end -= 1
+        yield beat_index, start, end
+        start = end
+        beat_index += 1
+
+
+def _sine_seed(step, start):
+    """Recurrence state for sin(step * i) from sample index start:
+    (2cos(step), sin at start - 1, sin at start)"""
+    return 2 * math.cos(step), math.sin(step * (start - 1)), math.sin(step * start)
+
+
+def mixer_frequency():
+    """Sample rate the mixer actually opened with (music must be synthesized at it)"""
+    init = pygame.mixer.get_init()
+    return init[0] if init else 44100
+
+
+def _music_sound(audio_data):
+    """Mixer Sound from 16-bit mono samples, copied into every mixer channel"""
+    mono = audio_data if isinstance(audio_data, array) else array('h', audio_data)
+    init = pygame.mixer.get_init()
+    channels = init[2] if init else 2
+    if channels == 1:
+        frames = mono
+    else:
+        # Interleave the same sample into each channel with one slice copy per channel
+        frames = array('h', bytes(len(mono) * 2 * channels))
+        for channel in range(channels):
+            frames[channel::channels] = mono
+    if sys.byteorder != 'little':
+        frames = array('h', frames)
+        frames.byteswap()  # Mixer expects little-endian 16-bit
+    return pygame.mixer.Sound(buffer=frames.tobytes())
+
+
 def generate_boss_music():
     """Generate intense boss battle music programmatically"""
-    sample_rate = 44100
+    sample_rate = mixer_frequency()
     duration = 8  # 8 second loop
     num_samples = sample_rate * duration
 
     # Create audio buffer
-    audio_data = []
+    audio_data = array('h')
+    append = audio_data.append
+    sin = math.sin
+
+    # Own seeded generator: the loop comes out the same every time, and synthesizing
+    # it doesn't advance the global random state gameplay draws from
+    rng = random.Random(0)
 
     # Boss music parameters - intense and fast
     bpm = 140
     beat_duration = 60.0 / bpm
-    samples_per_beat = int(sample_rate * beat_duration)
 
     # Bass frequencies for intense feel
     bass_notes = [55, 55, 65, 55, 55, 65, 73, 65]  # A1, A1, C2, A1, etc
 
-    for i in range(num_samples):
-        t = i / sample_rate
-        beat = int(t / beat_duration) % 8
-
-        # Heavy bass drum on beats
-        bass_drum = 0
-        beat_pos = (t % beat_duration) / beat_duration
-        if beat_pos < 0.1:
-            bass_drum = math.sin(2 * math.pi * 60 * t) * (1 - beat_pos * 10) * 0.5
-
-        # Snare on off-beats
-        snare = 0
-        if beat in [1, 3, 5, 7] and beat_pos < 0.05:
-            snare = random.uniform(-0.3, 0.3) * (1 - beat_pos * 20)
-
-        # Bass synth
-        bass_freq = bass_notes[beat]
-        bass = math.sin(2 * math.pi * bass_freq * t) * 0.3
-
-        # Add some grit to bass
-        bass += math.sin(2 * math.pi * bass_freq * 2 * t) * 0.1
-
-        # High intensity lead melody
-        lead_freq = bass_freq * 4
-        lead = math.sin(2 * math.pi * lead_freq * t) * 0.15
-        lead += math.sin(2 * math.pi * lead_freq * 1.5 * t) * 0.05
-
-        # Combine all elements
-        sample = bass_drum + snare + bass + lead
-
-        # Soft clip to prevent distortion
-        sample = max(-0.9, min(0.9, sample))
-
-        # Convert to 16-bit integer
-        audio_data.append(int(sample * 32767))
-
-    # Create stereo sound
-    sound_buffer = io.BytesIO()
-    for sample in audio_data:
-        # Write same sample to both channels (stereo)
-        sound_buffer.write(struct.pack('<hh', sample, sample))
-
-    sound_buffer.seek(0)
-    sound = pygame.mixer.Sound(buffer=sound_buffer.getvalue())
-    return sound
+    # Angular step per sample (2*pi*f / sample_rate). The bass note is fixed for a
+    # whole beat, so each beat is one block whose tone oscillators run on the
+    # recurrence sin(x + d) = 2cos(d)sin(x) - sin(x - d) instead of math.sin
+    drum_w = 2 * math.pi * 60
+    for beat_index, start, end in _beat_segments(num_samples, sample_rate, beat_duration):
+        beat = beat_index % 8
+        has_snare = beat % 2 == 1  # Snare on off-beats
+        bass_d = 2 * math.pi * bass_notes[beat] / sample_rate
+        c_bass, p_bass, s_bass = _sine_seed(bass_d, start)
+        c_grit, p_grit, s_grit = _sine_seed(bass_d * 2, start)
+        c_lead, p_lead, s_lead = _sine_seed(bass_d * 4, start)
+        c_lead2, p_lead2, s_lead2 = _sine_seed(bass_d * 6, start)
+
+        for i in range(start, end):
+            t = i / sample_rate
+            beat_pos = (t % beat_duration) / beat_duration
+
+            # Heavy bass drum on beats
+            sample = 0
+            if beat_pos < 0.1:
+                sample = sin(drum_w * t) * (1 - beat_pos * 10) * 0.5
+                if has_snare and beat_pos < 0.05:
+                    sample += rng.uniform(-0.3, 0.3) * (1 - beat_pos * 20)
+
+            # Bass synth with some grit, plus the high intensity lead melody
+            sample += s_bass * 0.3 + s_grit * 0.1 + s_lead * 0.15 + s_lead2 * 0.05
+            p_bass, s_bass = s_bass, c_bass * s_bass - p_bass
+            p_grit, s_grit = s_grit, c_grit * s_grit - p_grit
+            p_lead, s_lead = s_lead, c_lead * s_lead - p_lead
+            p_lead2, s_lead2 = s_lead2, c_lead2 * s_lead2 - p_lead2
+
+            # Soft clip to prevent distortion, convert to 16-bit integer
+            if sample > 0.9:
+                sample = 0.9
+            elif sample < -0.9:
+                sample = -0.9
+            append(int(sample * 32767))
+
+    return _music_sound(audio_data)
 
 
 def generate_menu_music():
     """Generate calmer menu music"""
-    sample_rate = 44100
+    sample_rate = mixer_frequency()
     duration = 6
     num_samples = sample_rate * duration
 
-    audio_data = []
-
-    # Slower, ambient feel
-    for i in range(num_samples):
-        t = i / sample_rate
-
-        # Ambient pad
-        pad = math.sin(2 * math.pi * 110 * t) * 0.2
-        pad += math.sin(2 * math.pi * 165 * t) * 0.1
-        pad += math.sin(2 * math.pi * 220 * t) * 0.1
-
-        # Slow modulation
-        mod = (math.sin(2 * math.pi * 0.5 * t) + 1) / 2
-        pad *= (0.5 + mod * 0.5)
-
-        sample = max(-0.9, min(0.9, pad))
-        audio_data.append(int(sample * 32767))
-
-    sound_buffer = io.BytesIO()
-    for sample in audio_data:
-        sound_buffer.write(struct.pack('<hh', sample, sample))
-
-    sound_buffer.seek(0)
-    sound = pygame.mixer.Sound(buffer=sound_buffer.getvalue())
-    return sound
+    audio_data = array('h')
+    append = audio_data.append
+
+    # Pad voices and the slow modulation run on the sine recurrence, re-seeded
+    # from math.sin every block so rounding error cannot build up
+    block = 4096
+    for start in range(0, num_samples, block):
+        c110, p110, s110 = _sine_seed(2 * math.pi * 110 / sample_rate, start)
+        c165, p165, s165 = _sine_seed(2 * math.pi * 165 / sample_rate, start)
+        c220, p220, s220 = _sine_seed(2 * math.pi * 220 / sample_rate, start)
+        c_mod, p_mod, s_mod = _sine_seed(2 * math.pi * 0.5 / sample_rate, start)
+
+        for _ in range(min(block, num_samples - start)):
+            # Ambient pad, with the slow (sin + 1) / 2 modulation folded into a 0.5..1.0 gain
+            pad = (s110 * 0.2 + s165 * 0.1 + s220 * 0.1) * (0.75 + s_mod * 0.25)
+            p110, s110 = s110, c110 * s110 - p110
+            p165, s165 = s165, c165 * s165 - p165
+            p220, s220 = s220, c220 * s220 - p220
+            p_mod, s_mod = s_mod, c_mod * s_mod - p_mod
+
+            if pad > 0.9:
+                pad = 0.9
+            elif pad < -0.9:
+                pad = -0.9
+            append(int(pad * 32767))
+
+    return _music_sound(audio_data)
 
 # Web version uses browser localStorage for persistent storage
 import json as json_module
@@ -142,6 +194,7 @@ try:
     from platform import window
     HAS_LOCALSTORAGE = True
 except:
+    window = None  # Desktop build - no browser window object
     HAS_LOCALSTORAGE = False
 
 # Storage keys
@@ -157,13 +210,17 @@ web_save_data = {
 web_users = {}
 current_user = None
 
+# save_game() is called on every coin pickup - coalesce its storage writes
+SAVE_FLUSH_MS = 500
+pending_save = None  # (username or None for guest, cloud progress data) awaiting a write
+last_save_flush = -SAVE_FLUSH_MS
+
 
 def storage_get(key):
     """Get data from localStorage"""
     global HAS_LOCALSTORAGE
     try:
         if HAS_LOCALSTORAGE:
-            from platform import window
             data = window.localStorage.getItem(key)
             if data:
                 return json_module.loads(data)
@@ -177,7 +234,6 @@ def storage_set(key, value):
     global HAS_LOCALSTORAGE
     try:
         if HAS_LOCALSTORAGE:
-            from platform import window
             window.localStorage.setItem(key, json_module.dumps(value))
             return True
     except Exception as e:
@@ -192,7 +248,6 @@ firebase_result_ready = False
 def firebase_available():
     """Check if Firebase is available in browser"""
     try:
-        from platform import window
         return hasattr(window, 'FirebaseDB')
     except:
         return False
@@ -201,7 +256,6 @@ def firebase_call_async(method, *args):
     """Call a Firebase async method and return a promise-like object"""
     global firebase_pending_result, firebase_result_ready
     try:
-        from platform import window
         if not hasattr(window, 'FirebaseDB'):
             return None
 
@@ -231,7 +285,6 @@ def firebase_call_async(method, *args):
 def firebase_sync_create_user(username, passcode, initial_data=None):
     """Synchronously create user in Firebase (non-blocking call)"""
     try:
-        from platform import window
         if not hasattr(window, 'FirebaseDB'):
             return False
 
@@ -247,7 +300,6 @@ def firebase_sync_create_user(username, passcode, initial_data=None):
 def firebase_sync_save_progress(username, progress_data):
     """Save progress to Firebase (non-blocking call)"""
     try:
-        from platform import window
         if not hasattr(window, 'FirebaseDB'):
             return False
 
@@ -263,6 +315,7 @@ def firebase_sync_save_progress(username, progress_data):
 def load_users():
     """Load all user accounts from localStorage"""
     global web_users
+    flush_save(force=True)  # Don't let the reload drop a coalesced save
     stored = storage_get(STORAGE_KEY_USERS)
     if stored:
         web_users = stored
@@ -369,39 +422,48 @@ def logout_user():
     current_user = None
 
 
+@dataclass(slots=True)
+class SaveState:
+    """Saved coins, weapon unlocks and avatars for one player (see load_save)"""
+    coins: int = 0
+    has_rpg: bool = False
+    has_shotgun: bool = False
+    medkit_charges: int = 0
+    has_sniper: bool = False
+    has_flamethrower: bool = False
+    has_laser: bool = False
+    has_minigun: bool = False
+    has_crossbow: bool = False
+    has_electric: bool = False
+    has_freeze: bool = False
+    has_dual_pistols: bool = False
+    has_throwing_knives: bool = False
+    current_avatar: str = "default"
+    owned_avatars: list = field(default_factory=lambda: ["default"])
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build from a stored save dict, defaulting any missing keys"""
+        return cls(**{f.name: data[f.name] for f in fields(cls) if f.name in data})
+
+
 def load_save():
     """Load saved data for current user from localStorage"""
     global current_user, web_users, web_save_data
+    flush_save(force=True)
 
     if current_user:
         # Reload users from storage
         load_users()
         if current_user in web_users:
-            data = web_users[current_user]
-            return (data.get("coins", 0), data.get("has_rpg", False),
-                    data.get("has_shotgun", False), data.get("medkit_charges", 0),
-                    data.get("has_sniper", False), data.get("has_flamethrower", False),
-                    data.get("has_laser", False), data.get("has_minigun", False),
-                    data.get("has_crossbow", False), data.get("has_electric", False),
-                    data.get("has_freeze", False), data.get("has_dual_pistols", False),
-                    data.get("has_throwing_knives", False),
-                    data.get("current_avatar", "default"),
-                    data.get("owned_avatars", ["default"]))
+            return SaveState.from_dict(web_users[current_user])
 
     # Guest mode - try to load guest data from storage
     guest_data = storage_get(STORAGE_KEY_GUEST)
     if guest_data:
         web_save_data = guest_data
 
-    return (web_save_data.get("coins", 0), web_save_data.get("has_rpg", False),
-            web_save_data.get("has_shotgun", False), web_save_data.get("medkit_charges", 0),
-            web_save_data.get("has_sniper", False), web_save_data.get("has_flamethrower", False),
-            web_save_data.get("has_laser", False), web_save_data.get("has_minigun", False),
-            web_save_data.get("has_crossbow", False), web_save_data.get("has_electric", False),
-            web_save_data.get("has_freeze", False), web_save_data.get("has_dual_pistols", False),
-            web_save_data.get("has_throwing_knives", False),
-            web_save_data.get("current_avatar", "default"),
-            web_save_data.get("owned_avatars", ["default"]))
+    return SaveState.from_dict(web_save_data)
 
 
 def save_game(coins, has_rpg, has_shotgun, medkit_charges, has_sniper,
@@ -409,7 +471,7 @@ def save_game(coins, has_rpg, has_shotgun, medkit_charges, has_sniper,
                has_electric=False, has_freeze=False, has_dual_pistols=False, has_throwing_knives=False,
                current_avatar="default", owned_avatars=None):
     """Save data for current user to localStorage and Firebase cloud"""
-    global current_user, web_users, web_save_data
+    global current_user, web_users, web_save_data, pending_save
 
     if owned_avatars is None:
         owned_avatars = ["default"]
@@ -433,8 +495,7 @@ def save_game(coins, has_rpg, has_shotgun, medkit_charges, has_sniper,
     }
 
     if current_user:
-        # Reload users first to avoid overwriting
-        load_users()
+        # web_users was loaded at login; update it in memory and let flush_save() persist it
         if current_user in web_users:
             web_users[current_user]["coins"] = coins
             web_users[current_user]["has_rpg"] = has_rpg
@@ -451,10 +512,9 @@ def save_game(coins, has_rpg, has_shotgun, medkit_charges, has_sniper,
             web_users[current_user]["has_throwing_knives"] = has_throwing_knives
             web_users[current_user]["current_avatar"] = current_avatar
             web_users[current_user]["owned_avatars"] = owned_avatars
-            save_users_to_storage()
-
-            # Also sync to Firebase cloud
-            firebase_sync_save_progress(current_user, progress_data)
+            # Cloud sync happens in flush_save() too
+            pending_save = (current_user, progress_data)
+            flush_save()
             return True
 
     # Guest mode - save to guest storage (no cloud sync for guests)
@@ -473,26 +533,80 @@ def save_game(coins, has_rpg, has_shotgun, medkit_charges, has_sniper,
     web_save_data["has_throwing_knives"] = has_throwing_knives
     web_save_data["current_avatar"] = current_avatar
     web_save_data["owned_avatars"] = owned_avatars
-    storage_set(STORAGE_KEY_GUEST, web_save_data)
+    pending_save = (None, None)
+    flush_save()
     return True
 
 
+def flush_save(force=False):
+    """Write the pending save_game() data, at most once per SAVE_FLUSH_MS unless forced"""
+    global pending_save, last_save_flush
+    if pending_save is None:
+        return
+    now = pygame.time.get_ticks()
+    if not force and now - last_save_flush < SAVE_FLUSH_MS:
+        return
+    username, progress_data = pending_save
+    pending_save = None
+    last_save_flush = now
+    if username:
+        save_users_to_storage()
+        firebase_sync_save_progress(username, progress_data)
+    else:
+        # Guest mode - no cloud sync for guests
+        storage_set(STORAGE_KEY_GUEST, web_save_data)
+
+
 # Initialize by loading users from storage at startup
 load_users()
 
 # Screen settings
 SCREEN_WIDTH = 1280
 SCREEN_HEIGHT = 720
+FPS = 60
+FRAME_MS = 1000 / FPS  # Frame budget in milliseconds
+HIDDEN_FRAME_MS = 50  # Event poll interval while the window is minimized (20 Hz, game paused)
 
 # Map is much bigger than screen
 MAP_WIDTH = 5000
 MAP_HEIGHT = 5000
 
+# Collision radii (constant per entity type) and bullet hit distances squared
+BULLET_RADIUS = 5
+PLAYER_RADIUS = 18
+ROBOT_RADIUS = 20
+BOSS_RADIUS = 50
+PLAYER_HIT_R2 = (PLAYER_RADIUS + BULLET_RADIUS) ** 2
+ROBOT_HIT_R2 = (ROBOT_RADIUS + BULLET_RADIUS) ** 2
+BOSS_HIT_R2 = (BOSS_RADIUS + BULLET_RADIUS) ** 2
+
+# Angle constants hoisted out of per-frame draw math
+HALF_PI = math.pi / 2
+PI_OVER_3 = math.pi / 3
+TWO_PI = math.pi * 2
+# Robot eyes and dual pistols point 0.4 rad either side of facing
+EYE_ROT = (math.cos(0.4), math.sin(0.4))
+# Freeze ray crystal spikes never rotate - fixed offsets at 60 degree steps
+FREEZE_SPIKE_OFFSETS = tuple((math.cos(i * PI_OVER_3) * 7, math.sin(i * PI_OVER_3) * 7)
+                             for i in range(6))
+
+# Electric gun chain lightning range (squared) and robot grid cell size
+CHAIN_R2 = 150 * 150
+ROBOT_GRID_CELL = 150
+
+# Smoke cloud grid cell size (2x the max smoke radius, so a cloud spans at most 2x2 cells)
+SMOKE_GRID_CELL = 300
+
+# Static obstacle grid cell size for bullet-vs-wall tests
+OBSTACLE_GRID_CELL = 200
+MINIMAP_SIZE = 200
+MINI_AVATAR_SIZE = (80, 100)  # Canvas for avatar shop carousel previews (covers the shadow)
+HUD_CACHE_LIMIT = 256  # Max rendered labels kept in each HUD text cache (LRU)
+
 # Mobile detection - check for actual mobile devices (not just touch-capable desktops)
 IS_MOBILE = False
 IS_TOUCH_DEVICE = False
 try:
-    from platform import window
     # Check user agent for mobile devices
     user_agent = window.navigator.userAgent.lower()
     IS_TOUCH_DEVICE = hasattr(window, 'ontouchstart') or window.navigator.maxTouchPoints > 0
@@ -517,6 +631,31 @@ DARK_GRAY = (50, 50, 50)
 BROWN = (139, 90, 43)
 LIGHT_BLUE = (135, 206, 235)
 FLOOR_COLOR = (70, 75, 80)
+FLOOR_GRID_COLOR = (60, 65, 70)
+FLOOR_GRID_SIZE = 100
+
+# HUD color lookups indexed by clamped value instead of if/else ladders
+# (index HP_COLOR with math.ceil so fractional health keeps the > 50 / > 25 boundaries)
+HP_COLOR = tuple(GREEN if h > 50 else YELLOW if h > 25 else RED for h in range(101))
+RELOAD_COLOR = tuple(GREEN if r > 2 else YELLOW if r > 0 else RED for r in range(16))
+# Grenade fuse (blink_rate, spark_size, spark_color) by remaining lifetime (0..90 frames)
+FUSE_TABLE = tuple((10, 3, ORANGE) if f > 30 else (5, 4, (255, 100, 0)) if f > 15 else (2, 5, RED)
+                   for f in range(91))
+
+# Online menu mode buttons: (mode, label, Game rect attribute, color when selected)
+ONLINE_MODE_BUTTONS = (
+    ("coop", "CO-OP", "online_coop_btn", GREEN),
+    ("pvp", "PVP", "online_pvp_btn", RED),
+    ("2v2", "2v2", "online_2v2_btn", (255, 200, 50)),
+    ("2v1", "2v1", "online_2v1_btn", (200, 100, 255)),
+)
+
+# Minimap dot color per bot type (gun bots use RED)
+BOT_TYPE_MINIMAP_COLOR = {
+    "knife": WHITE,
+    "throwing_knife": GRAY,
+    "dual_pistol": (255, 215, 0),  # Gold
+}
 
 # Difficulty settings
 DIFFICULTY = {
@@ -670,13 +809,13 @@ class Avatar:
 
         # Update walk animation
         if walk_speed > 0.1:
-            self.walk_cycle = (self.walk_cycle + walk_speed * 0.15) % (math.pi * 2)
+            self.walk_cycle = (self.walk_cycle + walk_speed * 0.15) % TWO_PI
         else:
             # Smoothly return to neutral
             self.walk_cycle *= 0.9
 
         # Subtle breathing animation
-        self.breathing_cycle = (anim_timer * 0.05) % (math.pi * 2)
+        self.breathing_cycle = (anim_timer * 0.05) % TWO_PI
         breath_offset = math.sin(self.breathing_cycle) * 0.5
 
         # Body stays upright (facing down on screen = angle 0)
@@ -685,7 +824,7 @@ class Avatar:
         aim_angle = angle  # Arms aim toward mouse
 
         # Determine which side the character is aiming (for flipping)
-        aiming_right = -math.pi/2 < aim_angle < math.pi/2
+        aiming_right = -HALF_PI < aim_angle < HALF_PI
 
         # Draw shadow under character - simple ellipse (no surface for performance)
         pygame.draw.ellipse(screen, (30, 30, 30), (int(x - 25), int(y + 18), 50, 24))
@@ -979,14 +1118,14 @@ class Avatar:
 
         # Walk animation - legs swing opposite each other
         walk_offset = math.sin(self.walk_cycle + (math.pi if is_back else 0)) * 0.5
-        leg_angle = angle + math.pi/2 + walk_offset  # Legs point "down" relative to body
+        leg_angle = angle + HALF_PI + walk_offset  # Legs point "down" relative to body
 
         # Knee bend during walk
         knee_bend = abs(math.sin(self.walk_cycle + (math.pi if is_back else 0))) * 0.3
 
         # Hip position
-        hip_x = x + math.cos(angle + math.pi/2) * side_offset
-        hip_y = y + math.sin(angle + math.pi/2) * side_offset + 4
+        hip_x = x + math.cos(angle + HALF_PI) * side_offset
+        hip_y = y + math.sin(angle + HALF_PI) * side_offset + 4
 
         # Knee position (with bend)
         knee_x = hip_x + math.cos(leg_angle + 0.2 + knee_bend) * (self.leg_length * 0.5)
@@ -1049,8 +1188,8 @@ class Avatar:
         side_offset = 6 if is_front else -6
 
         # Shoulder position
-        shoulder_x = x + math.cos(angle + math.pi/2) * side_offset
-        shoulder_y = y + math.sin(angle + math.pi/2) * side_offset - 2
+        shoulder_x = x + math.cos(angle + HALF_PI) * side_offset
+        shoulder_y = y + math.sin(angle + HALF_PI) * side_offset - 2
 
         if is_front:
             # Front arm follows gun angle
@@ -1171,8 +1310,8 @@ class Avatar:
         """Get the position of the support hand during reload"""
         if weapon_name == "Rifle":
             # Support hand grabs magazine
-            mag_x = x + math.cos(angle) * 10 + math.cos(angle + math.pi/2) * 5
-            mag_y = y + math.sin(angle) * 10 + math.sin(angle + math.pi/2) * 5
+            mag_x = x + math.cos(angle) * 10 + math.cos(angle + HALF_PI) * 5
+            mag_y = y + math.sin(angle) * 10 + math.sin(angle + HALF_PI) * 5
 
             if phase < 0.3:
                 # Move to magazine
@@ -1180,11 +1319,11 @@ class Avatar:
             elif phase < 0.5:
                 # Pull magazine out
                 offset = (phase - 0.3) / 0.2 * 15
-                return mag_x + math.cos(angle + math.pi/2) * offset, mag_y + math.sin(angle + math.pi/2) * offset
+                return mag_x + math.cos(angle + HALF_PI) * offset, mag_y + math.sin(angle + HALF_PI) * offset
             elif phase < 0.8:
                 # Insert new magazine
                 offset = 15 * (1 - (phase - 0.5) / 0.3)
-                return mag_x + math.cos(angle + math.pi/2) * offset, mag_y + math.sin(angle + math.pi/2) * offset
+                return mag_x + math.cos(angle + HALF_PI) * offset, mag_y + math.sin(angle + HALF_PI) * offset
             else:
                 return mag_x, mag_y
 
@@ -1234,8 +1373,8 @@ class Avatar:
 
             # Back hand on grip
             back_dist = 8 - recoil * 0.3
-            back_x = x + math.cos(angle) * back_dist + math.cos(angle + math.pi/2) * 3
-            back_y = y + math.sin(angle) * back_dist + math.sin(angle + math.pi/2) * 3
+            back_x = x + math.cos(angle) * back_dist + math.cos(angle + HALF_PI) * 3
+            back_y = y + math.sin(angle) * back_dist + math.sin(angle + HALF_PI) * 3
 
             # Modify positions during reload
             if is_reloading:
@@ -1267,8 +1406,8 @@ class Avatar:
 
         elif weapon_name == "RPG":
             # Shoulder-mounted
-            shoulder_x = x + math.cos(angle + math.pi/2) * 5
-            shoulder_y = y + math.sin(angle + math.pi/2) * 5
+            shoulder_x = x + math.cos(angle + HALF_PI) * 5
+            shoulder_y = y + math.sin(angle + HALF_PI) * 5
             grip_x = x + math.cos(angle) * 15
             grip_y = y + math.sin(angle) * 15
 
@@ -1308,6 +1447,8 @@ class VirtualJoystick:
         self.base_x = x
         self.base_y = y
         self.radius = radius
+        self._inv_radius = 1.0 / radius
+        self._touch_r2 = (radius * 1.5) ** 2  # Touch area extends past the base
         self.knob_radius = 25
         self.knob_x = x
         self.knob_y = y
@@ -1318,8 +1459,9 @@ class VirtualJoystick:
 
     def contains_point(self, x, y):
         """Check if a point is within the joystick touch area"""
-        dist = math.sqrt((x - self.base_x)**2 + (y - self.base_y)**2)
-        return dist < self.radius * 1.5
+        dx = x - self.base_x
+        dy = y - self.base_y
+        return (dx * dx + dy * dy) < self._touch_r2
 
     def handle_touch_down(self, x, y, touch_id):
         if self.contains_point(x, y):
@@ -1349,28 +1491,30 @@ class VirtualJoystick:
     def update_knob(self, x, y):
         dx = x - self.base_x
         dy = y - self.base_y
-        dist = math.sqrt(dx**2 + dy**2)
+        dist = math.hypot(dx, dy)
 
         if dist > self.radius:
-            dx = dx / dist * self.radius
-            dy = dy / dist * self.radius
+            # Clamp the knob to the rim
+            scale = self.radius / dist
+            dx *= scale
+            dy *= scale
 
         self.knob_x = self.base_x + dx
         self.knob_y = self.base_y + dy
-        self.dx = dx / self.radius
-        self.dy = dy / self.radius
+        self.dx = dx * self._inv_radius
+        self.dy = dy * self._inv_radius
 
     def draw(self, screen):
         # Create cached surfaces once (lazy initialization)
         if VirtualJoystick._base_surf is None or VirtualJoystick._cached_radius != self.radius:
             VirtualJoystick._cached_radius = self.radius
-            VirtualJoystick._base_surf = pygame.Surface((self.radius * 2, self.radius * 2), pygame.SRCALPHA)
+            VirtualJoystick._base_surf = pygame.Surface((self.radius * 2, self.radius * 2), pygame.SRCALPHA).convert_alpha()
             pygame.draw.circle(VirtualJoystick._base_surf, (100, 100, 100, 100), (self.radius, self.radius), self.radius)
             pygame.draw.circle(VirtualJoystick._base_surf, (150, 150, 150, 150), (self.radius, self.radius), self.radius, 3)
 
         if VirtualJoystick._knob_surf is None or VirtualJoystick._cached_knob_radius != self.knob_radius:
             VirtualJoystick._cached_knob_radius = self.knob_radius
-            VirtualJoystick._knob_surf = pygame.Surface((self.knob_radius * 2, self.knob_radius * 2), pygame.SRCALPHA)
+            VirtualJoystick._knob_surf = pygame.Surface((self.knob_radius * 2, self.knob_radius * 2), pygame.SRCALPHA).convert_alpha()
             pygame.draw.circle(VirtualJoystick._knob_surf, (200, 200, 200, 180), (self.knob_radius, self.knob_radius), self.knob_radius)
 
         # Draw base circle (using cached surface)
@@ -1397,6 +1541,7 @@ class TouchButton:
         self._normal_surf = None
         self._pressed_surf = None
         self._text_surf = None
+        self._text_pos = None
 
     def contains_point(self, x, y):
         """Check if a point is within the button touch area"""
@@ -1422,13 +1567,13 @@ class TouchButton:
         """Create cached surfaces once"""
         if self._normal_surf is None:
             # Normal state surface
-            self._normal_surf = pygame.Surface((self.radius * 2, self.radius * 2), pygame.SRCALPHA)
+            self._normal_surf = pygame.Surface((self.radius * 2, self.radius * 2), pygame.SRCALPHA).convert_alpha()
             color = (self.color[0], self.color[1], self.color[2], 120)
             pygame.draw.circle(self._normal_surf, color, (self.radius, self.radius), self.radius)
             pygame.draw.circle(self._normal_surf, (200, 200, 200, 150), (self.radius, self.radius), self.radius, 3)
 
             # Pressed state surface
-            self._pressed_surf = pygame.Surface((self.radius * 2, self.radius * 2), pygame.SRCALPHA)
+            self._pressed_surf = pygame.Surface((self.radius * 2, self.radius * 2), pygame.SRCALPHA).convert_alpha()
             color = (self.color[0], self.color[1], self.color[2], 180)
             pygame.draw.circle(self._pressed_surf, color, (self.radius, self.radius), self.radius)
             pygame.draw.circle(self._pressed_surf, (255, 255, 255, 200), (self.radius, self.radius), self.radius, 3)
@@ -1437,6 +1582,8 @@ class TouchButton:
             if TouchButton._cached_font is None:
                 TouchButton._cached_font = pygame.font.Font(None, 24)
             self._text_surf = TouchButton._cached_font.render(self.label, True, (255, 255, 255))
+            self._text_pos = (self.x - self._text_surf.get_width() // 2,
+                              self.y - self._text_surf.get_height() // 2)
 
     def draw(self, screen):
         # Create cached surfaces on first draw
@@ -1447,7 +1594,7 @@ class TouchButton:
         screen.blit(surf, (self.x - self.radius, self.y - self.radius))
 
         # Draw label (cached)
-        screen.blit(self._text_surf, (self.x - self._text_surf.get_width() // 2, self.y - self._text_surf.get_height() // 2))
+        screen.blit(self._text_surf, self._text_pos)
 
 
 class FakeKeys:
@@ -1473,49 +1620,110 @@ class Camera:
         self.y = 0
         self.view_width = view_width
         self.view_height = view_height
+        # Centering offsets and bounds are fixed for the view size
+        self._half_w = view_width // 2
+        self._half_h = view_height // 2
+        self._max_x = MAP_WIDTH - view_width
+        self._max_y = MAP_HEIGHT - view_height
 
     def update(self, target_x, target_y):
-        # Center camera on target
-        self.x = target_x - self.view_width // 2
-        self.y = target_y - self.view_height // 2
-
-        # Keep camera in bounds
-        self.x = max(0, min(MAP_WIDTH - self.view_width, self.x))
-        self.y = max(0, min(MAP_HEIGHT - self.view_height, self.y))
+        # Center camera on target, kept in bounds
+        x = target_x - self._half_w
+        y = target_y - self._half_h
+        self.x = 0 if x <= 0 else (self._max_x if x > self._max_x else x)
+        self.y = 0 if y <= 0 else (self._max_y if y > self._max_y else y)
 
     def apply(self, x, y):
         return x - self.x, y - self.y
 
 
+class AngleSinCos:
+    """Mixin caching cos/sin of self.angle until the angle changes"""
+    _angle_cached = None
+    _ca = 1.0
+    _sa = 0.0
+
+    def _sincos(self):
+        if self.angle != self._angle_cached:
+            self._ca = math.cos(self.angle)
+            self._sa = math.sin(self.angle)
+            self._angle_cached = self.angle
+        return self._ca, self._sa
+
+    def _face(self, dx, dy, dist):
+        """Turn toward (dx, dy); the unit vector doubles as the cached cos/sin"""
+        self.angle = math.atan2(dy, dx)
+        if dist > 0:
+            self._ca = dx / dist
+            self._sa = dy / dist
+            self._angle_cached = self.angle
+
+
+class Pool:
+    """Free list of reusable objects - avoids allocating short-lived entities every frame"""
+    def __init__(self, cls, size=0):
+        self.cls = cls
+        self.free = [cls.__new__(cls) for _ in range(size)]
+
+    def acquire(self, *args, **kwargs):
+        """Get an object from the pool (or a fresh one) and reset() it"""
+        obj = self.free.pop() if self.free else self.cls.__new__(self.cls)
+        obj.reset(*args, **kwargs)
+        return obj
+
+    def release(self, obj):
+        """Return a dead object to the pool"""
+        self.free.append(obj)
+
+
 class Bullet:
+    # Fixed attribute layout - no per-instance __dict__ for the most numerous entity
+    __slots__ = ("x", "y", "start_x", "start_y", "angle", "speed", "is_player",
+                 "is_shotgun", "weapon_type", "radius", "base_damage", "damage",
+                 "lifetime", "color", "caliber", "owner", "trail", "trail_idx", "trail_len",
+                 "max_trail_length", "draw_fn", "_cos", "_sin")
+
     def __init__(self, x, y, angle, is_player=True, is_shotgun=False, weapon_type="Rifle"):
+        self.reset(x, y, angle, is_player, is_shotgun, weapon_type)
+
+    def reset(self, x, y, angle, is_player=True, is_shotgun=False, weapon_type="Rifle"):
         self.x = x
         self.y = y
         self.start_x = x  # Track starting position for shotgun damage calc
         self.start_y = y
         self.angle = angle
+        # Direction is fixed for the bullet's lifetime
+        self._cos = math.cos(angle)
+        self._sin = math.sin(angle)
         self.speed = 15 if is_player else 8
         self.is_player = is_player
         self.is_shotgun = is_shotgun
         self.weapon_type = weapon_type
-        self.radius = 5
+        self.radius = BULLET_RADIUS
         self.base_damage = 25 if is_player else 10
         self.damage = self.base_damage
         self.lifetime = 180
         self.color = YELLOW if is_player else ORANGE
+        self.caliber = ""
+        self.owner = "player1"  # Set to "player2" for PvP bullets
+        # Enemy bullets or unknown types fall back to the default round
+        self.draw_fn = BULLET_DRAW_FUNCS.get(weapon_type, Bullet._draw_enemy_bullet)
 
-        # Trail effect
-        self.trail = []
+        # Trail effect - fixed ring buffer, trail_idx is the next slot to write
         self.max_trail_length = 5
+        self.trail = [(x, y)] * self.max_trail_length
+        self.trail_idx = 0
+        self.trail_len = 0
 
     def update(self):
         # Store position for trail
-        self.trail.append((self.x, self.y))
-        if len(self.trail) > self.max_trail_length:
-            self.trail.pop(0)
+        self.trail[self.trail_idx] = (self.x, self.y)
+        self.trail_idx = (self.trail_idx + 1) % self.max_trail_length
+        if self.trail_len < self.max_trail_length:
+            self.trail_len += 1
 
-        self.x += math.cos(self.angle) * self.speed
-        self.y += math.sin(self.angle) * self.speed
+        self.x += self._cos * self.speed
+        self.y += self._sin * self.speed
         self.lifetime -= 1
 
         # Check bounds
@@ -1527,103 +1735,79 @@ class Bullet:
         if not self.is_shotgun:
             return self.damage
 
-        # Calculate distance traveled
-        dist = math.sqrt((self.x - self.start_x)**2 + (self.y - self.start_y)**2)
-
         # Shotgun: max damage up close (50), falls off with distance
         # At 0 distance: 50 damage
         # At 150+ distance: 10 damage (minimum)
         max_effective_range = 150
-        if dist < max_effective_range:
-            # Linear falloff from base_damage to 10
-            damage_mult = 1 - (dist / max_effective_range) * 0.8
-            return int(self.base_damage * damage_mult)
-        else:
-            return 10  # Minimum damage at long range
+        dx = self.x - self.start_x
+        dy = self.y - self.start_y
+        d2 = dx * dx + dy * dy
+        if d2 >= max_effective_range * max_effective_range:
+            return 10  # Minimum damage at long range - no sqrt needed
+
+        # Linear falloff from base_damage to 10
+        dist = math.sqrt(d2)
+        damage_mult = 1 - (dist / max_effective_range) * 0.8
+        return int(self.base_damage * damage_mult)
 
     def draw(self, screen, camera):
         sx, sy = camera.apply(self.x, self.y)
         if -20 < sx < SCREEN_WIDTH + 20 and -20 < sy < SCREEN_HEIGHT + 20:
             # Draw trail first (behind bullet)
-            if len(self.trail) > 1:
-                for i, (tx, ty) in enumerate(self.trail):
-                    tsx, tsy = camera.apply(tx, ty)
-                    alpha = (i + 1) / len(self.trail)
-                    trail_size = int(self.radius * 0.5 * alpha)
-                    if trail_size > 0:
-                        wt = self.weapon_type
-                        if wt == "Sniper":
-                            # Sniper has a longer, thinner trail
-                            trail_color = (200, 220, 255)
-                        elif wt == "Shotgun":
-                            # Shotgun pellets have orange trail
-                            trail_color = (255, 150, 50)
-                        elif wt == "RPG":
-                            # RPG has smoke trail
-                            trail_color = (150, 150, 150)
-                        elif wt == "Flamethrower":
-                            # Fire trail
-                            trail_color = (255, 100 + random.randint(0, 100), 0)
-                        elif wt in ["Laser", "Laser Gun"]:
-                            # Green glow trail
-                            trail_color = (0, 200, 0)
-                        elif wt == "Minigun":
-                            # Brass trail
-                            trail_color = (180, 140, 60)
-                        elif wt == "Crossbow":
-                            # Brown trail
-                            trail_color = (139, 69, 19)
-                        elif wt in ["Electric", "Electric Gun"]:
-                            # Electric blue trail
-                            trail_color = (100, 150, 255)
-                        elif wt in ["Freeze", "Freeze Ray"]:
-                            # Ice blue trail
-                            trail_color = (150, 220, 255)
-                        elif wt == "Dual Pistols":
-                            # Gold trail
-                            trail_color = (255, 215, 0)
-                        elif wt == "Throwing Knives":
-                            # Silver trail
-                            trail_color = (192, 192, 192)
-                        else:
-                            trail_color = (255, 200, 100)
-                        pygame.draw.circle(screen, trail_color, (int(tsx), int(tsy)), trail_size)
+            n = self.trail_len
+            if n > 1:
+                trail = self.trail
+                size = self.max_trail_length
+                start = self.trail_idx - n
+                # Colour and scale are the same for every trail point
+                if self.weapon_type == "Flamethrower":
+                    # Fire trail flickers once per frame
+                    trail_color = (255, 100 + random.randint(0, 100), 0)
+                else:
+                    trail_color = BULLET_TRAIL_COLORS.get(self.weapon_type, (255, 200, 100))
+                half_r = self.radius * 0.5
+                # Oldest points shrink to size 0 - start at the first one that shows
+                first = max(0, math.ceil(n / half_r) - 1)
+                cam_x, cam_y = camera.x, camera.y
+                for i in range(first, n):
+                    # Oldest to newest, so the newest point is drawn on top
+                    tx, ty = trail[(start + i) % size]
+                    pygame.draw.circle(screen, trail_color, (int(tx - cam_x), int(ty - cam_y)),
+                                       int(half_r * ((i + 1) / n)))
 
             # Draw bullet based on weapon type
-            wt = self.weapon_type
-            if wt == "Rifle":
-                self._draw_rifle_bullet(screen, sx, sy)
-            elif wt == "Handgun":
-                self._draw_handgun_bullet(screen, sx, sy)
-            elif wt == "Shotgun":
-                self._draw_shotgun_pellet(screen, sx, sy)
-            elif wt == "Sniper":
-                self._draw_sniper_bullet(screen, sx, sy)
-            elif wt == "RPG":
-                self._draw_rpg_rocket(screen, sx, sy)
-            elif wt == "Flamethrower":
-                self._draw_flamethrower(screen, sx, sy)
-            elif wt in ["Laser", "Laser Gun"]:
-                self._draw_laser(screen, sx, sy)
-            elif wt == "Minigun":
-                self._draw_minigun(screen, sx, sy)
-            elif wt == "Crossbow":
-                self._draw_crossbow(screen, sx, sy)
-            elif wt in ["Electric", "Electric Gun"]:
-                self._draw_electric(screen, sx, sy)
-            elif wt in ["Freeze", "Freeze Ray"]:
-                self._draw_freeze(screen, sx, sy)
-            elif wt == "Dual Pistols":
-                self._draw_dual_pistols(screen, sx, sy)
-            elif wt == "Throwing Knives":
-                self._draw_throwing_knife(screen, sx, sy)
-            elif wt == "Enemy_Knife":
-                self._draw_enemy_knife(screen, sx, sy)
-            elif wt == "Enemy_Pistol":
-                self._draw_enemy_pistol(screen, sx, sy)
-            else:
-                # Enemy bullets or default
-                self._draw_enemy_bullet(screen, sx, sy)
+            self.draw_fn(self, screen, sx, sy)
+
+    # Pre-rotated sprites for the multi-primitive bullets in BULLET_SPRITE_SHAPES,
+    # keyed by (weapon type, rotation step)
+    ROT_STEPS = 64
+    ROT_SPRITES = {}
+    SPRITE_HALF = 18
+
+    @classmethod
+    def _rot_sprite(cls, weapon_type, angle):
+        step = int(angle * (cls.ROT_STEPS / TWO_PI) + 0.5) % cls.ROT_STEPS
+        key = (weapon_type, step)
+        sprite = cls.ROT_SPRITES.get(key)
+        if sprite is None:
+            c = cls.SPRITE_HALF
+            sprite = pygame.Surface((c * 2, c * 2), pygame.SRCALPHA).convert_alpha()
+            # Draw the shape once with a stand-in bullet facing the step angle
+            proto = cls.__new__(cls)
+            proto.angle = step * TWO_PI / cls.ROT_STEPS
+            proto._cos = math.cos(proto.angle)
+            proto._sin = math.sin(proto.angle)
+            proto.lifetime = 0
+            BULLET_SPRITE_SHAPES[weapon_type][0](proto, sprite, c, c)
+            cls.ROT_SPRITES[key] = sprite
+        return sprite
+
+    def _draw_sprite(self, screen, sx, sy):
+        """Blit the cached rotation of this bullet's shape instead of drawing its primitives"""
+        spin = BULLET_SPRITE_SHAPES[self.weapon_type][1]
+        angle = self.angle + self.lifetime * spin if spin else self.angle
+        c = self.SPRITE_HALF
+        screen.blit(self._rot_sprite(self.weapon_type, angle), (int(sx) - c, int(sy) - c))
 
     def _draw_rifle_bullet(self, screen, sx, sy):
         """Draw realistic rifle bullet - pointed brass casing"""
@@ -1632,10 +1816,10 @@ class Bullet:
         bullet_width = 4
 
         # Calculate bullet tip and base
-        tip_x = sx + math.cos(self.angle) * (bullet_length / 2)
-        tip_y = sy + math.sin(self.angle) * (bullet_length / 2)
-        base_x = sx - math.cos(self.angle) * (bullet_length / 2)
-        base_y = sy - math.sin(self.angle) * (bullet_length / 2)
+        tip_x = sx + self._cos * (bullet_length / 2)
+        tip_y = sy + self._sin * (bullet_length / 2)
+        base_x = sx - self._cos * (bullet_length / 2)
+        base_y = sy - self._sin * (bullet_length / 2)
 
         # Draw bullet body (brass)
         pygame.draw.line(screen, (180, 140, 60), (base_x, base_y), (tip_x, tip_y), bullet_width)
@@ -1653,10 +1837,10 @@ class Bullet:
         bullet_length = 8
         bullet_width = 3
 
-        tip_x = sx + math.cos(self.angle) * (bullet_length / 2)
-        tip_y = sy + math.sin(self.angle) * (bullet_length / 2)
-        base_x = sx - math.cos(self.angle) * (bullet_length / 2)
-        base_y = sy - math.sin(self.angle) * (bullet_length / 2)
+        tip_x = sx + self._cos * (bullet_length / 2)
+        tip_y = sy + self._sin * (bullet_length / 2)
+        base_x = sx - self._cos * (bullet_length / 2)
+        base_y = sy - self._sin * (bullet_length / 2)
 
         # Brass casing
         pygame.draw.line(screen, (180, 140, 60), (base_x, base_y), (tip_x, tip_y), bullet_width)
@@ -1676,10 +1860,10 @@ class Bullet:
         bullet_length = 18
         bullet_width = 4
 
-        tip_x = sx + math.cos(self.angle) * (bullet_length / 2)
-        tip_y = sy + math.sin(self.angle) * (bullet_length / 2)
-        base_x = sx - math.cos(self.angle) * (bullet_length / 2)
-        base_y = sy - math.sin(self.angle) * (bullet_length / 2)
+        tip_x = sx + self._cos * (bullet_length / 2)
+        tip_y = sy + self._sin * (bullet_length / 2)
+        base_x = sx - self._cos * (bullet_length / 2)
+        base_y = sy - self._sin * (bullet_length / 2)
 
         # Long brass casing
         pygame.draw.line(screen, (180, 140, 60), (base_x, base_y), (tip_x, tip_y), bullet_width)
@@ -1696,10 +1880,10 @@ class Bullet:
         rocket_length = 20
         rocket_width = 6
 
-        tip_x = sx + math.cos(self.angle) * (rocket_length / 2)
-        tip_y = sy + math.sin(self.angle) * (rocket_length / 2)
-        base_x = sx - math.cos(self.angle) * (rocket_length / 2)
-        base_y = sy - math.sin(self.angle) * (rocket_length / 2)
+        tip_x = sx + self._cos * (rocket_length / 2)
+        tip_y = sy + self._sin * (rocket_length / 2)
+        base_x = sx - self._cos * (rocket_length / 2)
+        base_y = sy - self._sin * (rocket_length / 2)
 
         # Rocket body (olive/gray)
         pygame.draw.line(screen, (80, 90, 70), (base_x, base_y), (tip_x, tip_y), rocket_width)
@@ -1708,8 +1892,8 @@ class Bullet:
         pygame.draw.line(screen, (60, 60, 60), (sx, sy), (tip_x, tip_y), rocket_width - 1)
 
         # Fins at the back
-        fin_angle1 = self.angle + math.pi/2
-        fin_angle2 = self.angle - math.pi/2
+        fin_angle1 = self.angle + HALF_PI
+        fin_angle2 = self.angle - HALF_PI
         fin_length = 6
         fin1_x = base_x + math.cos(fin_angle1) * fin_length
         fin1_y = base_y + math.sin(fin_angle1) * fin_length
@@ -1719,8 +1903,8 @@ class Bullet:
         pygame.draw.line(screen, (60, 70, 50), (base_x, base_y), (fin2_x, fin2_y), 2)
 
         # Rocket flame at back
-        flame_x = base_x - math.cos(self.angle) * 8
-        flame_y = base_y - math.sin(self.angle) * 8
+        flame_x = base_x - self._cos * 8
+        flame_y = base_y - self._sin * 8
         pygame.draw.line(screen, (255, 200, 50), (base_x, base_y), (flame_x, flame_y), 4)
         pygame.draw.line(screen, (255, 100, 0), (base_x, base_y), (flame_x, flame_y), 2)
 
@@ -1738,10 +1922,11 @@ class Bullet:
         knife_length = 14
         # Spinning effect using lifetime
         spin_angle = self.angle + (self.lifetime * 0.4)
-        tip_x = sx + math.cos(spin_angle) * knife_length
-        tip_y = sy + math.sin(spin_angle) * knife_length
-        base_x = sx - math.cos(spin_angle) * (knife_length / 2)
-        base_y = sy - math.sin(spin_angle) * (knife_length / 2)
+        ca, sa = math.cos(spin_angle), math.sin(spin_angle)
+        tip_x = sx + ca * knife_length
+        tip_y = sy + sa * knife_length
+        base_x = sx - ca * (knife_length / 2)
+        base_y = sy - sa * (knife_length / 2)
         # Blade
         pygame.draw.line(screen, (192, 192, 192), (base_x, base_y), (tip_x, tip_y), 3)
         # Shine on blade
@@ -1752,8 +1937,8 @@ class Bullet:
     def _draw_enemy_pistol(self, screen, sx, sy):
         """Draw enemy dual pistol bullet - small golden bullet"""
         bullet_length = 7
-        tip_x = sx + math.cos(self.angle) * bullet_length
-        tip_y = sy + math.sin(self.angle) * bullet_length
+        tip_x = sx + self._cos * bullet_length
+        tip_y = sy + self._sin * bullet_length
         # Gold casing
         pygame.draw.line(screen, (255, 180, 50), (sx, sy), (tip_x, tip_y), 3)
         # Shine
@@ -1773,8 +1958,8 @@ class Bullet:
     def _draw_laser(self, screen, sx, sy):
         """Draw laser beam - thin bright green line"""
         beam_length = 15
-        tip_x = sx + math.cos(self.angle) * beam_length
-        tip_y = sy + math.sin(self.angle) * beam_length
+        tip_x = sx + self._cos * beam_length
+        tip_y = sy + self._sin * beam_length
         # Glow effect
         pygame.draw.line(screen, (0, 200, 0), (sx, sy), (tip_x, tip_y), 4)
         # Bright core
@@ -1786,8 +1971,8 @@ class Bullet:
         """Draw minigun bullet - small fast brass"""
         bullet_length = 6
         bullet_width = 2
-        tip_x = sx + math.cos(self.angle) * bullet_length
-        tip_y = sy + math.sin(self.angle) * bullet_length
+        tip_x = sx + self._cos * bullet_length
+        tip_y = sy + self._sin * bullet_length
         pygame.draw.line(screen, (180, 140, 60), (sx, sy), (tip_x, tip_y), bullet_width)
         pygame.draw.circle(screen, (200, 160, 80), (int(tip_x), int(tip_y)), 2)
 
@@ -1795,10 +1980,10 @@ class Bullet:
         """Draw crossbow bolt/arrow"""
         bolt_length = 16
         # Shaft (brown)
-        tip_x = sx + math.cos(self.angle) * bolt_length
-        tip_y = sy + math.sin(self.angle) * bolt_length
-        base_x = sx - math.cos(self.angle) * (bolt_length / 2)
-        base_y = sy - math.sin(self.angle) * (bolt_length / 2)
+        tip_x = sx + self._cos * bolt_length
+        tip_y = sy + self._sin * bolt_length
+        base_x = sx - self._cos * (bolt_length / 2)
+        base_y = sy - self._sin * (bolt_length / 2)
         pygame.draw.line(screen, (120, 80, 40), (base_x, base_y), (tip_x, tip_y), 3)
         # Metal tip
         pygame.draw.line(screen, (150, 150, 150), (sx, sy), (tip_x, tip_y), 2)
@@ -1830,17 +2015,16 @@ class Bullet:
         pygame.draw.circle(screen, (150, 220, 255), (int(sx), int(sy)), 5)
         pygame.draw.circle(screen, (200, 240, 255), (int(sx), int(sy)), 3)
         # Crystal spikes
-        for i in range(6):
-            spike_angle = i * (math.pi / 3)
-            spike_x = sx + math.cos(spike_angle) * 7
-            spike_y = sy + math.sin(spike_angle) * 7
+        for dx, dy in FREEZE_SPIKE_OFFSETS:
+            spike_x = sx + dx
+            spike_y = sy + dy
             pygame.draw.line(screen, (180, 230, 255), (int(sx), int(sy)), (int(spike_x), int(spike_y)), 1)
 
     def _draw_dual_pistols(self, screen, sx, sy):
         """Draw golden dual pistol bullet"""
         bullet_length = 8
-        tip_x = sx + math.cos(self.angle) * bullet_length
-        tip_y = sy + math.sin(self.angle) * bullet_length
+        tip_x = sx + self._cos * bullet_length
+        tip_y = sy + self._sin * bullet_length
         # Gold casing
         pygame.draw.line(screen, (255, 215, 0), (sx, sy), (tip_x, tip_y), 3)
         # Shine
@@ -1851,17 +2035,68 @@ class Bullet:
         knife_length = 12
         # Spinning effect using lifetime
         spin_angle = self.angle + (self.lifetime * 0.3)
-        tip_x = sx + math.cos(spin_angle) * knife_length
-        tip_y = sy + math.sin(spin_angle) * knife_length
-        base_x = sx - math.cos(spin_angle) * (knife_length / 2)
-        base_y = sy - math.sin(spin_angle) * (knife_length / 2)
+        ca, sa = math.cos(spin_angle), math.sin(spin_angle)
+        tip_x = sx + ca * knife_length
+        tip_y = sy + sa * knife_length
+        base_x = sx - ca * (knife_length / 2)
+        base_y = sy - sa * (knife_length / 2)
         # Blade
         pygame.draw.line(screen, (192, 192, 192), (base_x, base_y), (tip_x, tip_y), 3)
         # Shine on blade
         pygame.draw.line(screen, (255, 255, 255), (sx, sy), (tip_x, tip_y), 1)
 
 
-class Grenade:
+# Weapon type -> trail colour (Flamethrower flickers and is picked per frame)
+BULLET_TRAIL_COLORS = {
+    "Sniper": (200, 220, 255),        # Longer, thinner trail
+    "Shotgun": (255, 150, 50),        # Orange pellets
+    "RPG": (150, 150, 150),           # Smoke
+    "Laser": (0, 200, 0),             # Green glow
+    "Laser Gun": (0, 200, 0),
+    "Minigun": (180, 140, 60),        # Brass
+    "Crossbow": (139, 69, 19),        # Brown
+    "Electric": (100, 150, 255),      # Electric blue
+    "Electric Gun": (100, 150, 255),
+    "Freeze": (150, 220, 255),        # Ice blue
+    "Freeze Ray": (150, 220, 255),
+    "Dual Pistols": (255, 215, 0),    # Gold
+    "Throwing Knives": (192, 192, 192),  # Silver
+}
+
+# Weapon type -> (shape draw method, spin per lifetime frame) for bullets drawn
+# from several primitives; they blit a pre-rotated sprite via Bullet._draw_sprite
+BULLET_SPRITE_SHAPES = {
+    "Minigun": (Bullet._draw_minigun, 0),
+    "Crossbow": (Bullet._draw_crossbow, 0),
+    "Dual Pistols": (Bullet._draw_dual_pistols, 0),
+    "Throwing Knives": (Bullet._draw_throwing_knife, 0.3),
+    "Enemy_Knife": (Bullet._draw_enemy_knife, 0.4),
+}
+
+# Weapon type -> Bullet draw method, resolved once per bullet in reset()
+BULLET_DRAW_FUNCS = {
+    "Rifle": Bullet._draw_rifle_bullet,
+    "Handgun": Bullet._draw_handgun_bullet,
+    "Shotgun": Bullet._draw_shotgun_pellet,
+    "Sniper": Bullet._draw_sniper_bullet,
+    "RPG": Bullet._draw_rpg_rocket,
+    "Flamethrower": Bullet._draw_flamethrower,
+    "Laser": Bullet._draw_laser,
+    "Laser Gun": Bullet._draw_laser,
+    "Minigun": Bullet._draw_sprite,
+    "Crossbow": Bullet._draw_sprite,
+    "Electric": Bullet._draw_electric,
+    "Electric Gun": Bullet._draw_electric,
+    "Freeze": Bullet._draw_freeze,
+    "Freeze Ray": Bullet._draw_freeze,
+    "Dual Pistols": Bullet._draw_sprite,
+    "Throwing Knives": Bullet._draw_sprite,
+    "Enemy_Knife": Bullet._draw_sprite,
+    "Enemy_Pistol": Bullet._draw_enemy_pistol,
+}
+
+
+class Grenade(AngleSinCos):
     def __init__(self, x, y, angle):
         self.x = x
         self.y = y
@@ -1877,8 +2112,9 @@ class Grenade:
 
     def update(self):
         # Grenade rolls - slows down gradually like a ball
-        self.x += math.cos(self.angle) * self.speed
-        self.y += math.sin(self.angle) * self.speed
+        ca, sa = self._sincos()
+        self.x += ca * self.speed
+        self.y += sa * self.speed
 
         # Roll friction - slower deceleration for rolling effect
         if self.speed > 0.5:
@@ -1914,48 +2150,52 @@ class Grenade:
 
     def draw(self, screen, camera):
         sx, sy = camera.apply(self.x, self.y)
+        m = self.radius + 12  # Body plus spoon and fuse spark glow
+        if not (-m < sx < SCREEN_WIDTH + m and -m < sy < SCREEN_HEIGHT + m):
+            return
 
         # Draw realistic grenade body (olive green)
         pygame.draw.circle(screen, (60, 80, 60), (int(sx), int(sy)), self.radius)
         pygame.draw.circle(screen, (80, 100, 80), (int(sx), int(sy)), self.radius, 2)
 
         # Draw grenade segments (the textured lines)
-        for i in range(4):
-            seg_angle = self.roll_angle + i * (math.pi / 2)
-            seg_x1 = sx + math.cos(seg_angle) * 2
-            seg_y1 = sy + math.sin(seg_angle) * 2
-            seg_x2 = sx + math.cos(seg_angle) * (self.radius - 1)
-            seg_y2 = sy + math.sin(seg_angle) * (self.radius - 1)
+        # Four segments a quarter turn apart: rotate (cos, sin) by 90 degrees each time
+        c, s = math.cos(self.roll_angle), math.sin(self.roll_angle)
+        for ca, sa in ((c, s), (-s, c), (-c, -s), (s, -c)):
+            seg_x1 = sx + ca * 2
+            seg_y1 = sy + sa * 2
+            seg_x2 = sx + ca * (self.radius - 1)
+            seg_y2 = sy + sa * (self.radius - 1)
             pygame.draw.line(screen, (50, 70, 50), (seg_x1, seg_y1), (seg_x2, seg_y2), 1)
 
         # Draw spoon/lever (flies off after throw but we keep it for visual)
         spoon_angle = self.roll_angle + 0.5
-        spoon_x = sx + math.cos(spoon_angle) * (self.radius + 2)
-        spoon_y = sy + math.sin(spoon_angle) * (self.radius + 2)
-        spoon_end_x = spoon_x + math.cos(spoon_angle) * 6
-        spoon_end_y = spoon_y + math.sin(spoon_angle) * 6
+        ca, sa = math.cos(spoon_angle), math.sin(spoon_angle)
+        spoon_x = sx + ca * (self.radius + 2)
+        spoon_y = sy + sa * (self.radius + 2)
+        spoon_end_x = spoon_x + ca * 6
+        spoon_end_y = spoon_y + sa * 6
         pygame.draw.line(screen, (100, 100, 100), (spoon_x, spoon_y), (spoon_end_x, spoon_end_y), 2)
 
         # Draw fuse/top cap
-        cap_x = sx + math.cos(self.roll_angle + math.pi) * (self.radius - 2)
-        cap_y = sy + math.sin(self.roll_angle + math.pi) * (self.radius - 2)
+        ca, sa = -c, -s  # cos/sin of roll_angle + pi
+        cap_x = sx + ca * (self.radius - 2)
+        cap_y = sy + sa * (self.radius - 2)
         pygame.draw.circle(screen, (80, 80, 80), (int(cap_x), int(cap_y)), 3)
 
         # Draw fuse spark (blinking, gets faster as it gets close to exploding)
-        blink_rate = 10 if self.lifetime > 30 else 5 if self.lifetime > 15 else 2
+        blink_rate, spark_size, spark_color = FUSE_TABLE[max(0, min(90, self.lifetime))]
         if self.lifetime % blink_rate < blink_rate // 2 + 1:
-            spark_x = cap_x + math.cos(self.roll_angle + math.pi) * 4
-            spark_y = cap_y + math.sin(self.roll_angle + math.pi) * 4
+            spark_x = cap_x + ca * 4
+            spark_y = cap_y + sa * 4
             # Spark gets bigger and redder as it's about to explode
-            spark_size = 3 if self.lifetime > 30 else 4 if self.lifetime > 15 else 5
-            spark_color = ORANGE if self.lifetime > 30 else (255, 100, 0) if self.lifetime > 15 else RED
             pygame.draw.circle(screen, spark_color, (int(spark_x), int(spark_y)), spark_size)
             # Add glow effect when close to exploding
             if self.lifetime < 20:
                 pygame.draw.circle(screen, (255, 200, 100), (int(spark_x), int(spark_y)), spark_size + 2, 1)
 
 
-class SmokeGrenade:
+class SmokeGrenade(AngleSinCos):
     """Smoke grenade that creates a smoke cloud to block robot vision"""
     def __init__(self, x, y, angle):
         self.x = x
@@ -1970,8 +2210,9 @@ class SmokeGrenade:
 
     def update(self):
         # Smoke grenade rolls
-        self.x += math.cos(self.angle) * self.speed
-        self.y += math.sin(self.angle) * self.speed
+        ca, sa = self._sincos()
+        self.x += ca * self.speed
+        self.y += sa * self.speed
 
         # Roll friction
         if self.speed > 0.5:
@@ -2005,6 +2246,9 @@ class SmokeGrenade:
 
     def draw(self, screen, camera):
         sx, sy = camera.apply(self.x, self.y)
+        m = self.radius + 12  # Body plus cap and hiss puff
+        if not (-m < sx < SCREEN_WIDTH + m and -m < sy < SCREEN_HEIGHT + m):
+            return
 
         # Draw smoke grenade body (gray cylinder)
         pygame.draw.circle(screen, (80, 80, 90), (int(sx), int(sy)), self.radius)
@@ -2017,15 +2261,16 @@ class SmokeGrenade:
                         (sx + self.radius - 2, stripe_y1), 2)
 
         # Draw pin/cap
-        cap_x = sx + math.cos(self.roll_angle + math.pi) * (self.radius - 2)
-        cap_y = sy + math.sin(self.roll_angle + math.pi) * (self.radius - 2)
+        ca, sa = -math.cos(self.roll_angle), -math.sin(self.roll_angle)  # roll_angle + pi
+        cap_x = sx + ca * (self.radius - 2)
+        cap_y = sy + sa * (self.radius - 2)
         pygame.draw.circle(screen, (60, 60, 60), (int(cap_x), int(cap_y)), 3)
 
         # Hissing indicator when about to pop
         if self.lifetime < 30:
             hiss_size = 2 if self.lifetime > 15 else 3
-            hiss_x = cap_x + math.cos(self.roll_angle + math.pi) * 4
-            hiss_y = cap_y + math.sin(self.roll_angle + math.pi) * 4
+            hiss_x = cap_x + ca * 4
+            hiss_y = cap_y + sa * 4
             pygame.draw.circle(screen, (180, 180, 180), (int(hiss_x), int(hiss_y)), hiss_size)
 
 
@@ -2103,6 +2348,9 @@ class SmokeCloud:
 
 class Explosion:
     def __init__(self, x, y, radius):
+        self.reset(x, y, radius)
+
+    def reset(self, x, y, radius):
         self.x = x
         self.y = y
         self.max_radius = radius
@@ -2122,6 +2370,9 @@ class Explosion:
 
     def draw(self, screen, camera):
         sx, sy = camera.apply(self.x, self.y)
+        m = self.current_radius + 4  # Outermost ring plus its line width
+        if not (-m < sx < SCREEN_WIDTH + m and -m < sy < SCREEN_HEIGHT + m):
+            return
         # Draw explosion rings
         alpha = int(255 * (self.lifetime / 20))
         for i in range(3):
@@ -2139,28 +2390,45 @@ class HealingEffect:
     # Class-level cached font and text
     _cached_font = None
     _cached_text = None
+    _particle_sprites = {}
 
     def __init__(self, x, y):
         self.x = x
         self.y = y
         self.lifetime = 60  # 1 second at 60fps
         self.max_lifetime = 60
-        self.particles = []
         self.ring_radius = 0
         self.max_ring_radius = 50
 
-        # Create healing particles
+        # Healing particles as parallel lists; each flies along a fixed direction,
+        # so its cos/sin are taken once here instead of every frame
+        self.p_cos = []
+        self.p_sin = []
+        self.p_distance = []
+        self.p_speed = []
+        self.p_size = []
+        self.p_offset = []
         for _ in range(20):
-            angle = random.uniform(0, math.pi * 2)
-            distance = random.uniform(20, 60)
-            speed = random.uniform(0.5, 1.5)
-            self.particles.append({
-                'angle': angle,
-                'distance': distance,
-                'speed': speed,
-                'size': random.randint(3, 6),
-                'offset': random.uniform(0, math.pi * 2)
-            })
+            angle = random.uniform(0, TWO_PI)
+            self.p_cos.append(math.cos(angle))
+            self.p_sin.append(math.sin(angle))
+            self.p_distance.append(random.uniform(20, 60))
+            self.p_speed.append(random.uniform(0.5, 1.5))
+            self.p_size.append(random.randint(3, 6))
+            self.p_offset.append(random.uniform(0, TWO_PI))
+
+    @classmethod
+    def _particle_sprite(cls, size):
+        """Green healing particle with glow, cached per particle size"""
+        entry = cls._particle_sprites.get(size)
+        if entry is None:
+            r = size + 2
+            sprite = pygame.Surface((r * 2 + 1, r * 2 + 1), pygame.SRCALPHA).convert_alpha()
+            pygame.draw.circle(sprite, (100, 255, 150), (r, r), r)
+            pygame.draw.circle(sprite, (150, 255, 200), (r, r), size)
+            pygame.draw.circle(sprite, (200, 255, 220), (r, r), max(1, size - 2))
+            entry = cls._particle_sprites[size] = (sprite, r)
+        return entry
 
     def update(self, player_x, player_y):
         """Update effect position to follow player"""
@@ -2172,16 +2440,16 @@ class HealingEffect:
         progress = 1 - (self.lifetime / self.max_lifetime)
         self.ring_radius = self.max_ring_radius * progress
 
-        # Update particles (move towards center)
-        for p in self.particles:
-            p['distance'] -= p['speed']
-            if p['distance'] < 0:
-                p['distance'] = 0
+        # Update particles (move towards center, stopping there)
+        self.p_distance = [max(0, d - v) for d, v in zip(self.p_distance, self.p_speed)]
 
         return self.lifetime > 0
 
     def draw(self, screen, camera):
         sx, sy = camera.apply(self.x, self.y)
+        # Outermost particles reach 60 + 5 + glow, the "+HEAL" label rises to ~60 above
+        if not (-80 < sx < SCREEN_WIDTH + 80 and -80 < sy < SCREEN_HEIGHT + 80):
+            return
         progress = 1 - (self.lifetime / self.max_lifetime)
 
         # Draw healing ring expanding outward
@@ -2194,19 +2462,19 @@ class HealingEffect:
             if inner_radius > 5:
                 pygame.draw.circle(screen, (100, 255, 150), (int(sx), int(sy)), int(inner_radius), 2)
 
-        # Draw healing particles floating towards player
-        for p in self.particles:
-            if p['distance'] > 0:
+        # Draw healing particles floating towards player (one blits() batch)
+        batch = []
+        phase = self.lifetime * 0.2
+        sin = math.sin
+        for c, s, dist, size, offset in zip(self.p_cos, self.p_sin, self.p_distance,
+                                            self.p_size, self.p_offset):
+            if dist > 0:
                 # Particles spiral inward
-                wobble = math.sin(self.lifetime * 0.2 + p['offset']) * 5
-                px = sx + math.cos(p['angle']) * (p['distance'] + wobble)
-                py = sy + math.sin(p['angle']) * (p['distance'] + wobble)
-
-                # Green healing particle with glow
-                glow_size = p['size'] + 2
-                pygame.draw.circle(screen, (100, 255, 150), (int(px), int(py)), glow_size)
-                pygame.draw.circle(screen, (150, 255, 200), (int(px), int(py)), p['size'])
-                pygame.draw.circle(screen, (200, 255, 220), (int(px), int(py)), max(1, p['size'] - 2))
+                reach = dist + sin(phase + offset) * 5
+                sprite, r = self._particle_sprite(size)
+                batch.append((sprite, (int(sx + c * reach) - r, int(sy + s * reach) - r)))
+        if batch:
+            screen.blits(batch, False)
 
         # Draw plus sign in center when healing
         if self.lifetime > 30:
@@ -2277,7 +2545,7 @@ class Robot:
         elif bot_type == "throwing_knife":
             self.fire_rate = self.fire_rate + 20
 
-        self.radius = 20
+        self.radius = ROBOT_RADIUS
         self.angle = 0
         self.difficulty = difficulty
         self.state = "patrol"
@@ -2289,7 +2557,6 @@ class Robot:
         self.knife_only = knife_only  # If True, this robot only uses knife
         self.headshot_radius = 8  # Red dot target size for sniper headshots
         self.headshot_offset_y = -35  # Position above robot (above health bar)
-        self.show_sniper_target = False  # Whether to show red dot (set by game when sniper is equipped)
         self.freeze_timer = 0  # Freeze effect from freeze ray
         self.base_speed = self.speed  # Store original speed
 
@@ -2300,7 +2567,7 @@ class Robot:
             random.randint(margin, MAP_HEIGHT - margin)
         )
 
-    def update(self, player_x, player_y, obstacles):
+    def update(self, player_x, player_y, obstacle_grid):
         # Handle freeze timer
         if self.freeze_timer > 0:
             self.freeze_timer -= 1
@@ -2311,15 +2578,15 @@ class Robot:
         # Distance to player
         dx = player_x - self.x
         dy = player_y - self.y
-        dist = math.sqrt(dx*dx + dy*dy)
+        dist_sq = dx*dx + dy*dy
 
         # State machine - knife bots have longer detection range
         detect_range = 600 if self.knife_only else 400
         attack_range = 300
 
-        if dist < detect_range:
+        if dist_sq < detect_range * detect_range:
             self.state = "chase"
-            if dist < attack_range:
+            if dist_sq < attack_range * attack_range:
                 self.state = "attack"
         else:
             self.state = "patrol"
@@ -2329,41 +2596,57 @@ class Robot:
             tx, ty = self.patrol_target
             dx = tx - self.x
             dy = ty - self.y
-            dist_to_target = math.sqrt(dx*dx + dy*dy)
+            target_sq = dx*dx + dy*dy
 
-            if dist_to_target < 50:
+            if target_sq < 50 * 50:
                 self.patrol_target = self.get_patrol_target()
-            elif dist_to_target > 0:
-                self.x += (dx / dist_to_target) * self.speed * 0.5
-                self.y += (dy / dist_to_target) * self.speed * 0.5
+            else:
+                dist_to_target = math.sqrt(target_sq)
+                step = self.speed * 0.5 / dist_to_target
+                self.x += dx * step
+                self.y += dy * step
                 self.angle = math.atan2(dy, dx)
 
         elif self.state == "chase":
-            # Recalculate dx/dy for player direction
-            dx = player_x - self.x
-            dy = player_y - self.y
+            # Only moving toward the player needs the real distance
+            dist = math.sqrt(dist_sq)
             if dist > 0:
-                self.x += (dx / dist) * self.speed
-                self.y += (dy / dist) * self.speed
+                step = self.speed / dist
+                self.x += dx * step
+                self.y += dy * step
             self.angle = math.atan2(dy, dx)
 
         elif self.state == "attack":
-            # Recalculate dx/dy for player direction
-            dx = player_x - self.x
-            dy = player_y - self.y
+            dist = math.sqrt(dist_sq)
             self.angle = math.atan2(dy, dx)
             # Knife bots keep chasing even in attack state
             if self.knife_only and dist > self.knife_range:
                 if dist > 0:
-                    self.x += (dx / dist) * self.speed
-                    self.y += (dy / dist) * self.speed
+                    step = self.speed / dist
+                    self.x += dx * step
+                    self.y += dy * step
 
         # Keep in bounds
         self.x = max(self.radius + 50, min(MAP_WIDTH - self.radius - 50, self.x))
         self.y = max(self.radius + 50, min(MAP_HEIGHT - self.radius - 50, self.y))
 
-        # Check obstacle collision
-        for obs in obstacles:
+        # Check obstacle collision against the grid cells this circle (plus push slack) can touch
+        cell = OBSTACLE_GRID_CELL
+        reach = self.radius + 10
+        gx0 = int((self.x - reach) // cell)
+        gx1 = int((self.x + reach) // cell)
+        gy0 = int((self.y - reach) // cell)
+        gy1 = int((self.y + reach) // cell)
+        if gx0 == gx1 and gy0 == gy1:
+            nearby = obstacle_grid.get((gx0, gy0), ())
+        else:
+            nearby = []
+            for gx in range(gx0, gx1 + 1):
+                for gy in range(gy0, gy1 + 1):
+                    for obs in obstacle_grid.get((gx, gy), ()):
+                        if obs not in nearby:
+                            nearby.append(obs)
+        for obs in nearby:
             if obs.collides_circle(self.x, self.y, self.radius):
                 # Push out of obstacle
                 ox = obs.x + obs.width / 2
@@ -2372,8 +2655,9 @@ class Robot:
                 push_y = self.y - oy
                 push_dist = math.sqrt(push_x*push_x + push_y*push_y)
                 if push_dist > 0:
-                    self.x += (push_x / push_dist) * 5
-                    self.y += (push_y / push_dist) * 5
+                    step = 5 / push_dist
+                    self.x += push_x * step
+                    self.y += push_y * step
 
         # Fire cooldown
         if self.fire_cooldown > 0:
@@ -2396,8 +2680,7 @@ class Robot:
             return False
         dx = player_x - self.x
         dy = player_y - self.y
-        dist = math.sqrt(dx*dx + dy*dy)
-        return dist < self.knife_range
+        return dx*dx + dy*dy < self.knife_range * self.knife_range
 
     def knife_attack(self):
         """Perform knife attack"""
@@ -2419,21 +2702,21 @@ class Robot:
 
         # Different weapon types for different bot types
         if self.bot_type == "throwing_knife":
-            bullet = Bullet(self.x, self.y, angle, False, False, "Enemy_Knife")
+            bullet = BULLET_POOL.acquire(self.x, self.y, angle, False, False, "Enemy_Knife")
             bullet.damage = 25  # Higher damage for throwing knives
             bullet.speed = 12
-            return bullet
+            return [bullet]
         elif self.bot_type == "dual_pistol":
             # Dual pistols shoot two bullets with slight angle offset
             bullets = []
             for offset in [-0.1, 0.1]:
-                bullet = Bullet(self.x, self.y, angle + offset, False, False, "Enemy_Pistol")
+                bullet = BULLET_POOL.acquire(self.x, self.y, angle + offset, False, False, "Enemy_Pistol")
                 bullet.damage = 8  # Lower damage per bullet
                 bullet.speed = 14
                 bullets.append(bullet)
             return bullets
         else:
-            return Bullet(self.x, self.y, angle, False, False, "Enemy")
+            return [BULLET_POOL.acquire(self.x, self.y, angle, False, False, "Enemy")]
 
     def take_damage(self, damage):
         self.health -= damage
@@ -2446,10 +2729,98 @@ class Robot:
         headshot_y = self.y + self.headshot_offset_y
         dx = bullet_x - headshot_x
         dy = bullet_y - headshot_y
-        dist = math.sqrt(dx*dx + dy*dy)
-        return dist < self.headshot_radius + 5  # 5 is bullet radius
+        reach = self.headshot_radius + 5  # 5 is bullet radius
+        return dx*dx + dy*dy < reach * reach
+
+    # Pre-rendered body, eyes and weapon keyed by (look, body colour, rotation step);
+    # the ice crystals and health bar change every frame and stay live-drawn
+    ROT_STEPS = 64
+    ROT_SPRITES = {}
+
+    def _body_sprite(self, body_color):
+        step = int(self.angle * (self.ROT_STEPS / TWO_PI) + 0.5) % self.ROT_STEPS
+        key = (self.knife_only, self.bot_type, self.radius, body_color, step)
+        sprite = Robot.ROT_SPRITES.get(key)
+        if sprite is None:
+            c = self.radius + 14  # Gun reaches radius + 10, plus line width
+            sprite = pygame.Surface((c * 2, c * 2), pygame.SRCALPHA).convert_alpha()
+            angle = step * TWO_PI / self.ROT_STEPS
+            self._draw_body(sprite, c, c, body_color, angle, math.cos(angle), math.sin(angle))
+            Robot.ROT_SPRITES[key] = sprite
+        return sprite
+
+    def _draw_body(self, surface, sx, sy, body_color, angle, ca, sa):
+        """Body, eyes and bot-type weapon facing (ca, sa)"""
+        # Draw body
+        pygame.draw.circle(surface, body_color, (int(sx), int(sy)), self.radius)
+        pygame.draw.circle(surface, DARK_GRAY, (int(sx), int(sy)), self.radius, 2)
+
+        # Draw two red eyes
+        eye_offset = 6  # Distance between eyes
+        eye_dist = 8  # Distance from center
+
+        # Eyes sit 0.4 rad either side of the facing direction
+        rot_c, rot_s = EYE_ROT
+        left_c, left_s = ca * rot_c - sa * rot_s, sa * rot_c + ca * rot_s
+        right_c, right_s = ca * rot_c + sa * rot_s, sa * rot_c - ca * rot_s
 
-    def draw(self, screen, camera):
+        # Left eye
+        left_eye_x = sx + left_c * eye_dist
+        left_eye_y = sy + left_s * eye_dist
+        pygame.draw.circle(surface, RED, (int(left_eye_x), int(left_eye_y)), 4)
+        pygame.draw.circle(surface, (150, 0, 0), (int(left_eye_x), int(left_eye_y)), 2)
+
+        # Right eye
+        right_eye_x = sx + right_c * eye_dist
+        right_eye_y = sy + right_s * eye_dist
+        pygame.draw.circle(surface, RED, (int(right_eye_x), int(right_eye_y)), 4)
+        pygame.draw.circle(surface, (150, 0, 0), (int(right_eye_x), int(right_eye_y)), 2)
+
+        # Draw weapon based on bot type
+        if self.knife_only:
+            # Draw knife - shorter and silver colored
+            knife_length = self.radius + 8
+            knife_x = sx + ca * knife_length
+            knife_y = sy + sa * knife_length
+            pygame.draw.line(surface, (192, 192, 192), (sx, sy), (knife_x, knife_y), 3)
+            # Draw knife tip
+            tip_x = sx + ca * (knife_length + 4)
+            tip_y = sy + sa * (knife_length + 4)
+            pygame.draw.line(surface, WHITE, (knife_x, knife_y), (tip_x, tip_y), 2)
+        elif self.bot_type == "throwing_knife":
+            # Draw multiple throwing knives on back (like a bandolier)
+            for i in range(-1, 2):
+                offset_angle = angle + math.pi + (i * 0.3)
+                oc, os_ = math.cos(offset_angle), math.sin(offset_angle)
+                kx = sx + oc * (self.radius - 5)
+                ky = sy + os_ * (self.radius - 5)
+                ktx = kx + oc * 8
+                kty = ky + os_ * 8
+                pygame.draw.line(surface, (192, 192, 192), (kx, ky), (ktx, kty), 2)
+            # Draw arm with knife ready to throw
+            arm_x = sx + ca * (self.radius + 5)
+            arm_y = sy + sa * (self.radius + 5)
+            pygame.draw.line(surface, (150, 150, 150), (sx, sy), (arm_x, arm_y), 4)
+        elif self.bot_type == "dual_pistol":
+            # Draw two guns (dual pistols)
+            # Same +/-0.4 rad rotations as the eyes
+            for gc, gs in ((left_c, left_s), (right_c, right_s)):
+                gun_start_x = sx + gc * 5
+                gun_start_y = sy + gs * 5
+                gun_length = self.radius + 8
+                gun_x = sx + gc * gun_length
+                gun_y = sy + gs * gun_length
+                pygame.draw.line(surface, (255, 215, 0), (gun_start_x, gun_start_y), (gun_x, gun_y), 4)
+                # Gold tip
+                pygame.draw.circle(surface, (255, 240, 150), (int(gun_x), int(gun_y)), 2)
+        else:
+            # Draw standard gun
+            gun_length = self.radius + 10
+            gun_x = sx + ca * gun_length
+            gun_y = sy + sa * gun_length
+            pygame.draw.line(surface, DARK_GRAY, (sx, sy), (gun_x, gun_y), 6)
+
+    def draw(self, screen, camera, show_sniper_target=False):
         sx, sy = camera.apply(self.x, self.y)
 
         # Only draw if on screen
@@ -2462,78 +2833,20 @@ class Robot:
             else:
                 body_color = self.color
 
-            # Draw body
-            pygame.draw.circle(screen, body_color, (int(sx), int(sy)), self.radius)
-            pygame.draw.circle(screen, DARK_GRAY, (int(sx), int(sy)), self.radius, 2)
+            # Body, eyes and weapon from the cached rotation
+            sprite = self._body_sprite(body_color)
+            c = sprite.get_width() // 2
+            screen.blit(sprite, (int(sx) - c, int(sy) - c))
 
             # Draw ice crystals when frozen
             if self.freeze_timer > 0:
-                for i in range(4):
-                    crystal_angle = i * (math.pi / 2) + (self.freeze_timer * 0.02)
-                    cx = sx + math.cos(crystal_angle) * (self.radius + 5)
-                    cy = sy + math.sin(crystal_angle) * (self.radius + 5)
-                    pygame.draw.circle(screen, (200, 240, 255), (int(cx), int(cy)), 3)
-
-            # Draw two red eyes
-            eye_offset = 6  # Distance between eyes
-            eye_dist = 8  # Distance from center
-
-            # Left eye
-            left_eye_angle = self.angle + 0.4
-            left_eye_x = sx + math.cos(left_eye_angle) * eye_dist
-            left_eye_y = sy + math.sin(left_eye_angle) * eye_dist
-            pygame.draw.circle(screen, RED, (int(left_eye_x), int(left_eye_y)), 4)
-            pygame.draw.circle(screen, (150, 0, 0), (int(left_eye_x), int(left_eye_y)), 2)
-
-            # Right eye
-            right_eye_angle = self.angle - 0.4
-            right_eye_x = sx + math.cos(right_eye_angle) * eye_dist
-            right_eye_y = sy + math.sin(right_eye_angle) * eye_dist
-            pygame.draw.circle(screen, RED, (int(right_eye_x), int(right_eye_y)), 4)
-            pygame.draw.circle(screen, (150, 0, 0), (int(right_eye_x), int(right_eye_y)), 2)
-
-            # Draw weapon based on bot type
-            if self.knife_only:
-                # Draw knife - shorter and silver colored
-                knife_length = self.radius + 8
-                knife_x = sx + math.cos(self.angle) * knife_length
-                knife_y = sy + math.sin(self.angle) * knife_length
-                pygame.draw.line(screen, (192, 192, 192), (sx, sy), (knife_x, knife_y), 3)
-                # Draw knife tip
-                tip_x = sx + math.cos(self.angle) * (knife_length + 4)
-                tip_y = sy + math.sin(self.angle) * (knife_length + 4)
-                pygame.draw.line(screen, WHITE, (knife_x, knife_y), (tip_x, tip_y), 2)
-            elif self.bot_type == "throwing_knife":
-                # Draw multiple throwing knives on back (like a bandolier)
-                for i in range(-1, 2):
-                    offset_angle = self.angle + math.pi + (i * 0.3)
-                    kx = sx + math.cos(offset_angle) * (self.radius - 5)
-                    ky = sy + math.sin(offset_angle) * (self.radius - 5)
-                    ktx = kx + math.cos(offset_angle) * 8
-                    kty = ky + math.sin(offset_angle) * 8
-                    pygame.draw.line(screen, (192, 192, 192), (kx, ky), (ktx, kty), 2)
-                # Draw arm with knife ready to throw
-                arm_x = sx + math.cos(self.angle) * (self.radius + 5)
-                arm_y = sy + math.sin(self.angle) * (self.radius + 5)
-                pygame.draw.line(screen, (150, 150, 150), (sx, sy), (arm_x, arm_y), 4)
-            elif self.bot_type == "dual_pistol":
-                # Draw two guns (dual pistols)
-                for offset in [0.4, -0.4]:
-                    gun_angle = self.angle + offset
-                    gun_start_x = sx + math.cos(gun_angle) * 5
-                    gun_start_y = sy + math.sin(gun_angle) * 5
-                    gun_length = self.radius + 8
-                    gun_x = sx + math.cos(gun_angle) * gun_length
-                    gun_y = sy + math.sin(gun_angle) * gun_length
-                    pygame.draw.line(screen, (255, 215, 0), (gun_start_x, gun_start_y), (gun_x, gun_y), 4)
-                    # Gold tip
-                    pygame.draw.circle(screen, (255, 240, 150), (int(gun_x), int(gun_y)), 2)
-            else:
-                # Draw standard gun
-                gun_length = self.radius + 10
-                gun_x = sx + math.cos(self.angle) * gun_length
-                gun_y = sy + math.sin(self.angle) * gun_length
-                pygame.draw.line(screen, DARK_GRAY, (sx, sy), (gun_x, gun_y), 6)
+                crystal_angle = self.freeze_timer * 0.02
+                reach = self.radius + 5
+                ox = math.cos(crystal_angle) * reach
+                oy = math.sin(crystal_angle) * reach
+                # Four crystals a quarter turn apart: rotate (ox, oy) by 90 degrees each time
+                for cx, cy in ((ox, oy), (-oy, ox), (-ox, -oy), (oy, -ox)):
+                    pygame.draw.circle(screen, (200, 240, 255), (int(sx + cx), int(sy + cy)), 3)
 
             # Health bar
             bar_width = 40
@@ -2548,7 +2861,7 @@ class Robot:
             pygame.draw.rect(screen, WHITE, (bar_x, bar_y, bar_width, bar_height), 1)
 
             # Sniper headshot target (red dot above health bar) - only shows when sniper is equipped
-            if self.show_sniper_target:
+            if show_sniper_target:
                 headshot_x = int(sx)
                 headshot_y = int(sy + self.headshot_offset_y)
                 # Outer ring
@@ -2557,14 +2870,14 @@ class Robot:
                 pygame.draw.circle(screen, RED, (headshot_x, headshot_y), 4)
 
 
-class Boss:
+class Boss(AngleSinCos):
     def __init__(self, x, y):
         self.x = x
         self.y = y
         self.health = 1000
         self.max_health = 1000
         self.speed = 2
-        self.radius = 50  # Much bigger than normal robots
+        self.radius = BOSS_RADIUS  # Much bigger than normal robots
         self.angle = 0
         self.fire_cooldown = 0
         self.fire_rate = 20  # Faster shooting
@@ -2576,13 +2889,12 @@ class Boss:
         self.charge_target = None
         self.headshot_radius = 12  # Bigger target for boss
         self.headshot_offset_y = -70  # Position above boss
-        self.show_sniper_target = False  # Whether to show red dot (set by game when sniper is equipped)
 
     def update(self, player_x, player_y, obstacles):
         dx = player_x - self.x
         dy = player_y - self.y
         dist = math.sqrt(dx*dx + dy*dy)
-        self.angle = math.atan2(dy, dx)
+        self._face(dx, dy, dist)
 
         # Pattern switching
         self.pattern_timer += 1
@@ -2595,8 +2907,9 @@ class Boss:
         if self.attack_pattern == 0:
             # Chase player slowly
             if dist > 100:
-                self.x += (dx / dist) * self.speed
-                self.y += (dy / dist) * self.speed
+                step = self.speed / dist
+                self.x += dx * step
+                self.y += dy * step
         elif self.attack_pattern == 1:
             # Charge attack
             if not self.is_charging and self.pattern_timer == 1:
@@ -2607,15 +2920,17 @@ class Boss:
                 cdy = self.charge_target[1] - self.y
                 cdist = math.sqrt(cdx*cdx + cdy*cdy)
                 if cdist > 20:
-                    self.x += (cdx / cdist) * self.charge_speed
-                    self.y += (cdy / cdist) * self.charge_speed
+                    step = self.charge_speed / cdist
+                    self.x += cdx * step
+                    self.y += cdy * step
                 else:
                     self.is_charging = False
         elif self.attack_pattern == 2:
             # Circle strafe
-            strafe_angle = self.angle + math.pi / 2
-            self.x += math.cos(strafe_angle) * self.speed * 1.5
-            self.y += math.sin(strafe_angle) * self.speed * 1.5
+            # Perpendicular to the facing direction: (cos, sin) rotated by 90 degrees
+            ca, sa = self._sincos()
+            self.x -= sa * self.speed * 1.5
+            self.y += ca * self.speed * 1.5
 
         # Keep in bounds
         self.x = max(self.radius + 50, min(MAP_WIDTH - self.radius - 50, self.x))
@@ -2639,7 +2954,7 @@ class Boss:
         for i in range(spread):
             angle_offset = (i - spread // 2) * 0.15
             angle = self.angle + angle_offset
-            bullet = Bullet(self.x, self.y, angle, False, False, "Enemy")
+            bullet = BULLET_POOL.acquire(self.x, self.y, angle, False, False, "Enemy")
             bullet.damage = 15
             bullet.speed = 10
             bullets.append(bullet)
@@ -2657,10 +2972,10 @@ class Boss:
         headshot_y = self.y + self.headshot_offset_y
         dx = bullet_x - headshot_x
         dy = bullet_y - headshot_y
-        dist = math.sqrt(dx*dx + dy*dy)
-        return dist < self.headshot_radius + 5  # 5 is bullet radius
+        reach = self.headshot_radius + 5  # 5 is bullet radius
+        return dx*dx + dy*dy < reach * reach
 
-    def draw(self, screen, camera):
+    def draw(self, screen, camera, show_sniper_target=False):
         sx, sy = camera.apply(self.x, self.y)
 
         if -100 < sx < SCREEN_WIDTH + 100 and -100 < sy < SCREEN_HEIGHT + 100:
@@ -2672,21 +2987,22 @@ class Boss:
             pygame.draw.circle(screen, (100, 0, 100), (int(sx), int(sy)), self.radius, 4)
 
             # Draw evil eyes
+            ca, sa = self._sincos()
             eye_offset = 15
             for ex in [-1, 1]:
-                eye_x = sx + ex * eye_offset + math.cos(self.angle) * 10
-                eye_y = sy + math.sin(self.angle) * 10
+                eye_x = sx + ex * eye_offset + ca * 10
+                eye_y = sy + sa * 10
                 pygame.draw.circle(screen, RED, (int(eye_x), int(eye_y)), 10)
                 pygame.draw.circle(screen, BLACK, (int(eye_x), int(eye_y)), 5)
 
             # Draw gun (bigger)
             gun_length = self.radius + 20
-            gun_x = sx + math.cos(self.angle) * gun_length
-            gun_y = sy + math.sin(self.angle) * gun_length
+            gun_x = sx + ca * gun_length
+            gun_y = sy + sa * gun_length
             pygame.draw.line(screen, DARK_GRAY, (sx, sy), (gun_x, gun_y), 12)
 
             # Sniper headshot target (bigger red dot for boss) - only shows when sniper is equipped
-            if self.show_sniper_target:
+            if show_sniper_target:
                 headshot_x = int(sx)
                 headshot_y = int(sy + self.headshot_offset_y)
                 # Outer ring
@@ -2732,26 +3048,47 @@ class Obstacle:
     def collides_point(self, px, py):
         return self.x <= px <= self.x + self.width and self.y <= py <= self.y + self.height
 
+    # Baked obstacle surfaces shared by every obstacle of the same size and color
+    _sprites = {}
+
+    def sprite(self):
+        key = (self.width, self.height, self.color)
+        surf = Obstacle._sprites.get(key)
+        if surf is None:
+            surf = pygame.Surface((self.width, self.height)).convert()
+            pygame.draw.rect(surf, self.color, (0, 0, self.width, self.height))
+            pygame.draw.rect(surf, DARK_GRAY, (0, 0, self.width, self.height), 3)
+            Obstacle._sprites[key] = surf
+        return surf
+
     def draw(self, screen, camera):
         sx, sy = camera.apply(self.x, self.y)
 
         # Only draw if on screen
         if sx + self.width > 0 and sx < SCREEN_WIDTH and sy + self.height > 0 and sy < SCREEN_HEIGHT:
-            pygame.draw.rect(screen, self.color, (sx, sy, self.width, self.height))
-            pygame.draw.rect(screen, DARK_GRAY, (sx, sy, self.width, self.height), 3)
+            screen.blit(self.sprite(), (sx, sy))
+
+    @staticmethod
+    def draw_batch(screen, camera, obstacles):
+        """Blit already-culled obstacles with a single blits() call"""
+        cx, cy = camera.x, camera.y
+        screen.blits([(o.sprite(), (o.x - cx, o.y - cy)) for o in obstacles], False)
 
 
 class ShellCasing:
     """Ejected shell casing particle"""
     def __init__(self, x, y, angle):
+        self.reset(x, y, angle)
+
+    def reset(self, x, y, angle):
         self.x = x
         self.y = y
         # Eject to the right of the gun
-        eject_angle = angle + math.pi / 2 + random.uniform(-0.3, 0.3)
+        eject_angle = angle + HALF_PI + random.uniform(-0.3, 0.3)
         speed = random.uniform(3, 6)
         self.vx = math.cos(eject_angle) * speed
         self.vy = math.sin(eject_angle) * speed
-        self.rotation = random.uniform(0, math.pi * 2)
+        self.rotation = random.uniform(0, TWO_PI)
         self.rot_speed = random.uniform(-0.5, 0.5)
         self.life = 60  # frames
         self.size = random.uniform(3, 5)
@@ -2766,25 +3103,53 @@ class ShellCasing:
         self.life -= 1
         return self.life > 0
 
+    # Pre-rotated brass sprites keyed by (rotation step, half-pixel size).
+    # The shape repeats every quarter turn, so ROT_STEPS covers pi/2.
+    ROT_STEPS = 24
+    ROT_SPRITES = {}
+    SPRITE_HALF = 6
+
+    @classmethod
+    def _sprite(cls, rotation, size):
+        step = int(rotation % HALF_PI / HALF_PI * cls.ROT_STEPS) % cls.ROT_STEPS
+        half_size = int(size * 2 + 0.5)
+        key = (step, half_size)
+        sprite = cls.ROT_SPRITES.get(key)
+        if sprite is None:
+            c = cls.SPRITE_HALF
+            sprite = pygame.Surface((c * 2, c * 2), pygame.SRCALPHA).convert_alpha()
+            rot = step * HALF_PI / cls.ROT_STEPS
+            sz = half_size / 2
+            points = []
+            for i in range(4):
+                angle = rot + i * HALF_PI
+                points.append((c + math.cos(angle) * sz, c + math.sin(angle) * sz * 0.4))
+            pygame.draw.polygon(sprite, (200, 160, 60), points)
+            cls.ROT_SPRITES[key] = sprite
+        return sprite
+
     def draw(self, screen, camera):
         sx, sy = camera.apply(self.x, self.y)
-        # Draw brass colored shell
-        alpha = min(255, self.life * 8)
-        color = (200, 160, 60)
-        # Draw as small rectangle
-        points = []
-        for i in range(4):
-            angle = self.rotation + i * math.pi / 2
-            px = sx + math.cos(angle) * self.size
-            py = sy + math.sin(angle) * self.size * 0.4
-            points.append((px, py))
-        if len(points) >= 3:
-            pygame.draw.polygon(screen, color, points)
+        c = self.SPRITE_HALF
+        screen.blit(self._sprite(self.rotation, self.size), (int(sx) - c, int(sy) - c))
+
+    @classmethod
+    def draw_batch(cls, screen, camera, casings):
+        """Draw all casings with a single blits() call"""
+        if not casings:
+            return
+        cx, cy = camera.x + cls.SPRITE_HALF, camera.y + cls.SPRITE_HALF
+        sprite = cls._sprite
+        screen.blits([(sprite(c.rotation, c.size), (int(c.x - cx), int(c.y - cy)))
+                      for c in casings], False)
 
 
 class MuzzleFlash:
     """Muzzle flash effect"""
     def __init__(self, x, y, angle, size=1.0):
+        self.reset(x, y, angle, size)
+
+    def reset(self, x, y, angle, size=1.0):
         self.x = x
         self.y = y
         self.angle = angle
@@ -2832,7 +3197,7 @@ class Pickup:
         self.y = y
         self.type = pickup_type  # "health" or "ammo"
         self.radius = 15
-        self.bob_offset = random.uniform(0, math.pi * 2)  # For floating animation
+        self.bob_offset = random.uniform(0, TWO_PI)  # For floating animation
         self.lifetime = 600  # 10 seconds at 60 FPS
 
     def update(self):
@@ -2884,7 +3249,7 @@ class Player:
     def __init__(self, x, y):
         self.x = x
         self.y = y
-        self.radius = 18
+        self.radius = PLAYER_RADIUS
         self.speed = 5
         self.angle = 0
         self.health = 100
@@ -2943,27 +3308,24 @@ class Player:
         ]
 
         # Load saved coins and unlocked weapons
-        (saved_coins, saved_rpg, saved_shotgun, saved_medkit_charges, saved_sniper,
-         saved_flamethrower, saved_laser, saved_minigun, saved_crossbow,
-         saved_electric, saved_freeze, saved_dual_pistols, saved_throwing_knives,
-         saved_avatar, saved_owned_avatars) = load_save()
-        self.coins = saved_coins
-        self.has_rpg = saved_rpg
-        self.has_shotgun = saved_shotgun
-        self.has_sniper = saved_sniper
-        self.medkit_charges = saved_medkit_charges  # Number of heals available
-        self.has_flamethrower = saved_flamethrower
-        self.has_laser = saved_laser
-        self.has_minigun = saved_minigun
-        self.has_crossbow = saved_crossbow
-        self.has_electric = saved_electric
-        self.has_freeze = saved_freeze
-        self.has_dual_pistols = saved_dual_pistols
-        self.has_throwing_knives = saved_throwing_knives
+        save = load_save()
+        self.coins = save.coins
+        self.has_rpg = save.has_rpg
+        self.has_shotgun = save.has_shotgun
+        self.has_sniper = save.has_sniper
+        self.medkit_charges = save.medkit_charges  # Number of heals available
+        self.has_flamethrower = save.has_flamethrower
+        self.has_laser = save.has_laser
+        self.has_minigun = save.has_minigun
+        self.has_crossbow = save.has_crossbow
+        self.has_electric = save.has_electric
+        self.has_freeze = save.has_freeze
+        self.has_dual_pistols = save.has_dual_pistols
+        self.has_throwing_knives = save.has_throwing_knives
         # Load avatar settings
-        self.avatar_type = saved_avatar
-        self.avatar = Avatar(saved_avatar)
-        self.owned_avatars = saved_owned_avatars if saved_owned_avatars else ["default"]
+        self.avatar_type = save.current_avatar
+        self.avatar = Avatar(save.current_avatar)
+        self.owned_avatars = save.owned_avatars if save.owned_avatars else ["default"]
 
         # Shotgun - pump-action, 8 shell mag
         if self.has_shotgun:
@@ -3461,14 +3823,18 @@ class Player:
 
     def add_coin(self, amount=1):
         self.coins += amount
-        self.save_progress()  # Auto-save when coins are added
-
-    def save_progress(self):
-        """Save coins, weapon unlocks, and avatar data"""
-        return save_game(self.coins, self.has_rpg, self.has_shotgun, self.medkit_charges, self.has_sniper,
-                        self.has_flamethrower, self.has_laser, self.has_minigun, self.has_crossbow,
-                        self.has_electric, self.has_freeze, self.has_dual_pistols, self.has_throwing_knives,
-                        self.avatar_type, self.owned_avatars)
+        self.save_progress(coalesce=True)  # Auto-save when coins are added
+
+    def save_progress(self, coalesce=False):
+        """Save coins, weapon unlocks, and avatar data - written immediately unless coalesce
+        (frequent coin pickups), which lets flush_save() batch the storage writes"""
+        saved = save_game(self.coins, self.has_rpg, self.has_shotgun, self.medkit_charges, self.has_sniper,
+                          self.has_flamethrower, self.has_laser, self.has_minigun, self.has_crossbow,
+                          self.has_electric, self.has_freeze, self.has_dual_pistols, self.has_throwing_knives,
+                          self.avatar_type, self.owned_avatars)
+        if not coalesce:
+            flush_save(force=True)
+        return saved
 
     def use_medkit(self):
         """Use a medkit charge to heal to full HP"""
@@ -3587,7 +3953,7 @@ class Player:
 
         is_shotgun = self.weapon.get("shotgun", False)
         weapon_name = self.weapon["name"]
-        bullet = Bullet(
+        bullet = BULLET_POOL.acquire(
             self.x + math.cos(self.angle) * (self.radius + 10),
             self.y + math.sin(self.angle) * (self.radius + 10),
             self.angle,
@@ -3882,7 +4248,7 @@ class Player:
         elif self.reloading and 0.5 < self.reload_phase <= 0.8:
             mag_offset = 15 * (1 - (self.reload_phase - 0.5) / 0.3)  # Magazine comes back
 
-        mag_angle = angle + math.pi/2 + 0.3
+        mag_angle = angle + HALF_PI + 0.3
         mag_x = gun_start_x + math.cos(angle) * (8 - recoil)
         mag_y = gun_start_y + math.sin(angle) * (8 - recoil)
         mag_end_x = mag_x + math.cos(mag_angle) * (8 + mag_offset)
@@ -3903,7 +4269,7 @@ class Player:
             pygame.draw.circle(screen, (255, 255, 200), (int(flash_x), int(flash_y)), int(flash_size * 0.5))
             # Shell ejection
             if self.fire_cooldown > 3:
-                eject_angle = angle + math.pi/2 + 0.3
+                eject_angle = angle + HALF_PI + 0.3
                 eject_dist = 8 + (6 - self.fire_cooldown) * 2
                 shell_x = gun_start_x + math.cos(angle) * 10 + math.cos(eject_angle) * eject_dist
                 shell_y = gun_start_y + math.sin(angle) * 10 + math.sin(eject_angle) * eject_dist
@@ -3934,7 +4300,7 @@ class Player:
                         (slide_end_x, slide_end_y), 2)
 
         # Grip
-        grip_angle = angle + math.pi/2 + 0.4
+        grip_angle = angle + HALF_PI + 0.4
         grip_x = gun_start_x
         grip_y = gun_start_y
         grip_end_x = grip_x + math.cos(grip_angle) * 10
@@ -3961,7 +4327,7 @@ class Player:
             pygame.draw.circle(screen, (255, 220, 100), (int(flash_x), int(flash_y)), int(flash_size))
             # Shell eject
             if self.fire_cooldown > 4:
-                eject_angle = angle - math.pi/2 - 0.2
+                eject_angle = angle - HALF_PI - 0.2
                 eject_dist = 6 + (8 - self.fire_cooldown) * 1.5
                 shell_x = gun_start_x + math.cos(angle) * 6 + math.cos(eject_angle) * eject_dist
                 shell_y = gun_start_y + math.sin(angle) * 6 + math.sin(eject_angle) * eject_dist
@@ -3997,7 +4363,7 @@ class Player:
         pygame.draw.circle(screen, (255, 255, 255), (int(gleam_x), int(gleam_y)), 2)
 
         # Guard at the start
-        guard_angle = angle + math.pi/2
+        guard_angle = angle + HALF_PI
         guard_x1 = knife_start_x + math.cos(guard_angle) * 5
         guard_y1 = knife_start_y + math.sin(guard_angle) * 5
         guard_x2 = knife_start_x + math.cos(guard_angle + math.pi) * 5
@@ -4114,8 +4480,8 @@ class Player:
         # Shell ejecting during reload
         if self.reloading and 0.35 <= self.reload_phase <= 0.45:
             shell_progress = (self.reload_phase - 0.35) / 0.1
-            shell_x = pump_x + math.cos(angle + math.pi/2) * (5 + shell_progress * 15)
-            shell_y = pump_y + math.sin(angle + math.pi/2) * (5 + shell_progress * 15)
+            shell_x = pump_x + math.cos(angle + HALF_PI) * (5 + shell_progress * 15)
+            shell_y = pump_y + math.sin(angle + HALF_PI) * (5 + shell_progress * 15)
             pygame.draw.ellipse(screen, (200, 50, 50), (shell_x - 3, shell_y - 2, 8, 4))
 
         # Massive muzzle flash for shotgun (spread pattern)
@@ -4164,7 +4530,7 @@ class Player:
             pygame.draw.circle(screen, (80, 80, 60), (int(rocket_x), int(rocket_y)), 4)
 
         # Grip/trigger
-        grip_angle = angle + math.pi/2 + 0.3
+        grip_angle = angle + HALF_PI + 0.3
         grip_x = gun_start_x + math.cos(angle) * 5
         grip_y = gun_start_y + math.sin(angle) * 5
         grip_end_x = grip_x + math.cos(grip_angle) * 12
@@ -4174,8 +4540,8 @@ class Player:
         # Rear sight
         sight_x = gun_start_x + math.cos(angle) * 8
         sight_y = gun_start_y + math.sin(angle) * 8
-        sight_up_x = sight_x + math.cos(angle - math.pi/2) * 6
-        sight_up_y = sight_y + math.sin(angle - math.pi/2) * 6
+        sight_up_x = sight_x + math.cos(angle - HALF_PI) * 6
+        sight_up_y = sight_y + math.sin(angle - HALF_PI) * 6
         pygame.draw.line(screen, (60, 60, 55), (sight_x, sight_y), (sight_up_x, sight_up_y), 2)
 
         # Rocket ignition and backblast when firing
@@ -4225,7 +4591,7 @@ class Player:
         scope_x = gun_start_x + math.cos(angle) * (12 - recoil)
         scope_y = gun_start_y + math.sin(angle) * (12 - recoil)
         # Scope body
-        scope_up_angle = angle - math.pi/2
+        scope_up_angle = angle - HALF_PI
         scope_top_x = scope_x + math.cos(scope_up_angle) * 8
         scope_top_y = scope_y + math.sin(scope_up_angle) * 8
         pygame.draw.line(screen, (20, 20, 25), (scope_x, scope_y), (scope_top_x, scope_top_y), 6)
@@ -4242,7 +4608,7 @@ class Player:
         # Bipod hints
         bipod_x = gun_start_x + math.cos(angle) * (barrel_length - 8)
         bipod_y = gun_start_y + math.sin(angle) * (barrel_length - 8)
-        bipod_angle = angle + math.pi/2 + 0.5
+        bipod_angle = angle + HALF_PI + 0.5
         bipod_end_x = bipod_x + math.cos(bipod_angle) * 6
         bipod_end_y = bipod_y + math.sin(bipod_angle) * 6
         pygame.draw.line(screen, (60, 60, 60), (bipod_x, bipod_y), (bipod_end_x, bipod_end_y), 2)
@@ -4256,7 +4622,7 @@ class Player:
             pygame.draw.circle(screen, (255, 255, 230), (int(flash_x), int(flash_y)), 5)
             # Shell eject
             if self.fire_cooldown > 3:
-                eject_angle = angle + math.pi/2 + 0.4
+                eject_angle = angle + HALF_PI + 0.4
                 eject_dist = 10 + (5 - min(5, self.fire_cooldown)) * 3
                 shell_x = gun_start_x + math.cos(angle) * 15 + math.cos(eject_angle) * eject_dist
                 shell_y = gun_start_y + math.sin(angle) * 15 + math.sin(eject_angle) * eject_dist
@@ -4278,10 +4644,10 @@ class Player:
         rot = self.minigun_rotation
         # Draw only 3 barrels for better performance
         for i in range(3):
-            barrel_angle = rot + (i * math.pi * 2 / 3)
+            barrel_angle = rot + (i * TWO_PI / 3)
             perp_offset = 5 * math.sin(barrel_angle)
-            bx = barrel_center_x + math.cos(angle + math.pi/2) * perp_offset
-            by = barrel_center_y + math.sin(angle + math.pi/2) * perp_offset
+            bx = barrel_center_x + math.cos(angle + HALF_PI) * perp_offset
+            by = barrel_center_y + math.sin(angle + HALF_PI) * perp_offset
             bex = bx + math.cos(angle) * 14
             bey = by + math.sin(angle) * 14
             pygame.draw.line(screen, (50, 50, 55), (bx, by), (bex, bey), 3)
@@ -4295,13 +4661,13 @@ class Player:
                 drum_drop = 20
             else:
                 drum_drop = 20 * (1 - (phase - 0.7) / 0.3)
-        drum_x = gun_start_x + math.cos(angle + math.pi/2) * (10 + drum_drop)
-        drum_y = gun_start_y + math.sin(angle + math.pi/2) * (10 + drum_drop)
+        drum_x = gun_start_x + math.cos(angle + HALF_PI) * (10 + drum_drop)
+        drum_y = gun_start_y + math.sin(angle + HALF_PI) * (10 + drum_drop)
         pygame.draw.circle(screen, (80, 70, 60), (int(drum_x), int(drum_y)), 8)
         # Ammo belt
         if not self.reloading or self.reload_phase > 0.7:
-            belt_x = gun_start_x + math.cos(angle + math.pi/2) * 5
-            belt_y = gun_start_y + math.sin(angle + math.pi/2) * 5
+            belt_x = gun_start_x + math.cos(angle + HALF_PI) * 5
+            belt_y = gun_start_y + math.sin(angle + HALF_PI) * 5
             pygame.draw.line(screen, (70, 60, 50), (int(drum_x), int(drum_y)), (int(belt_x), int(belt_y)), 3)
         # Muzzle flash when firing
         if self.is_firing:
@@ -4399,10 +4765,10 @@ class Player:
         limb_x = gun_start_x + math.cos(angle) * 8
         limb_y = gun_start_y + math.sin(angle) * 8
         limb_flex = 0.15 if self.reloading else 0
-        limb_l_x = limb_x + math.cos(angle - math.pi/2 - 0.4 + limb_flex) * 15
-        limb_l_y = limb_y + math.sin(angle - math.pi/2 - 0.4 + limb_flex) * 15
-        limb_r_x = limb_x + math.cos(angle + math.pi/2 + 0.4 - limb_flex) * 15
-        limb_r_y = limb_y + math.sin(angle + math.pi/2 + 0.4 - limb_flex) * 15
+        limb_l_x = limb_x + math.cos(angle - HALF_PI - 0.4 + limb_flex) * 15
+        limb_l_y = limb_y + math.sin(angle - HALF_PI - 0.4 + limb_flex) * 15
+        limb_r_x = limb_x + math.cos(angle + HALF_PI + 0.4 - limb_flex) * 15
+        limb_r_y = limb_y + math.sin(angle + HALF_PI + 0.4 - limb_flex) * 15
         pygame.draw.line(screen, (100, 70, 35), (limb_x, limb_y), (limb_l_x, limb_l_y), 5)
         pygame.draw.line(screen, (100, 70, 35), (limb_x, limb_y), (limb_r_x, limb_r_y), 5)
         # String
@@ -4586,9 +4952,9 @@ class Player2(Player):
         else:
             # Manual aiming with numpad
             if keys[pygame.K_KP8]:  # Up
-                self.aim_direction = -math.pi/2
+                self.aim_direction = -HALF_PI
             elif keys[pygame.K_KP2]:  # Down
-                self.aim_direction = math.pi/2
+                self.aim_direction = HALF_PI
             elif keys[pygame.K_KP4]:  # Left
                 self.aim_direction = math.pi
             elif keys[pygame.K_KP6]:  # Right
@@ -4690,6 +5056,13 @@ class Player2(Player):
         screen.blit(Player2._p2_label, (sx - Player2._p2_label.get_width()//2, sy - self.radius - 35))
 
 
+# Object pools for short-lived entities - dead ones are released in Game.update
+BULLET_POOL = Pool(Bullet, 512)
+CASING_POOL = Pool(ShellCasing, 64)
+FLASH_POOL = Pool(MuzzleFlash, 32)
+EXPLOSION_POOL = Pool(Explosion, 16)
+
+
 class Game:
     def __init__(self):
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
@@ -4700,8 +5073,56 @@ class Game:
         self.small_font = pygame.font.Font(None, 32)
 
         # HUD text cache to avoid render() calls every frame
-        self._hud_cache = {}
-        self._hud_cache_keys = {}
+        # Value caches are LRU-bounded to HUD_CACHE_LIMIT entries
+        self._hud_value_cache = OrderedDict()  # (cache_key, values, color) -> surface
+        self._hud_placed_cache = OrderedDict()  # (cache_key, values, color) -> (surface, blit pos)
+        self._screen_cache = {}  # screen name -> (state key, rendered surface)
+        self._shown_key = None  # State key of the static screen currently on display
+        self._bar_bg_cache = {}  # (width, height, border color) -> health bar background
+        self._text_cache = {}  # (text, id(font), color) -> (surface, screen-centered x) for fixed menu/shop strings
+        self._build_menu_backgrounds()
+        self._init_static_hud()
+
+        # Translucent full-screen overlay for the game over screen, built once
+        self._gameover_overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)).convert()
+        self._gameover_overlay.fill(BLACK)
+        self._gameover_overlay.set_alpha(180)
+        # Darker overlay shared by the shop and avatar shop
+        self._dim_overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)).convert()
+        self._dim_overlay.fill(BLACK)
+        self._dim_overlay.set_alpha(200)
+        # Avatar shop carousel previews and the "owned" marker
+        self._mini_avatar_cache = {}
+        self._owned_dot = pygame.Surface((10, 10), pygame.SRCALPHA).convert_alpha()
+        pygame.draw.circle(self._owned_dot, GREEN, (5, 5), 5)
+        # Per-player views for local split-screen, reused every frame
+        self._split_size = None
+        self._split_surfs = None
+        # 4px divider between the views (same pixels as a width-4 line at half_width)
+        self._split_divider = pygame.Surface((4, SCREEN_HEIGHT)).convert()
+        self._split_divider.fill(WHITE)
+
+        # Main menu text that never changes (the menu surface is rebuilt on every selection change)
+        self._version_surf = self.small_font.render("v3.0", True, (100, 100, 100))
+        self._controls_hint_surf = self.small_font.render("P1: WASD+Mouse | P2: IJKL+NumPad", True, GRAY)
+        self._section_surfs = {
+            text: self.small_font.render(text, True, color)
+            for text, color in (("SOLO", LIGHT_BLUE), ("ONLINE", (0, 200, 255)),
+                                ("LOCAL 2P", ORANGE), ("MAP", (100, 180, 255)))
+        }
+
+        # Online mode button labels, selected (mode color) and unselected (gray)
+        self._online_mode_surfs = {}
+        for mode, label, _, selected_color in ONLINE_MODE_BUTTONS:
+            self._online_mode_surfs[(mode, True)] = self.small_font.render(label, True, selected_color)
+            self._online_mode_surfs[(mode, False)] = self.small_font.render(label, True, GRAY)
+
+        # Pre-tiled floor + grid surfaces keyed by view size
+        self._floor_tiles = {}
+
+        # Minimap camera box, recomputed only when the camera moves
+        self._mm_last_cam = None
+        self._mm_cam_rect = None
 
         self.state = "login"  # login, menu, playing, gameover, shop, avatar_shop, online_menu, waiting
         self.difficulty = "medium"
@@ -4744,18 +5165,42 @@ class Game:
         self.login_mode = "login"  # "login" or "register"
         self.login_message = ""
         self.active_input = "username"  # "username" or "passcode"
+        # Rendered login field text, refreshed when the input changes
+        self._username_surf = None
+        self._username_text_cached = None
+        self._passcode_surf = None
+        self._passcode_len_cached = -1
+        self._login_msg_surf = None
+        self._login_msg_cached = None
+        # draw() looks up the renderer for the current state instead of an if/elif chain
+        self._draw_dispatch = {
+            "login": self.draw_login_screen,
+            "menu": self.draw_menu,
+            "online_menu": self.draw_online_menu,
+            "waiting": self.draw_waiting_screen,
+            "loading": self._draw_loading,
+            "playing": self._draw_gameplay,
+            "gameover": self._draw_gameplay,
+            "shop": self._draw_gameplay,
+            "avatar_shop": self._draw_gameplay,
+        }
+        # Screens drawn over the gameplay view
+        self._overlay_dispatch = {
+            "gameover": self.draw_gameover,
+            "shop": self.draw_shop,
+            "avatar_shop": self.draw_avatar_shop,
+        }
+        # Text input (mobile keyboard) is on only while the login screen is shown
+        self._text_input_active = False
+        self._enter_login_screen()
         # Cloud login state
         self.cloud_login_pending = False
         self.cloud_login_promise = None
         self.cloud_login_username = ""
         self.cloud_login_passcode = ""
 
-        # Login screen touch button rects (initialized in draw_login_screen)
-        self.login_submit_btn = None
-        self.login_toggle_btn = None
-        self.login_guest_btn = None
-        self.username_field_rect = None
-        self.passcode_field_rect = None
+        # Fixed-position touch button rects (login, online menu, HUD shop button)
+        self._init_button_rects()
 
         # Menu touch button rects (initialized in draw_menu)
         self.menu_buttons = {}  # Dictionary of button_name: pygame.Rect
@@ -4773,8 +5218,8 @@ class Game:
         self.reload_btn = TouchButton(SCREEN_WIDTH - 100, SCREEN_HEIGHT - 220, 30, "R", (60, 150, 200))
         self.switch_btn = TouchButton(SCREEN_WIDTH - 250, SCREEN_HEIGHT - 140, 30, "Q", (150, 150, 60))
         self.medkit_btn = TouchButton(SCREEN_WIDTH - 180, SCREEN_HEIGHT - 60, 30, "H", (60, 200, 60))
-        self.touch_aim_angle = 0
         self.touch_shooting = False  # Track if touching screen (not on controls) for shooting
+        self._fake_keys = FakeKeys(0, 0)  # Reused joystick-to-keys adapter
 
         self.reset_game()
 
@@ -4799,6 +5244,18 @@ class Game:
             pass
         self.current_music = None
 
+    @property
+    def game_mode(self):
+        return self._game_mode
+
+    @game_mode.setter
+    def game_mode(self, mode):
+        # Derive the mode flags once here so hot code doesn't re-test strings every frame
+        self._game_mode = mode
+        self.is_coop = mode in ("coop", "online_coop")
+        self.is_pvp = mode in ("pvp", "online_pvp")
+        self.is_online = mode.startswith("online_")
+
     def reset_game(self):
         # Player 1 starts on left side, Player 2 on right side (for PvP/coop)
         if self.game_mode == "online_pvp":
@@ -4814,7 +5271,7 @@ class Game:
             # Local PvP - players on opposite sides
             self.player = Player(MAP_WIDTH // 4, MAP_HEIGHT // 2)
             self.player2 = Player2(3 * MAP_WIDTH // 4, MAP_HEIGHT // 2)
-        elif self.game_mode in ["coop", "online_coop"]:
+        elif self.is_coop:
             self.player = Player(MAP_WIDTH // 2 - 100, MAP_HEIGHT // 2)
             # In online_coop, player2 is controlled by remote player
             self.player2 = Player2(MAP_WIDTH // 2 + 100, MAP_HEIGHT // 2)
@@ -4847,7 +5304,7 @@ class Game:
 
         # Enable split-screen for local multiplayer modes (pvp and coop)
         # Each player gets their own view with their own camera
-        if self.game_mode in ["pvp", "coop"]:
+        if self.game_mode in ("pvp", "coop"):
             self.split_screen = True
             half_width = SCREEN_WIDTH // 2
             self.camera = Camera(half_width, SCREEN_HEIGHT)
@@ -4863,8 +5320,10 @@ class Game:
         self.grenades = []
         self.smoke_grenades = []  # Smoke grenades in flight
         self.smoke_clouds = []  # Active smoke clouds
+        self._smoke_grid = None  # Spatial lookup for smoke_clouds, rebuilt when clouds appear/expire
         self.explosions = []
         self.obstacles = []
+        self._obstacle_grid = {}  # Spatial lookup for obstacles, rebuilt with the map
         self.shell_casings = []  # Shell casing particles
         self.muzzle_flashes = []  # Muzzle flash effects
         self.healing_effects = []  # Healing visual effects
@@ -4955,6 +5414,24 @@ class Game:
         else:
             self.create_random_map()
 
+        self._obstacle_grid = self._build_obstacle_grid()
+        self._build_minimap_background()
+
+    def _build_minimap_background(self):
+        """Render the static minimap layer (background, obstacles, border) once per map"""
+        map_size = MINIMAP_SIZE
+        scale = map_size / MAP_WIDTH
+        bg = pygame.Surface((map_size, map_size)).convert()
+        bg.fill(DARK_GRAY)
+        pygame.draw.rect(bg, WHITE, (0, 0, map_size, map_size), 2)
+        for obs in self.obstacles:
+            ox = int(obs.x * scale)
+            oy = int(obs.y * scale)
+            ow = max(2, int(obs.width * scale))
+            oh = max(2, int(obs.height * scale))
+            pygame.draw.rect(bg, BROWN, (ox, oy, ow, oh))
+        self._minimap_bg = bg
+
     def create_random_map(self):
         """Original random obstacle placement"""
         num_obstacles = 60
@@ -4980,7 +5457,7 @@ class Game:
         ring_radius = 400
         num_pillars = 8
         for i in range(num_pillars):
-            angle = (2 * math.pi * i) / num_pillars
+            angle = (TWO_PI * i) / num_pillars
             px = center_x + math.cos(angle) * ring_radius - 40
             py = center_y + math.sin(angle) * ring_radius - 40
             self.obstacles.append(Obstacle(int(px), int(py), 80, 80))
@@ -4988,7 +5465,7 @@ class Game:
         # Outer ring
         outer_radius = 700
         for i in range(12):
-            angle = (2 * math.pi * i) / 12 + 0.26  # Offset
+            angle = (TWO_PI * i) / 12 + 0.26  # Offset
             px = center_x + math.cos(angle) * outer_radius - 50
             py = center_y + math.sin(angle) * outer_radius - 50
             self.obstacles.append(Obstacle(int(px), int(py), 100, 100))
@@ -5112,7 +5589,6 @@ class Game:
     def start_cloud_login(self, username, passcode):
         """Start asynchronous cloud login check"""
         try:
-            from platform import window
             if not hasattr(window, 'FirebaseDB'):
                 self.login_message = "Cloud not available"
                 return
@@ -5134,8 +5610,6 @@ class Game:
             return
 
         try:
-            from platform import window
-
             # Check if promise has resolved by looking at its state
             # JavaScript promises have a [[PromiseState]] we can check
             promise = self.cloud_login_promise
@@ -5180,8 +5654,7 @@ class Game:
                     cloud_data = result.get("data", {})
                     login_from_cloud_data(self.cloud_login_username, self.cloud_login_passcode, cloud_data)
                     self.login_message = "Cloud login success!"
-                    pygame.key.stop_text_input()
-                    self.state = "menu"
+                    self._leave_login_screen()
                 else:
                     error_msg = result.get("error", "Unknown error") if result else "Login failed"
                     self.login_message = f"Not found: {error_msg}"
@@ -5262,9 +5735,9 @@ class Game:
                 angle_to_robot = math.atan2(dy, dx)
                 angle_diff = abs(angle - angle_to_robot)
                 if angle_diff > math.pi:
-                    angle_diff = 2 * math.pi - angle_diff
+                    angle_diff = TWO_PI - angle_diff
 
-                if angle_diff < math.pi / 2:  # 90 degree cone in front
+                if angle_diff < HALF_PI:  # 90 degree cone in front
                     if robot.take_damage(damage):
                         self.robots.remove(robot)
                         self.kills += 1
@@ -5305,8 +5778,8 @@ class Game:
                 # Mark bullet as from player 2 for PvP
                 result.owner = "player2"
                 self.bullets.append(result)
-                self.shell_casings.append(ShellCasing(self.player2.x, self.player2.y, self.player2.angle))
-                self.muzzle_flashes.append(MuzzleFlash(self.player2.x, self.player2.y, self.player2.angle))
+                self.shell_casings.append(CASING_POOL.acquire(self.player2.x, self.player2.y, self.player2.angle))
+                self.muzzle_flashes.append(FLASH_POOL.acquire(self.player2.x, self.player2.y, self.player2.angle))
 
     def handle_melee_attack_p2(self, attack):
         """Handle Player 2 knife melee attack"""
@@ -5316,7 +5789,7 @@ class Game:
         damage = attack["damage"]
 
         # In PvP mode, can hit player 1
-        if self.game_mode in ["pvp", "online_pvp"] and self.player.health > 0:
+        if self.is_pvp and self.player.health > 0:
             dx = self.player.x - px
             dy = self.player.y - py
             dist = math.sqrt(dx*dx + dy*dy)
@@ -5324,8 +5797,8 @@ class Game:
                 angle_to_target = math.atan2(dy, dx)
                 angle_diff = abs(angle - angle_to_target)
                 if angle_diff > math.pi:
-                    angle_diff = 2 * math.pi - angle_diff
-                if angle_diff < math.pi / 2:
+                    angle_diff = TWO_PI - angle_diff
+                if angle_diff < HALF_PI:
                     if self.player.take_damage(damage):
                         self.pvp_winner = "Player 2"
                         self.state = "gameover"
@@ -5341,14 +5814,27 @@ class Game:
                 angle_to_robot = math.atan2(dy, dx)
                 angle_diff = abs(angle - angle_to_robot)
                 if angle_diff > math.pi:
-                    angle_diff = 2 * math.pi - angle_diff
-                if angle_diff < math.pi / 2:
+                    angle_diff = TWO_PI - angle_diff
+                if angle_diff < HALF_PI:
                     if robot.take_damage(damage):
                         self.robots.remove(robot)
                         self.kills += 1
                         if self.game_mode != "pvp":
                             self.score += DIFFICULTY[self.difficulty]["points"]
 
+    def _enter_login_screen(self):
+        """Switch to the login screen and enable text input for the mobile keyboard"""
+        self.state = "login"
+        if not self._text_input_active:
+            pygame.key.start_text_input()
+            self._text_input_active = True
+
+    def _leave_login_screen(self):
+        """Leave the login screen for the main menu and stop text input"""
+        pygame.key.stop_text_input()
+        self._text_input_active = False
+        self.state = "menu"
+
     def handle_touch_events(self, event):
         """Handle touch/mouse events for mobile controls"""
         # Handle login screen touch events (always, not just mobile_controls)
@@ -5361,13 +5847,13 @@ class Game:
                     x, y = event.pos
 
                 # Check if tapping on username field
-                if self.username_field_rect and self.username_field_rect.collidepoint(x, y):
+                if self.username_field_rect.collidepoint(x, y):
                     self.active_input = "username"
                     pygame.key.start_text_input()  # Show mobile keyboard
                     return
 
                 # Check if tapping on passcode field
-                if self.passcode_field_rect and self.passcode_field_rect.collidepoint(x, y):
+                if self.passcode_field_rect.collidepoint(x, y):
                     self.active_input = "passcode"
                     pygame.key.start_text_input()  # Show mobile keyboard
                     return
@@ -5379,14 +5865,12 @@ class Game:
                         self.login_message = msg
                         if success:
                             login_user(self.username_input, self.passcode_input)
-                            pygame.key.stop_text_input()
-                            self.state = "menu"
+                            self._leave_login_screen()
                     else:
                         success, msg = login_user(self.username_input, self.passcode_input)
                         if success:
                             self.login_message = msg
-                            pygame.key.stop_text_input()
-                            self.state = "menu"
+                            self._leave_login_screen()
                         elif msg == "Checking cloud...":
                             # Try cloud login
                             self.login_message = "Checking cloud account..."
@@ -5403,8 +5887,7 @@ class Game:
 
                 # Check guest button
                 if self.login_guest_btn and self.login_guest_btn.collidepoint(x, y):
-                    pygame.key.stop_text_input()
-                    self.state = "menu"
+                    self._leave_login_screen()
                     return
             return
 
@@ -5491,7 +5974,7 @@ class Game:
                             if current_user:
                                 logout_user()
                             else:
-                                self.state = "login"
+                                self._enter_login_screen()
                                 self.username_input = ""
                                 self.passcode_input = ""
                                 self.login_message = ""
@@ -5570,6 +6053,10 @@ class Game:
             if event.type == pygame.QUIT:
                 return False
 
+            # Window contents may have been lost - force the next frame to repaint fully
+            if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                self._shown_key = None
+
             # Handle touch events for mobile
             if event.type in (pygame.FINGERDOWN, pygame.FINGERMOTION, pygame.FINGERUP,
                               pygame.MOUSEBUTTONDOWN, pygame.MOUSEMOTION, pygame.MOUSEBUTTONUP):
@@ -5592,21 +6079,18 @@ class Game:
                             if success:
                                 # Auto-login after register
                                 login_user(self.username_input, self.passcode_input)
-                                pygame.key.stop_text_input()
-                                self.state = "menu"
+                                self._leave_login_screen()
                         else:
                             success, msg = login_user(self.username_input, self.passcode_input)
                             if success:
                                 self.login_message = msg
-                                pygame.key.stop_text_input()
-                                self.state = "menu"
+                                self._leave_login_screen()
                             else:
                                 # Show error, don't try cloud (causes freeze)
                                 self.login_message = msg if msg != "Checking cloud..." else "User not found"
                     elif event.key == pygame.K_ESCAPE:
                         # Play as guest (skip login)
-                        pygame.key.stop_text_input()
-                        self.state = "menu"
+                        self._leave_login_screen()
                     elif event.key == pygame.K_BACKSPACE:
                         # Delete character
                         if self.active_input == "username":
@@ -5676,7 +6160,7 @@ class Game:
                         if current_user:
                             logout_user()
                         else:
-                            self.state = "login"
+                            self._enter_login_screen()
                             self.username_input = ""
                             self.passcode_input = ""
                             self.login_message = ""
@@ -5870,12 +6354,12 @@ class Game:
                         # Select 2v1 mode
                         self.online_game_mode = "2v1"
                         self.online_message = "2v1 mode selected"
-                    elif event.key == pygame.K_LEFT and self.online_game_mode in ["coop", "2v2", "2v1"]:
+                    elif event.key == pygame.K_LEFT and self.online_game_mode in ("coop", "2v2", "2v1"):
                         # Previous difficulty
                         self.online_difficulty_index = (self.online_difficulty_index - 1) % len(self.online_difficulty_options)
                         self.online_difficulty = self.online_difficulty_options[self.online_difficulty_index]
                         self.online_message = f"Difficulty: {self.online_difficulty.upper()}"
-                    elif event.key == pygame.K_RIGHT and self.online_game_mode in ["coop", "2v2", "2v1"]:
+                    elif event.key == pygame.K_RIGHT and self.online_game_mode in ("coop", "2v2", "2v1"):
                         # Next difficulty
                         self.online_difficulty_index = (self.online_difficulty_index + 1) % len(self.online_difficulty_options)
                         self.online_difficulty = self.online_difficulty_options[self.online_difficulty_index]
@@ -5918,23 +6402,16 @@ class Game:
                 if event.button == 1 and self.state == "login":
                     # Handle clicks on login input fields
                     mouse_pos = pygame.mouse.get_pos()
-                    box_width = 450
-                    box_x = SCREEN_WIDTH // 2 - box_width // 2
-                    box_y = 200
-                    # Username field area
-                    username_rect = pygame.Rect(box_x + 25, box_y + 95, box_width - 50, 35)
-                    # Passcode field area
-                    passcode_rect = pygame.Rect(box_x + 25, box_y + 175, box_width - 50, 35)
-                    if username_rect.collidepoint(mouse_pos):
+                    if self.username_field_rect.collidepoint(mouse_pos):
                         self.active_input = "username"
                         pygame.key.start_text_input()
-                    elif passcode_rect.collidepoint(mouse_pos):
+                    elif self.passcode_field_rect.collidepoint(mouse_pos):
                         self.active_input = "passcode"
                         pygame.key.start_text_input()
                 elif event.button == 1 and self.state == "playing":
                     # Check if shop button clicked
                     mouse_pos = pygame.mouse.get_pos()
-                    if hasattr(self, 'shop_btn_rect') and self.shop_btn_rect.collidepoint(mouse_pos):
+                    if self.shop_btn_rect.collidepoint(mouse_pos):
                         self.state = "shop"
                     # Check weapon type
                     elif self.player.weapon.get("grenade", False):
@@ -5962,20 +6439,20 @@ class Game:
                     # Handle touch/click on online menu buttons
                     mouse_pos = pygame.mouse.get_pos()
                     # Mode selection buttons
-                    if hasattr(self, 'online_coop_btn') and self.online_coop_btn.collidepoint(mouse_pos):
+                    if self.online_coop_btn.collidepoint(mouse_pos):
                         self.online_game_mode = "coop"
                         self.online_message = "CO-OP mode selected"
-                    elif hasattr(self, 'online_pvp_btn') and self.online_pvp_btn.collidepoint(mouse_pos):
+                    elif self.online_pvp_btn.collidepoint(mouse_pos):
                         self.online_game_mode = "pvp"
                         self.online_message = "1v1 PVP mode selected"
-                    elif hasattr(self, 'online_2v2_btn') and self.online_2v2_btn.collidepoint(mouse_pos):
+                    elif self.online_2v2_btn.collidepoint(mouse_pos):
                         self.online_game_mode = "2v2"
                         self.online_message = "2v2 TEAM mode selected"
-                    elif hasattr(self, 'online_2v1_btn') and self.online_2v1_btn.collidepoint(mouse_pos):
+                    elif self.online_2v1_btn.collidepoint(mouse_pos):
                         self.online_game_mode = "2v1"
                         self.online_message = "2v1 mode selected"
                     # Difficulty buttons
-                    elif hasattr(self, 'online_diff_left_btn') and self.online_diff_left_btn.collidepoint(mouse_pos):
+                    elif self.online_diff_left_btn.collidepoint(mouse_pos):
                         self.online_difficulty_index = (self.online_difficulty_index - 1) % len(self.online_difficulty_options)
                         self.online_difficulty = self.online_difficulty_options[self.online_difficulty_index]
                         self.online_message = f"Difficulty: {self.online_difficulty.upper()}"
@@ -6031,14 +6508,14 @@ class Game:
         # Add muzzle flash (not for RPG - it has backblast)
         if weapon_name != "RPG":
             flash_size = {"Rifle": 1.0, "Handgun": 0.7, "Shotgun": 1.5, "Sniper": 1.2}.get(weapon_name, 1.0)
-            self.muzzle_flashes.append(MuzzleFlash(muzzle_x, muzzle_y, self.player.angle, flash_size))
+            self.muzzle_flashes.append(FLASH_POOL.acquire(muzzle_x, muzzle_y, self.player.angle, flash_size))
 
         # Add shell casing (not for RPG or Shotgun pump)
         if weapon_name in ["Rifle", "Handgun", "Sniper"]:
             # Shell ejects from ejection port (side of gun)
             eject_x = self.player.x + math.cos(self.player.angle) * (self.player.radius + 8)
             eject_y = self.player.y + math.sin(self.player.angle) * (self.player.radius + 8)
-            self.shell_casings.append(ShellCasing(eject_x, eject_y, self.player.angle))
+            self.shell_casings.append(CASING_POOL.acquire(eject_x, eject_y, self.player.angle))
 
         # Apply recoil based on weapon
         recoil_amounts = {"Rifle": 3, "Handgun": 2, "Shotgun": 8, "Sniper": 6, "RPG": 10}
@@ -6047,10 +6524,7 @@ class Game:
 
     def update_online_connection(self):
         """Handle online multiplayer connection state"""
-        try:
-            import platform
-            window = platform.window
-        except:
+        if window is None:
             self.online_message = "Online only available in web version"
             return
 
@@ -6118,8 +6592,6 @@ class Game:
     def disconnect_online(self):
         """Disconnect from online multiplayer"""
         try:
-            import platform
-            window = platform.window
             if hasattr(window, 'MP'):
                 window.MP.disconnect()
         except:
@@ -6131,9 +6603,7 @@ class Game:
     def send_game_state(self):
         """Send local player state to remote player"""
         try:
-            import platform
             import json
-            window = platform.window
 
             if not hasattr(window, 'MP'):
                 return
@@ -6165,9 +6635,7 @@ class Game:
     def receive_game_state(self):
         """Receive remote player state and update"""
         try:
-            import platform
             import json
-            window = platform.window
 
             if not hasattr(window, 'MP'):
                 return
@@ -6239,153 +6707,193 @@ class Game:
             self._do_start_game_full()
             # Don't return - let game update continue immediately
 
-        # TEST: Skip cloud login check (may be causing freeze)
-        # if self.cloud_login_pending:
-        #     self.check_cloud_login()
+        # Cloud login check - off by default (suspected cause of a browser freeze)
+        if CLOUD_LOGIN_CHECK_ENABLED and self.cloud_login_pending:
+            self.check_cloud_login()
 
-        # TEST: Skip online multiplayer (may be causing freeze)
-        # if self.state == "waiting":
-        #     self.update_online_connection()
-        #     return
-
-        # if self.game_mode in ["online_coop", "online_pvp", "online_2v2", "online_2v1"]:
-        #     self.send_game_state()
-        #     self.receive_game_state()
+        # Online multiplayer sync - off by default (suspected cause of a browser freeze)
+        if ONLINE_SYNC_ENABLED:
+            if self.state == "waiting":
+                self.update_online_connection()
+                return
+            if self.is_online:
+                self.send_game_state()
+                self.receive_game_state()
 
         if self.state != "playing":
             return
 
-        keys = pygame.key.get_pressed()
-        mouse_pos = pygame.mouse.get_pos()
+        # Hoist hot lookups into locals for the per-entity loops below
+        sqrt = math.sqrt
+        diff = DIFFICULTY[self.difficulty]
+        kill_points = diff["points"]
+        kill_coins = diff["coins"]
+        robot_damage = diff["damage"]
+        player = self.player
+        player2 = self.player2
+        obstacles = self.obstacles
+        obstacle_grid = self._obstacle_grid
+
+        # Game mode flags (kept in sync by the game_mode setter)
+        game_mode = self.game_mode
+        coop_mode = self.is_coop
+        pvp_mode = self.is_pvp
 
         # Handle mobile joystick movement
         if self.mobile_controls and self.joystick.active:
-            # Use module-level FakeKeys class (faster than defining class inside function)
-            keys = FakeKeys(self.joystick.dx, self.joystick.dy)
+            # Reuse one FakeKeys instance instead of allocating one every frame
+            keys = self._fake_keys
+            keys.dx = self.joystick.dx
+            keys.dy = self.joystick.dy
+        else:
+            keys = pygame.key.get_pressed()
 
         # Handle mobile aim joystick
+        mouse_pos = None
         if self.mobile_controls and self.aim_joystick.active:
-            # Calculate aim angle from joystick
-            if abs(self.aim_joystick.dx) > 0.1 or abs(self.aim_joystick.dy) > 0.1:
-                self.touch_aim_angle = math.atan2(self.aim_joystick.dy, self.aim_joystick.dx)
-                # Convert angle to screen position for player aim
-                aim_x = self.player.x - self.camera.x + math.cos(self.touch_aim_angle) * 100
-                aim_y = self.player.y - self.camera.y + math.sin(self.touch_aim_angle) * 100
+            # Aim 100px along the joystick direction (normalize, no atan2/cos/sin needed)
+            aim_dx = self.aim_joystick.dx
+            aim_dy = self.aim_joystick.dy
+            if abs(aim_dx) > 0.1 or abs(aim_dy) > 0.1:
+                scale = 100 / sqrt(aim_dx * aim_dx + aim_dy * aim_dy)
+                aim_x = player.x - self.camera.x + aim_dx * scale
+                aim_y = player.y - self.camera.y + aim_dy * scale
                 mouse_pos = (aim_x, aim_y)
+        if mouse_pos is None:
+            # Only query the mouse when the aim joystick isn't driving the aim
+            mouse_pos = pygame.mouse.get_pos()
 
         # Handle mobile shooting (FIRE button or touch screen outside controls)
         # Note: main shooting logic is in handle_events, this handles melee and effects
         if self.mobile_controls and (self.shoot_btn.pressed or self.touch_shooting):
-            if self.player.weapon.get("melee", False):
-                result = self.player.shoot()
+            if player.weapon.get("melee", False):
+                result = player.shoot()
                 if result and isinstance(result, dict) and result.get("melee"):
                     self.handle_melee_attack(result)
 
         # Update player
-        self.player.update(keys, mouse_pos, self.camera, self.obstacles)
-        self.player.update_recoil()  # Update recoil recovery
-        self.player.update_reload()  # Update reload animation
-        self.player.update_switch_cooldown()  # Update weapon switch cooldown
+        player.update(keys, mouse_pos, self.camera, obstacles)
+        player.update_recoil()  # Update recoil recovery
+        player.update_reload()  # Update reload animation
+        player.update_switch_cooldown()  # Update weapon switch cooldown
 
         # Update Player 2 (in multiplayer modes)
         # In online modes, player2 is controlled by network data, not local input
-        if self.player2 and self.player2.health > 0 and self.game_mode not in ["online_coop", "online_pvp"]:
+        if player2 and player2.health > 0 and game_mode not in ("online_coop", "online_pvp"):
             # In co-op, Player 2 aims at nearest robot; in PvP, aim at Player 1
             target_pos = None
-            if self.game_mode == "coop" and self.robots:
+            if game_mode == "coop" and self.robots:
                 # Find nearest robot
                 nearest_dist = float('inf')
                 for robot in self.robots:
-                    dist = math.sqrt((robot.x - self.player2.x)**2 + (robot.y - self.player2.y)**2)
+                    dist = sqrt((robot.x - player2.x)**2 + (robot.y - player2.y)**2)
                     if dist < nearest_dist:
                         nearest_dist = dist
                         target_pos = (robot.x, robot.y)
             # In PvP, numpad controls aim (no auto-aim at player 1)
 
-            self.player2.update(keys, target_pos, self.camera, self.obstacles)
-            self.player2.update_recoil()
-            self.player2.update_reload()
-            self.player2.update_switch_cooldown()
+            player2.update(keys, target_pos, self.camera, obstacles)
+            player2.update_recoil()
+            player2.update_reload()
+            player2.update_switch_cooldown()
 
         # Update camera(s)
         if self.split_screen:
             # Split-screen: each camera follows its player
-            self.camera.update(self.player.x, self.player.y)
-            if self.player2:
-                self.camera2.update(self.player2.x, self.player2.y)
-        elif self.game_mode == "online_pvp":
+            self.camera.update(player.x, player.y)
+            if player2:
+                self.camera2.update(player2.x, player2.y)
+        elif game_mode == "online_pvp":
             # Online PvP: camera follows only your own player (no split-screen needed)
-            self.camera.update(self.player.x, self.player.y)
-        elif self.game_mode == "online_coop" and self.player2 and self.player2.health > 0 and self.player.health > 0:
+            self.camera.update(player.x, player.y)
+        elif game_mode == "online_coop" and player2 and player2.health > 0 and player.health > 0:
             # Online co-op: focus on midpoint between players
-            mid_x = (self.player.x + self.player2.x) // 2
-            mid_y = (self.player.y + self.player2.y) // 2
+            mid_x = (player.x + player2.x) // 2
+            mid_y = (player.y + player2.y) // 2
             self.camera.update(mid_x, mid_y)
-        elif self.game_mode == "coop" and self.player2 and self.player2.health > 0 and self.player.health > 0:
+        elif game_mode == "coop" and player2 and player2.health > 0 and player.health > 0:
             # Local co-op: focus on midpoint between players
-            mid_x = (self.player.x + self.player2.x) // 2
-            mid_y = (self.player.y + self.player2.y) // 2
+            mid_x = (player.x + player2.x) // 2
+            mid_y = (player.y + player2.y) // 2
             self.camera.update(mid_x, mid_y)
         else:
-            self.camera.update(self.player.x, self.player.y)
+            self.camera.update(player.x, player.y)
 
-        # Update shell casings
-        for casing in self.shell_casings[:]:
-            if not casing.update():
-                self.shell_casings.remove(casing)
+        # Update shell casings (rebuild from survivors, dead ones go back to the pool)
+        live_casings = []
+        for casing in self.shell_casings:
+            if casing.update():
+                live_casings.append(casing)
+            else:
+                CASING_POOL.release(casing)
+        self.shell_casings = live_casings
 
         # Update muzzle flashes
-        for flash in self.muzzle_flashes[:]:
-            if not flash.update():
-                self.muzzle_flashes.remove(flash)
+        live_flashes = []
+        for flash in self.muzzle_flashes:
+            if flash.update():
+                live_flashes.append(flash)
+            else:
+                FLASH_POOL.release(flash)
+        self.muzzle_flashes = live_flashes
 
         # Update healing effects
-        for effect in self.healing_effects[:]:
-            if not effect.update(self.player.x, self.player.y):
-                self.healing_effects.remove(effect)
+        self.healing_effects = [effect for effect in self.healing_effects
+                                if effect.update(player.x, player.y)]
 
         # DISABLED: Pickups temporarily disabled for testing freeze
         # Update pickups code removed
 
         # Update bullets (with collision detection)
-        for bullet in self.bullets[:]:
+        robot_grid = None  # Built lazily on the first Electric hit this frame
+        live_bullets = []
+        dead_robots = set()  # Removed in one pass after the bullet loop
+        for bullet in self.bullets:
             bullet.update()
 
             if bullet.lifetime <= 0:
-                self.bullets.remove(bullet)
+                BULLET_POOL.release(bullet)
                 continue
 
-            # Check obstacle collision
-            for obs in self.obstacles:
+            # Check obstacle collision (only obstacles sharing the bullet's grid cell)
+            hit_wall = False
+            for obs in obstacle_grid.get((int(bullet.x // OBSTACLE_GRID_CELL), int(bullet.y // OBSTACLE_GRID_CELL)), ()):
                 if obs.collides_point(bullet.x, bullet.y):
-                    if bullet in self.bullets:
-                        self.bullets.remove(bullet)
+                    hit_wall = True
                     break
 
-            if bullet not in self.bullets:
+            if hit_wall:
+                BULLET_POOL.release(bullet)
                 continue
 
+            bullet_x = bullet.x
+            bullet_y = bullet.y
+
             # Player bullets hit robots (and other player in PvP)
             if bullet.is_player:
                 hit_something = False
-                bullet_owner = getattr(bullet, 'owner', 'player1')
+                bullet_owner = bullet.owner
 
                 # In PvP mode, check if bullet hits the OTHER player
-                if self.game_mode in ["pvp", "online_pvp"]:
-                    if bullet_owner == "player2" and self.player.health > 0:
+                if pvp_mode:
+                    if bullet_owner == "player2" and player.health > 0:
                         # Player 2's bullet can hit Player 1
-                        dist = math.sqrt((bullet.x - self.player.x)**2 + (bullet.y - self.player.y)**2)
-                        if dist < self.player.radius + bullet.radius:
-                            if self.player.take_damage(bullet.get_damage()):
+                        dx = bullet_x - player.x
+                        dy = bullet_y - player.y
+                        d2 = dx * dx + dy * dy
+                        if d2 < PLAYER_HIT_R2:
+                            if player.take_damage(bullet.get_damage()):
                                 self.pvp_winner = "Player 2"
                                 self.state = "gameover"
                                 self.stop_music()
                             hit_something = True
-                    elif bullet_owner != "player2" and self.player2 and self.player2.health > 0:
+                    elif bullet_owner != "player2" and player2 and player2.health > 0:
                         # Player 1's bullet can hit Player 2
-                        dist = math.sqrt((bullet.x - self.player2.x)**2 + (bullet.y - self.player2.y)**2)
-                        if dist < self.player2.radius + bullet.radius:
-                            if self.player2.take_damage(bullet.get_damage()):
+                        dx = bullet_x - player2.x
+                        dy = bullet_y - player2.y
+                        d2 = dx * dx + dy * dy
+                        if d2 < PLAYER_HIT_R2:
+                            if player2.take_damage(bullet.get_damage()):
                                 self.pvp_winner = "Player 1"
                                 self.state = "gameover"
                                 self.stop_music()
@@ -6393,15 +6901,19 @@ class Game:
 
                 # Check robots (co-op and solo modes)
                 if not hit_something:
-                    for robot in self.robots[:]:
+                    for robot in self.robots:
+                        if robot in dead_robots:
+                            continue
                         # Check for sniper headshot first
                         is_headshot = False
                         if bullet.weapon_type == "Sniper" and robot.check_headshot(bullet.x, bullet.y):
                             is_headshot = True
 
                         # Check body hit
-                        dist = math.sqrt((bullet.x - robot.x)**2 + (bullet.y - robot.y)**2)
-                        body_hit = dist < robot.radius + bullet.radius
+                        dx = bullet_x - robot.x
+                        dy = bullet_y - robot.y
+                        d2 = dx * dx + dy * dy
+                        body_hit = d2 < ROBOT_HIT_R2
 
                         if is_headshot or body_hit:
                             # Sniper: 150 damage for headshot, 50 for body
@@ -6414,26 +6926,35 @@ class Game:
                             if bullet.weapon_type == "Freeze":
                                 robot.freeze_timer = 120  # Slow for 2 seconds
                             elif bullet.weapon_type == "Electric":
-                                # Chain lightning - damage nearby robots too
-                                for other_robot in self.robots:
-                                    if other_robot != robot:
-                                        other_dist = math.sqrt((robot.x - other_robot.x)**2 + (robot.y - other_robot.y)**2)
-                                        if other_dist < 150:  # Chain range
-                                            other_robot.take_damage(damage // 2)
-                                            other_robot.hit_flash = 10
+                                # Chain lightning - damage nearby robots too (only scan neighbouring grid cells)
+                                if robot_grid is None:
+                                    robot_grid = self._build_robot_grid()
+                                cell_x = int(robot.x // ROBOT_GRID_CELL)
+                                cell_y = int(robot.y // ROBOT_GRID_CELL)
+                                for gx in (cell_x - 1, cell_x, cell_x + 1):
+                                    for gy in (cell_y - 1, cell_y, cell_y + 1):
+                                        for other_robot in robot_grid.get((gx, gy), ()):
+                                            # Skip the hit robot and robots already killed this frame
+                                            if other_robot is robot or other_robot.health <= 0:
+                                                continue
+                                            dx = robot.x - other_robot.x
+                                            dy = robot.y - other_robot.y
+                                            if dx * dx + dy * dy < CHAIN_R2:  # Chain range
+                                                other_robot.take_damage(damage // 2)
+                                                other_robot.hit_flash = 10
 
                             if robot.take_damage(damage):
-                                self.robots.remove(robot)
+                                dead_robots.add(robot)
                                 self.kills += 1
-                                if self.game_mode != "pvp":
+                                if game_mode != "pvp":
                                     # Bonus score for headshot
                                     bonus = 2 if is_headshot else 1
-                                    self.score += DIFFICULTY[self.difficulty]["points"] * bonus
-                                    self.player.add_coin(DIFFICULTY[self.difficulty]["coins"])  # Add coins for kill
+                                    self.score += kill_points * bonus
+                                    player.add_coin(kill_coins)  # Add coins for kill
                                     # Check if player has 10 coins for shotgun or 50 for RPG
-                                    if self.player.coins >= 10 and not self.player.has_shotgun and not self.shop_prompted:
+                                    if player.coins >= 10 and not player.has_shotgun and not self.shop_prompted:
                                         self.state = "shop"
-                                    elif self.player.coins >= 50 and not self.player.has_rpg and self.player.has_shotgun and not self.shop_prompted:
+                                    elif player.coins >= 50 and not player.has_rpg and player.has_shotgun and not self.shop_prompted:
                                         self.state = "shop"
                             hit_something = True
                             break
@@ -6445,8 +6966,10 @@ class Game:
                     if bullet.weapon_type == "Sniper" and self.boss.check_headshot(bullet.x, bullet.y):
                         is_headshot = True
 
-                    dist = math.sqrt((bullet.x - self.boss.x)**2 + (bullet.y - self.boss.y)**2)
-                    body_hit = dist < self.boss.radius + bullet.radius
+                    dx = bullet_x - self.boss.x
+                    dy = bullet_y - self.boss.y
+                    d2 = dx * dx + dy * dy
+                    body_hit = d2 < BOSS_HIT_R2
 
                     if is_headshot or body_hit:
                         # Sniper: 150 damage for headshot, 50 for body
@@ -6460,20 +6983,23 @@ class Game:
                             self.boss = None
                             self.kills += 1
                             self.score += 5000  # Big bonus for boss
-                            self.player.add_coin(100)  # Big coin reward
+                            player.add_coin(100)  # Big coin reward
                         hit_something = True
 
-                if hit_something and bullet in self.bullets:
-                    self.bullets.remove(bullet)
+                if hit_something:
+                    BULLET_POOL.release(bullet)
+                    continue
 
             # Robot bullets hit players
             else:
                 hit_player = False
                 # Check Player 1
-                dist = math.sqrt((bullet.x - self.player.x)**2 + (bullet.y - self.player.y)**2)
-                if dist < self.player.radius + bullet.radius:
-                    if self.player.take_damage(bullet.damage):
-                        if (self.game_mode == "coop" or self.game_mode == "online_coop") and self.player2 and self.player2.health > 0:
+                dx = bullet_x - player.x
+                dy = bullet_y - player.y
+                d2 = dx * dx + dy * dy
+                if d2 < PLAYER_HIT_R2:
+                    if player.take_damage(bullet.damage):
+                        if coop_mode and player2 and player2.health > 0:
                             pass  # Player 2 still alive, continue
                         else:
                             self.state = "gameover"
@@ -6481,126 +7007,167 @@ class Game:
                     hit_player = True
 
                 # Check Player 2 (in co-op)
-                if not hit_player and (self.game_mode == "coop" or self.game_mode == "online_coop") and self.player2 and self.player2.health > 0:
-                    dist = math.sqrt((bullet.x - self.player2.x)**2 + (bullet.y - self.player2.y)**2)
-                    if dist < self.player2.radius + bullet.radius:
-                        if self.player2.take_damage(bullet.damage):
-                            if self.player.health > 0:
+                if not hit_player and coop_mode and player2 and player2.health > 0:
+                    dx = bullet_x - player2.x
+                    dy = bullet_y - player2.y
+                    d2 = dx * dx + dy * dy
+                    if d2 < PLAYER_HIT_R2:
+                        if player2.take_damage(bullet.damage):
+                            if player.health > 0:
                                 pass  # Player 1 still alive, continue
                             else:
                                 self.state = "gameover"
                                 self.stop_music()
                         hit_player = True
 
-                if hit_player and bullet in self.bullets:
-                    self.bullets.remove(bullet)
+                if hit_player:
+                    BULLET_POOL.release(bullet)
+                    continue
+
+            live_bullets.append(bullet)
+
+        self.bullets = live_bullets
+        if dead_robots:
+            self.robots = [robot for robot in self.robots if robot not in dead_robots]
 
         # Update grenades
-        for grenade in self.grenades[:]:
+        live_grenades = []
+        for grenade in self.grenades:
             grenade.update()
 
             if grenade.should_explode():
                 # Create explosion
-                explosion = Explosion(grenade.x, grenade.y, grenade.explosion_radius)
+                explosion = EXPLOSION_POOL.acquire(grenade.x, grenade.y, grenade.explosion_radius)
                 self.explosions.append(explosion)
 
-                # Damage robots in explosion radius
-                for robot in self.robots[:]:
-                    dist = math.sqrt((grenade.x - robot.x)**2 + (grenade.y - robot.y)**2)
-                    if dist < grenade.explosion_radius:
+                # Damage robots in explosion radius (squared-distance reject, sqrt only for hits)
+                blast_x, blast_y = grenade.x, grenade.y
+                blast_radius = grenade.explosion_radius
+                blast_r2 = blast_radius * blast_radius
+                blast_damage = grenade.damage
+                survivors = []
+                for robot in self.robots:
+                    dx = blast_x - robot.x
+                    dy = blast_y - robot.y
+                    d2 = dx * dx + dy * dy
+                    if d2 >= blast_r2:
+                        survivors.append(robot)
+                    else:
                         # Damage falls off with distance
-                        damage_mult = 1 - (dist / grenade.explosion_radius) * 0.5
-                        damage = int(grenade.damage * damage_mult)
-                        if robot.take_damage(damage):
-                            self.robots.remove(robot)
-                            self.kills += 1
-                            self.score += DIFFICULTY[self.difficulty]["points"]
-                            self.player.add_coin(DIFFICULTY[self.difficulty]["coins"])
-                            if self.player.coins >= 10 and not self.player.has_shotgun and not self.shop_prompted:
-                                self.state = "shop"
-                            elif self.player.coins >= 50 and not self.player.has_rpg and self.player.has_shotgun and not self.shop_prompted:
-                                self.state = "shop"
+                        damage_mult = 1 - (sqrt(d2) / blast_radius) * 0.5
+                        damage = int(blast_damage * damage_mult)
+                        if not robot.take_damage(damage):
+                            survivors.append(robot)
+                            continue
+                        self.kills += 1
+                        self.score += kill_points
+                        player.add_coin(kill_coins)
+                        if player.coins >= 10 and not player.has_shotgun and not self.shop_prompted:
+                            self.state = "shop"
+                        elif player.coins >= 50 and not player.has_rpg and player.has_shotgun and not self.shop_prompted:
+                            self.state = "shop"
+                self.robots = survivors
 
                 # Damage player 1 if in explosion radius
-                dist = math.sqrt((grenade.x - self.player.x)**2 + (grenade.y - self.player.y)**2)
+                dist = sqrt((grenade.x - player.x)**2 + (grenade.y - player.y)**2)
                 if dist < grenade.explosion_radius:
                     damage_mult = 1 - (dist / grenade.explosion_radius) * 0.5
                     damage = int(grenade.damage * damage_mult * 0.5)  # Player takes less self-damage
-                    if self.player.take_damage(damage):
+                    if player.take_damage(damage):
                         # In co-op, only game over if both players dead
-                        if (self.game_mode == "coop" or self.game_mode == "online_coop") and self.player2 and self.player2.health > 0:
+                        if coop_mode and player2 and player2.health > 0:
                             pass  # Player 2 still alive, continue
                         else:
                             self.state = "gameover"
                             self.stop_music()
 
                 # Damage player 2 if in explosion radius (co-op)
-                if (self.game_mode == "coop" or self.game_mode == "online_coop") and self.player2 and self.player2.health > 0:
-                    dist2 = math.sqrt((grenade.x - self.player2.x)**2 + (grenade.y - self.player2.y)**2)
+                if coop_mode and player2 and player2.health > 0:
+                    dist2 = sqrt((grenade.x - player2.x)**2 + (grenade.y - player2.y)**2)
                     if dist2 < grenade.explosion_radius:
                         damage_mult = 1 - (dist2 / grenade.explosion_radius) * 0.5
                         damage = int(grenade.damage * damage_mult * 0.5)
-                        if self.player2.take_damage(damage):
-                            if self.player.health > 0:
+                        if player2.take_damage(damage):
+                            if player.health > 0:
                                 pass  # Player 1 still alive, continue
                             else:
                                 self.state = "gameover"
                                 self.stop_music()
 
                 grenade.exploded = True
-                self.grenades.remove(grenade)
+            else:
+                live_grenades.append(grenade)
+        self.grenades = live_grenades
 
         # Update explosions
-        for explosion in self.explosions[:]:
+        live_explosions = []
+        for explosion in self.explosions:
             explosion.update()
             if explosion.is_done():
-                self.explosions.remove(explosion)
+                EXPLOSION_POOL.release(explosion)
+            else:
+                live_explosions.append(explosion)
+        self.explosions = live_explosions
 
         # Update smoke grenades
-        for smoke in self.smoke_grenades[:]:
+        live_smokes = []
+        for smoke in self.smoke_grenades:
             smoke.update()
             if smoke.should_pop():
                 # Create smoke cloud
                 cloud = SmokeCloud(smoke.x, smoke.y)
                 self.smoke_clouds.append(cloud)
+                self._smoke_grid = None
                 smoke.popped = True
-                self.smoke_grenades.remove(smoke)
+            else:
+                live_smokes.append(smoke)
+        self.smoke_grenades = live_smokes
 
         # Update smoke clouds
-        for cloud in self.smoke_clouds[:]:
+        live_clouds = []
+        for cloud in self.smoke_clouds:
             cloud.update()
-            if cloud.is_done():
-                self.smoke_clouds.remove(cloud)
+            if not cloud.is_done():
+                live_clouds.append(cloud)
+        if len(live_clouds) != len(self.smoke_clouds):
+            self._smoke_grid = None
+        self.smoke_clouds = live_clouds
 
         # Update robots
+        # Players don't move during this loop, so read their positions once
+        p1_x, p1_y = player.x, player.y
+        if player2:
+            p2_x, p2_y = player2.x, player2.y
         for robot in self.robots:
-            # In co-op, robots target the nearest player
-            target_x, target_y = self.player.x, self.player.y
-            if (self.game_mode == "coop" or self.game_mode == "online_coop") and self.player2 and self.player2.health > 0:
-                dist_to_p1 = math.sqrt((robot.x - self.player.x)**2 + (robot.y - self.player.y)**2)
-                dist_to_p2 = math.sqrt((robot.x - self.player2.x)**2 + (robot.y - self.player2.y)**2)
-                if self.player.health <= 0 or (self.player2.health > 0 and dist_to_p2 < dist_to_p1):
-                    target_x, target_y = self.player2.x, self.player2.y
-
-            robot.update(target_x, target_y, self.obstacles)
+            # In co-op, robots target the nearest player (compare squared distances)
+            target_x, target_y = p1_x, p1_y
+            if coop_mode and player2 and player2.health > 0:
+                dx1 = robot.x - p1_x
+                dy1 = robot.y - p1_y
+                dx2 = robot.x - p2_x
+                dy2 = robot.y - p2_y
+                if player.health <= 0 or dx2 * dx2 + dy2 * dy2 < dx1 * dx1 + dy1 * dy1:
+                    target_x, target_y = p2_x, p2_y
+
+            robot.update(target_x, target_y, obstacle_grid)
 
             # Robot uses knife when close, otherwise shoots
             # Check player 1
-            if robot.can_knife(self.player.x, self.player.y):
+            if robot.can_knife(p1_x, p1_y):
                 damage = robot.knife_attack()
-                if self.player.take_damage(damage):
+                if player.take_damage(damage):
                     # In co-op, only game over if both players dead
-                    if (self.game_mode == "coop" or self.game_mode == "online_coop") and self.player2 and self.player2.health > 0:
+                    if coop_mode and player2 and player2.health > 0:
                         pass  # Player 2 still alive, continue
                     else:
                         self.state = "gameover"
                         self.stop_music()
             # Check player 2 in co-op
-            elif (self.game_mode == "coop" or self.game_mode == "online_coop") and self.player2 and self.player2.health > 0:
-                if robot.can_knife(self.player2.x, self.player2.y):
+            elif coop_mode and player2 and player2.health > 0:
+                if robot.can_knife(p2_x, p2_y):
                     damage = robot.knife_attack()
-                    if self.player2.take_damage(damage):
-                        if self.player.health > 0:
+                    if player2.take_damage(damage):
+                        if player.health > 0:
                             pass  # Player 1 still alive, continue
                         else:
                             self.state = "gameover"
@@ -6608,35 +7175,44 @@ class Game:
             elif robot.can_shoot():
                 # Check if smoke is blocking line of sight - simplified for performance
                 can_see_target = True
-                for cloud in self.smoke_clouds:
+                if self.smoke_clouds:
+                    if self._smoke_grid is None:
+                        self._smoke_grid = self._build_smoke_grid()
                     # Just check if target or robot is in smoke (skip expensive line check)
-                    if cloud.point_in_smoke(target_x, target_y) or cloud.point_in_smoke(robot.x, robot.y):
-                        can_see_target = False
-                        break
+                    # Only clouds bucketed in the point's own cell can contain it
+                    target_cell = (int(target_x // SMOKE_GRID_CELL), int(target_y // SMOKE_GRID_CELL))
+                    for cloud in self._smoke_grid.get(target_cell, ()):
+                        if cloud.point_in_smoke(target_x, target_y):
+                            can_see_target = False
+                            break
+                    if can_see_target:
+                        robot_cell = (int(robot.x // SMOKE_GRID_CELL), int(robot.y // SMOKE_GRID_CELL))
+                        for cloud in self._smoke_grid.get(robot_cell, ()):
+                            if cloud.point_in_smoke(robot.x, robot.y):
+                                can_see_target = False
+                                break
 
                 if can_see_target:
                     # Shoot at nearest player
-                    result = robot.shoot(target_x, target_y)
-                    # Handle single bullet or list of bullets (dual pistol bots)
-                    if isinstance(result, list):
-                        for bullet in result:
-                            bullet.damage = DIFFICULTY[self.difficulty]["damage"]
-                        self.bullets.extend(result)
-                    else:
-                        result.damage = DIFFICULTY[self.difficulty]["damage"]
-                        self.bullets.append(result)
+                    # shoot() always returns a list (two bullets for dual pistol bots)
+                    shots = robot.shoot(target_x, target_y)
+                    for bullet in shots:
+                        bullet.damage = robot_damage
+                    self.bullets.extend(shots)
 
         # Update boss (impossible mode)
         if self.boss:
             # In co-op, boss targets nearest player
-            boss_target_x, boss_target_y = self.player.x, self.player.y
-            if (self.game_mode == "coop" or self.game_mode == "online_coop") and self.player2 and self.player2.health > 0:
-                dist_to_p1 = math.sqrt((self.boss.x - self.player.x)**2 + (self.boss.y - self.player.y)**2)
-                dist_to_p2 = math.sqrt((self.boss.x - self.player2.x)**2 + (self.boss.y - self.player2.y)**2)
-                if self.player.health <= 0 or (self.player2.health > 0 and dist_to_p2 < dist_to_p1):
-                    boss_target_x, boss_target_y = self.player2.x, self.player2.y
+            boss_target_x, boss_target_y = p1_x, p1_y
+            if coop_mode and player2 and player2.health > 0:
+                dx1 = self.boss.x - p1_x
+                dy1 = self.boss.y - p1_y
+                dx2 = self.boss.x - p2_x
+                dy2 = self.boss.y - p2_y
+                if player.health <= 0 or dx2 * dx2 + dy2 * dy2 < dx1 * dx1 + dy1 * dy1:
+                    boss_target_x, boss_target_y = p2_x, p2_y
 
-            self.boss.update(boss_target_x, boss_target_y, self.obstacles)
+            self.boss.update(boss_target_x, boss_target_y, obstacles)
 
             # Boss shoots multiple bullets at nearest player
             if self.boss.can_shoot():
@@ -6644,22 +7220,22 @@ class Game:
                 self.bullets.extend(bullets)
 
             # Check boss collision with player 1 (charge attack damage)
-            dist_to_boss = math.sqrt((self.boss.x - self.player.x)**2 + (self.boss.y - self.player.y)**2)
-            if dist_to_boss < self.boss.radius + self.player.radius:
-                if self.player.take_damage(20):
+            dist_to_boss = sqrt((self.boss.x - player.x)**2 + (self.boss.y - player.y)**2)
+            if dist_to_boss < self.boss.radius + player.radius:
+                if player.take_damage(20):
                     # In co-op, only game over if both players dead
-                    if (self.game_mode == "coop" or self.game_mode == "online_coop") and self.player2 and self.player2.health > 0:
+                    if coop_mode and player2 and player2.health > 0:
                         pass  # Player 2 still alive, continue
                     else:
                         self.state = "gameover"
                         self.stop_music()
 
             # Check boss collision with player 2 in co-op
-            if (self.game_mode == "coop" or self.game_mode == "online_coop") and self.player2 and self.player2.health > 0:
-                dist_to_boss2 = math.sqrt((self.boss.x - self.player2.x)**2 + (self.boss.y - self.player2.y)**2)
-                if dist_to_boss2 < self.boss.radius + self.player2.radius:
-                    if self.player2.take_damage(20):
-                        if self.player.health > 0:
+            if coop_mode and player2 and player2.health > 0:
+                dist_to_boss2 = sqrt((self.boss.x - player2.x)**2 + (self.boss.y - player2.y)**2)
+                if dist_to_boss2 < self.boss.radius + player2.radius:
+                    if player2.take_damage(20):
+                        if player.health > 0:
                             pass  # Player 1 still alive, continue
                         else:
                             self.state = "gameover"
@@ -6667,7 +7243,7 @@ class Game:
 
         # Check win conditions
         # Skip robot-based win condition in PvP (no robots in PvP)
-        if self.game_mode in ["pvp", "online_pvp"]:
+        if pvp_mode:
             pass  # PvP win is determined by player death, not robot count
         elif self.difficulty == "impossible":
             # Wave-based win condition
@@ -6688,52 +7264,113 @@ class Game:
                 self.state = "gameover"
                 self.stop_music()
 
-    def draw_background(self):
-        # Fill with floor color
-        self.screen.fill(FLOOR_COLOR)
+    def _build_robot_grid(self):
+        """Bucket robots into ROBOT_GRID_CELL-sized cells for neighbour lookups"""
+        grid = {}
+        for robot in self.robots:
+            key = (int(robot.x // ROBOT_GRID_CELL), int(robot.y // ROBOT_GRID_CELL))
+            if key in grid:
+                grid[key].append(robot)
+            else:
+                grid[key] = [robot]
+        return grid
+
+    def _build_obstacle_grid(self):
+        """Bucket obstacles into every OBSTACLE_GRID_CELL their (closed) rect touches"""
+        grid = {}
+        cell = OBSTACLE_GRID_CELL
+        for obs in self.obstacles:
+            for gx in range(int(obs.x // cell), int((obs.x + obs.width) // cell) + 1):
+                for gy in range(int(obs.y // cell), int((obs.y + obs.height) // cell) + 1):
+                    if (gx, gy) in grid:
+                        grid[(gx, gy)].append(obs)
+                    else:
+                        grid[(gx, gy)] = [obs]
+        return grid
 
-        # Draw grid
-        grid_size = 100
-        for x in range(0, MAP_WIDTH, grid_size):
-            sx, _ = self.camera.apply(x, 0)
-            if 0 <= sx <= SCREEN_WIDTH:
-                pygame.draw.line(self.screen, (60, 65, 70), (sx, 0), (sx, SCREEN_HEIGHT))
+    def _build_smoke_grid(self):
+        """Bucket smoke clouds into every SMOKE_GRID_CELL their full-size circle touches"""
+        grid = {}
+        for cloud in self.smoke_clouds:
+            r = cloud.max_radius
+            for gx in range(int((cloud.x - r) // SMOKE_GRID_CELL), int((cloud.x + r) // SMOKE_GRID_CELL) + 1):
+                for gy in range(int((cloud.y - r) // SMOKE_GRID_CELL), int((cloud.y + r) // SMOKE_GRID_CELL) + 1):
+                    key = (gx, gy)
+                    if key in grid:
+                        grid[key].append(cloud)
+                    else:
+                        grid[key] = [cloud]
+        return grid
 
-        for y in range(0, MAP_HEIGHT, grid_size):
-            _, sy = self.camera.apply(0, y)
-            if 0 <= sy <= SCREEN_HEIGHT:
-                pygame.draw.line(self.screen, (60, 65, 70), (0, sy), (SCREEN_WIDTH, sy))
+    def draw_background(self):
+        # Floor color and grid
+        self.draw_floor(self.screen, self.camera, SCREEN_WIDTH, SCREEN_HEIGHT)
+
+    def draw_floor(self, surface, camera, width, height):
+        """Fill the view with the floor and its grid by blitting one pre-tiled surface"""
+        tile = self._floor_tiles.get((width, height))
+        if tile is None:
+            tile = self._build_floor_tile(width, height)
+            self._floor_tiles[(width, height)] = tile
+        # Offsets land grid lines on the same pixel columns/rows as floor(line - camera)
+        grid_size = FLOOR_GRID_SIZE
+        surface.blit(tile, (-(math.ceil(camera.x) % grid_size), -(math.ceil(camera.y) % grid_size)))
+
+    def _build_floor_tile(self, width, height):
+        """Floor color plus grid lines, one grid cell larger than the view on each axis"""
+        grid_size = FLOOR_GRID_SIZE
+        tile_w = width + grid_size
+        tile_h = height + grid_size
+        tile = pygame.Surface((tile_w, tile_h)).convert()
+        tile.fill(FLOOR_COLOR)
+        for x in range(0, tile_w, grid_size):
+            pygame.draw.line(tile, FLOOR_GRID_COLOR, (x, 0), (x, tile_h - 1))
+        for y in range(0, tile_h, grid_size):
+            pygame.draw.line(tile, FLOOR_GRID_COLOR, (0, y), (tile_w - 1, y))
+        return tile
+
+    def _split_surfaces(self):
+        """Half-screen views for split-screen, rebuilt only if the display size changes"""
+        size = self.screen.get_size()
+        if size != self._split_size:
+            half = (size[0] // 2, size[1])
+            self._split_surfs = (pygame.Surface(half).convert(), pygame.Surface(half).convert())
+            self._split_size = size
+        return self._split_surfs
+
+    def _on_screen(self, entities, camera, margin):
+        """Entities whose centre passes the same on-screen test their draw() applies"""
+        left = camera.x - margin
+        right = camera.x + SCREEN_WIDTH + margin
+        top = camera.y - margin
+        bottom = camera.y + SCREEN_HEIGHT + margin
+        return [e for e in entities if left < e.x < right and top < e.y < bottom]
+
+    def _visible_obstacles(self, camera):
+        """Obstacles overlapping the view, culled before any draw() call"""
+        cx, cy = camera.x, camera.y
+        right = cx + SCREEN_WIDTH
+        bottom = cy + SCREEN_HEIGHT
+        return [o for o in self.obstacles
+                if o.x + o.width > cx and o.x < right and o.y + o.height > cy and o.y < bottom]
 
     def draw_world_to_surface(self, surface, camera):
         """Draw the game world to a surface using the specified camera"""
         width = surface.get_width()
         height = surface.get_height()
 
-        # Fill with floor color
-        surface.fill(FLOOR_COLOR)
-
-        # Draw grid
-        grid_size = 100
-        for x in range(0, MAP_WIDTH, grid_size):
-            sx, _ = camera.apply(x, 0)
-            if 0 <= sx <= width:
-                pygame.draw.line(surface, (60, 65, 70), (sx, 0), (sx, height))
-
-        for y in range(0, MAP_HEIGHT, grid_size):
-            _, sy = camera.apply(0, y)
-            if 0 <= sy <= height:
-                pygame.draw.line(surface, (60, 65, 70), (0, sy), (width, sy))
+        # Floor color and grid
+        self.draw_floor(surface, camera, width, height)
 
         # Draw obstacles
-        for obs in self.obstacles:
-            obs.draw(surface, camera)
+        Obstacle.draw_batch(surface, camera, self._visible_obstacles(camera))
 
         # Draw pickups - DISABLED
         # for pickup in self.pickups:
         #     pickup.draw(surface, camera)
 
         # Draw bullets
-        for bullet in self.bullets:
+        for bullet in self._on_screen(self.bullets, camera, 20):
             bullet.draw(surface, camera)
 
         # Draw grenades
@@ -6752,22 +7389,19 @@ class Game:
         for explosion in self.explosions:
             explosion.draw(surface, camera)
 
-        # Draw robots - set sniper target visibility based on player's current weapon
+        # Draw robots - show sniper target dots when a player has the sniper equipped
         player1_has_sniper = self.player.weapon["name"] == "Sniper"
         player2_has_sniper = self.player2 and self.player2.weapon["name"] == "Sniper"
         has_sniper = player1_has_sniper or player2_has_sniper
-        for robot in self.robots:
-            robot.show_sniper_target = has_sniper
-            robot.draw(surface, camera)
+        for robot in self._on_screen(self.robots, camera, 50):
+            robot.draw(surface, camera, has_sniper)
 
         # Draw boss
         if self.boss:
-            self.boss.show_sniper_target = has_sniper
-            self.boss.draw(surface, camera)
+            self.boss.draw(surface, camera, has_sniper)
 
         # Draw shell casings
-        for casing in self.shell_casings:
-            casing.draw(surface, camera)
+        ShellCasing.draw_batch(surface, camera, self.shell_casings)
 
         # Draw players
         self.player.draw(surface, camera)
@@ -6780,7 +7414,7 @@ class Game:
             self.remote_player4.draw(surface, camera)
 
         # Draw player names in online multiplayer
-        if self.game_mode in ["online_coop", "online_pvp", "online_2v2", "online_2v1"]:
+        if self.is_online:
             self.draw_player_names(surface, camera)
 
         # Draw muzzle flashes
@@ -6796,38 +7430,43 @@ class Game:
         # Use cached font for performance
         if not hasattr(self, '_name_font'):
             self._name_font = pygame.font.Font(None, 20)
-            # Pre-cache common labels
+            # Pre-composited label surfaces (background + text) keyed by (text, color)
             self._name_cache = {}
         name_font = self._name_font
+        name_cache = self._name_cache
+        labels = []
 
-        def draw_name_label(player, text, color):
+        def add_name_label(player, text, color):
             if player and player.health > 0:
-                sx, sy = camera.apply(player.x, player.y)
-                # Use cached surface for common labels
                 cache_key = (text, color)
-                if cache_key not in self._name_cache:
-                    self._name_cache[cache_key] = name_font.render(text, True, color)
-                name_surface = self._name_cache[cache_key]
-                name_x = sx - name_surface.get_width() // 2
-                name_y = sy - player.radius - 30
-                bg_rect = pygame.Rect(name_x - 4, name_y - 2, name_surface.get_width() + 8, name_surface.get_height() + 4)
-                pygame.draw.rect(surface, (0, 0, 0, 180), bg_rect, border_radius=4)
-                surface.blit(name_surface, (name_x, name_y))
+                label = name_cache.get(cache_key)
+                if label is None:
+                    text_surface = name_font.render(text, True, color)
+                    label = pygame.Surface((text_surface.get_width() + 8, text_surface.get_height() + 4), pygame.SRCALPHA).convert_alpha()
+                    pygame.draw.rect(label, (0, 0, 0, 180), label.get_rect(), border_radius=4)
+                    label.blit(text_surface, (4, 2))
+                    name_cache[cache_key] = label
+                sx, sy = camera.apply(player.x, player.y)
+                labels.append((label, (sx - label.get_width() // 2, sy - player.radius - 32)))
 
         # Draw "YOU" above local player
-        draw_name_label(self.player, "YOU", (100, 200, 255))
+        add_name_label(self.player, "YOU", (100, 200, 255))
 
         # For team modes (2v2, 2v1), show teammate and enemies
-        if self.game_mode in ["online_2v2", "online_2v1"]:
+        if self.game_mode in ("online_2v2", "online_2v1"):
             # Local teammate (player2)
-            draw_name_label(self.player2, "ALLY", (100, 255, 150))
+            add_name_label(self.player2, "ALLY", (100, 255, 150))
             # Enemy players
-            draw_name_label(self.remote_player3, "ENEMY", (255, 100, 100))
-            draw_name_label(self.remote_player4, "ENEMY", (255, 100, 100))
+            add_name_label(self.remote_player3, "ENEMY", (255, 100, 100))
+            add_name_label(self.remote_player4, "ENEMY", (255, 100, 100))
         else:
             # Regular online modes - show remote player's username
             display_name = self.remote_player_name if self.remote_player_name else "Player 2"
-            draw_name_label(self.player2, display_name, (255, 150, 100))
+            add_name_label(self.player2, display_name, (255, 150, 100))
+
+        # One blit call for all labels
+        if labels:
+            surface.blits(labels, False)
 
     def draw_split_screen_hud(self, surface, player, is_player1, width):
         """Draw HUD for one player in split-screen mode"""
@@ -6838,70 +7477,55 @@ class Game:
 
         # Big player label at top center of each half
         if is_player1:
-            title = self._cached_text("split_p1_title", "PLAYER 1", self.font, LIGHT_BLUE)
+            title = self._hud_static["split_p1_title"]
         else:
-            title = self._cached_text("split_p2_title", "PLAYER 2", self.font, (100, 150, 255))
+            title = self._hud_static["split_p2_title"]
         surface.blit(title, (width // 2 - title.get_width() // 2, 5))
 
         # Small P1/P2 label next to health bar
         if is_player1:
-            label = self._cached_text("split_p1_label", "P1", self.small_font, LIGHT_BLUE)
+            label = self._hud_static["split_p1_label"]
         else:
-            label = self._cached_text("split_p2_label", "P2", self.small_font, (100, 150, 255))
+            label = self._hud_static["split_p2_label"]
         surface.blit(label, (bar_x, bar_y - 5))
 
         # Health bar
-        pygame.draw.rect(surface, DARK_GRAY, (bar_x + 30, bar_y, bar_width, bar_height))
         health_width = int((max(0, player.health) / player.max_health) * bar_width)
-        health_color = GREEN if player.health > 50 else YELLOW if player.health > 25 else RED
-        pygame.draw.rect(surface, health_color, (bar_x + 30, bar_y, health_width, bar_height))
-        pygame.draw.rect(surface, WHITE, (bar_x + 30, bar_y, bar_width, bar_height), 2)
+        health_color = HP_COLOR[min(100, max(0, math.ceil(player.health)))]
+        self._draw_bar(surface, self._bar_background(bar_width, bar_height, WHITE), bar_x + 30, bar_y, health_width, health_color)
 
         cache_key = "split_p1_hp" if is_player1 else "split_p2_hp"
-        hp_text = self._cached_text(cache_key, f"{int(max(0, player.health))}", self.small_font, WHITE)
+        hp_i = int(player.health) if player.health > 0 else 0
+        hp_text = self._cached_text_int(cache_key, (hp_i,), "%d", self.small_font, WHITE)
         surface.blit(hp_text, (bar_x + 35, bar_y + 2))
 
         # Weapon info
         weapon_name = player.weapon["name"]
         cache_key = "split_p1_weapon" if is_player1 else "split_p2_weapon"
-        weapon_text = self._cached_text(cache_key, f"{weapon_name}: {player.ammo}", self.small_font, player.weapon["color"])
+        weapon_text = self._cached_text_int(cache_key, (weapon_name, player.ammo), "%s: %d", self.small_font, player.weapon["color"])
         surface.blit(weapon_text, (bar_x, bar_y + 28))
 
     def draw_minimap(self):
         # Minimap in corner
-        map_size = 200
+        map_size = MINIMAP_SIZE
         map_x = SCREEN_WIDTH - map_size - 20
         map_y = 20
 
-        # Background
-        pygame.draw.rect(self.screen, DARK_GRAY, (map_x, map_y, map_size, map_size))
-        pygame.draw.rect(self.screen, WHITE, (map_x, map_y, map_size, map_size), 2)
+        # Background, obstacles and border are pre-rendered per map
+        self.screen.blit(self._minimap_bg, (map_x, map_y))
 
         # Scale factor
         scale = map_size / MAP_WIDTH
 
-        # Draw obstacles
-        for obs in self.obstacles:
-            ox = map_x + int(obs.x * scale)
-            oy = map_y + int(obs.y * scale)
-            ow = max(2, int(obs.width * scale))
-            oh = max(2, int(obs.height * scale))
-            pygame.draw.rect(self.screen, BROWN, (ox, oy, ow, oh))
-
         # Draw robots with different colors by type
-        for robot in self.robots:
-            rx = map_x + int(robot.x * scale)
-            ry = map_y + int(robot.y * scale)
-            # Color by bot type
-            if robot.bot_type == "knife":
-                robot_color = WHITE
-            elif robot.bot_type == "throwing_knife":
-                robot_color = GRAY  # Gray for throwing knife bots
-            elif robot.bot_type == "dual_pistol":
-                robot_color = (255, 215, 0)  # Gold for dual pistol bots
-            else:  # gun bots
-                robot_color = RED
-            pygame.draw.circle(self.screen, robot_color, (rx, ry), 3)
+        screen = self.screen
+        draw_circle = pygame.draw.circle
+        bot_color = BOT_TYPE_MINIMAP_COLOR.get
+        # Scale all robot positions in one pass, then draw
+        dots = [(bot_color(r.bot_type, RED), (map_x + int(r.x * scale), map_y + int(r.y * scale)))
+                for r in self.robots]
+        for robot_color, pos in dots:
+            draw_circle(screen, robot_color, pos, 3)
 
         # Draw player
         px = map_x + int(self.player.x * scale)
@@ -6914,20 +7538,188 @@ class Game:
             by = map_y + int(self.boss.y * scale)
             pygame.draw.circle(self.screen, (150, 0, 150), (bx, by), 6)
 
-        # Draw camera view box
-        cx = map_x + int(self.camera.x * scale)
-        cy = map_y + int(self.camera.y * scale)
-        cw = int(SCREEN_WIDTH * scale)
-        ch = int(SCREEN_HEIGHT * scale)
-        pygame.draw.rect(self.screen, WHITE, (cx, cy, cw, ch), 1)
-
-    def _cached_text(self, cache_key, text, font, color):
-        """Get cached text surface, only re-render if text/color changed"""
-        key = (text, color)
-        if cache_key not in self._hud_cache or self._hud_cache_keys.get(cache_key) != key:
-            self._hud_cache[cache_key] = font.render(text, True, color)
-            self._hud_cache_keys[cache_key] = key
-        return self._hud_cache[cache_key]
+        # Draw camera view box (only recomputed when the camera moves)
+        cam_key = (self.camera.x, self.camera.y)
+        if cam_key != self._mm_last_cam:
+            self._mm_cam_rect = (map_x + int(self.camera.x * scale), map_y + int(self.camera.y * scale),
+                                 int(SCREEN_WIDTH * scale), int(SCREEN_HEIGHT * scale))
+            self._mm_last_cam = cam_key
+        pygame.draw.rect(self.screen, WHITE, self._mm_cam_rect, 1)
+
+    def _init_static_hud(self):
+        """Render HUD labels that never change once, so draw_hud just blits them"""
+        small, big = self.small_font, self.font
+        self._hud_static = {
+            "p1_label": small.render("P1", True, LIGHT_BLUE),
+            "p2_label": small.render("P2", True, (255, 150, 150)),
+            "split_p1_title": big.render("PLAYER 1", True, LIGHT_BLUE),
+            "split_p2_title": big.render("PLAYER 2", True, (100, 150, 255)),
+            "split_p1_label": small.render("P1", True, LIGHT_BLUE),
+            "split_p2_label": small.render("P2", True, (100, 150, 255)),
+            "switch": small.render("[Q/E] Switch", True, GRAY),
+            "shotgun_ok": small.render("Shotgun OK", True, GREEN),
+            "shotgun_locked": small.render("Shotgun: 10", True, GRAY),
+            "rpg_ok": small.render("RPG OK", True, GREEN),
+            "rpg_locked": small.render("RPG: 50", True, GRAY),
+            "wave_complete": big.render("Wave Complete!", True, GREEN),
+            "reload_hint": big.render("Press R to Reload!", True, RED),
+            "saved": big.render("Game Saved!", True, GREEN),
+            # Mode banners, one per game mode (each mode has its own color)
+            "mode_online_coop": small.render("ONLINE CO-OP", True, (100, 200, 255)),
+            "mode_online_pvp": small.render("ONLINE PVP", True, (255, 100, 100)),
+            "mode_coop": small.render("LOCAL CO-OP", True, (100, 255, 100)),
+            "mode_pvp": small.render("LOCAL PVP", True, (255, 150, 100)),
+        }
+
+        # Blit positions for the labels that sit at a fixed anchor, centered on x
+        right_col_x = SCREEN_WIDTH - 220
+        mid_x = SCREEN_WIDTH // 2
+        anchors = {
+            "shotgun_ok": (right_col_x, 265), "shotgun_locked": (right_col_x, 265),
+            "rpg_ok": (right_col_x, 290), "rpg_locked": (right_col_x, 290),
+            "wave_complete": (mid_x, 130),
+            "reload_hint": (mid_x, 100),
+            "saved": (mid_x, 140),
+            "mode_online_coop": (mid_x, 50), "mode_online_pvp": (mid_x, 50),
+            "mode_coop": (mid_x, 50), "mode_pvp": (mid_x, 50),
+        }
+        self._hud_static_pos = {name: (cx - self._hud_static[name].get_width() // 2, y)
+                                for name, (cx, y) in anchors.items()}
+
+        # Shop button: box, "SHOP" label and shopping cart icon never change
+        shop_btn_width = 60
+        shop_btn_height = 70
+        shop_label = small.render("SHOP", True, YELLOW)
+        # The label is a little wider than the button, so pad the surface sideways
+        pad = max(0, shop_label.get_width() - shop_btn_width + 1) // 2
+        button = pygame.Surface((shop_btn_width + pad * 2, shop_btn_height), pygame.SRCALPHA).convert_alpha()
+        pygame.draw.rect(button, DARK_GRAY, (pad, 0, shop_btn_width, shop_btn_height))
+        pygame.draw.rect(button, YELLOW, (pad, 0, shop_btn_width, shop_btn_height), 3)
+
+        # "SHOP" text above cart
+        button.blit(shop_label, (pad + shop_btn_width // 2 - shop_label.get_width() // 2, 5))
+
+        cart_x = pad + shop_btn_width // 2
+        cart_y = 45
+
+        # Cart body (trapezoid shape)
+        cart_points = [
+            (cart_x - 15, cart_y - 12),  # Top left
+            (cart_x + 15, cart_y - 12),  # Top right
+            (cart_x + 12, cart_y + 5),   # Bottom right
+            (cart_x - 12, cart_y + 5),   # Bottom left
+        ]
+        pygame.draw.polygon(button, YELLOW, cart_points, 2)
+
+        # Cart handle
+        pygame.draw.line(button, YELLOW, (cart_x - 15, cart_y - 12), (cart_x - 20, cart_y - 20), 2)
+
+        # Cart wheels
+        pygame.draw.circle(button, YELLOW, (cart_x - 8, cart_y + 10), 4)
+        pygame.draw.circle(button, YELLOW, (cart_x + 8, cart_y + 10), 4)
+        self._shop_button_surf = button
+        self._shop_button_pad = pad
+
+    def _cached_text_int(self, cache_key, values, fmt, font, color):
+        """Cached text surface keyed by the raw values, so the string is only
+        formatted the first time a value is shown"""
+        key = (cache_key, values, color)
+        cache = self._hud_value_cache
+        surf = cache.get(key)
+        if surf is None:
+            surf = font.render(fmt % values, True, color)
+            cache[key] = surf
+            # Score and similar counters never repeat, so evict the least recently shown
+            if len(cache) > HUD_CACHE_LIMIT:
+                cache.popitem(last=False)
+        else:
+            cache.move_to_end(key)
+        return surf
+
+    def _cached_label_at(self, cache_key, values, fmt, font, color, center_x, y):
+        """Cached value label plus its blit position centered on center_x,
+        so callers can blit(*label) without measuring the surface"""
+        key = (cache_key, values, color)
+        cache = self._hud_placed_cache
+        entry = cache.get(key)
+        if entry is None:
+            surf = font.render(fmt % values, True, color)
+            entry = (surf, (center_x - surf.get_width() // 2, y))
+            cache[key] = entry
+            if len(cache) > HUD_CACHE_LIMIT:
+                cache.popitem(last=False)
+        else:
+            cache.move_to_end(key)
+        return entry
+
+    def _init_button_rects(self):
+        """Hit-test rects for buttons whose position never changes"""
+        # Login screen (box is 450 wide at y=200)
+        box_width = 450
+        box_x = SCREEN_WIDTH // 2 - box_width // 2
+        box_y = 200
+        self.username_field_rect = pygame.Rect(box_x + 25, box_y + 95, box_width - 50, 35)
+        self.passcode_field_rect = pygame.Rect(box_x + 25, box_y + 175, box_width - 50, 35)
+        btn_y = box_y + 230
+        btn_height = 40
+        btn_margin = 10
+        submit_btn_width = (box_width - 60) // 2
+        self.login_submit_btn = pygame.Rect(box_x + 25, btn_y, submit_btn_width, btn_height)
+        self.login_toggle_btn = pygame.Rect(box_x + 25 + submit_btn_width + btn_margin, btn_y, submit_btn_width, btn_height)
+        self.login_guest_btn = pygame.Rect(box_x + 25, btn_y + btn_height + btn_margin, box_width - 50, btn_height)
+
+        # Online menu mode and difficulty buttons (box is 550 wide at y=100)
+        box_width = 550
+        box_x = SCREEN_WIDTH // 2 - box_width // 2
+        box_y = 100
+        btn_w = 120
+        btn_h = 35
+        self.online_coop_btn = pygame.Rect(box_x + 30, box_y + 50, btn_w, btn_h)
+        self.online_pvp_btn = pygame.Rect(box_x + 170, box_y + 50, btn_w, btn_h)
+        self.online_2v2_btn = pygame.Rect(box_x + 310, box_y + 50, btn_w, btn_h)
+        self.online_2v1_btn = pygame.Rect(box_x + 440, box_y + 50, btn_w - 20, btn_h)
+        self.online_diff_left_btn = pygame.Rect(box_x + 200, box_y + 105, 40, 35)
+
+        # HUD shop button on the middle left
+        self.shop_btn_rect = pygame.Rect(20, SCREEN_HEIGHT // 2 - 35, 60, 70)
+
+    def _bar_background(self, width, height, border_color):
+        """Pre-rendered dark bar with a 2px border, one per size/border color"""
+        key = (width, height, border_color)
+        bg = self._bar_bg_cache.get(key)
+        if bg is None:
+            bg = pygame.Surface((width, height)).convert()
+            bg.fill(DARK_GRAY)
+            pygame.draw.rect(bg, border_color, (0, 0, width, height), 2)
+            self._bar_bg_cache[key] = bg
+        return bg
+
+    def _draw_bar(self, surface, bg, x, y, fill_width, color):
+        """Blit a bar background, then fill its inside up to fill_width so the border stays on top"""
+        surface.blit(bg, (x, y))
+        inner = min(fill_width, bg.get_width() - 2) - 2
+        if inner > 0:
+            pygame.draw.rect(surface, color, (x + 2, y + 2, inner, bg.get_height() - 4))
+
+    def _screen_unchanged(self, key):
+        """True if the frame on display was drawn from this exact screen state"""
+        if key == self._shown_key:
+            return True
+        self._shown_key = key
+        return False
+
+    def _cached_screen(self, name, state_key, render, alpha=False):
+        """Full-screen surface for a mostly static screen, re-rendered only when state_key changes"""
+        entry = self._screen_cache.get(name)
+        if entry is None or entry[0] != state_key:
+            if alpha:
+                surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA).convert_alpha()
+            else:
+                surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)).convert()
+            render(surface)
+            entry = (state_key, surface)
+            self._screen_cache[name] = entry
+        return entry[1]
 
     def draw_hud(self):
         # Player 1 Health bar
@@ -6938,16 +7730,15 @@ class Game:
 
         # P1 label in multiplayer
         if self.player2:
-            p1_label = self._cached_text("p1_label", "P1", self.small_font, LIGHT_BLUE)
+            p1_label = self._hud_static["p1_label"]
             self.screen.blit(p1_label, (bar_x, bar_y - 18))
 
-        pygame.draw.rect(self.screen, DARK_GRAY, (bar_x, bar_y, bar_width, bar_height))
         health_width = int((max(0, self.player.health) / self.player.max_health) * bar_width)
-        health_color = GREEN if self.player.health > 50 else YELLOW if self.player.health > 25 else RED
-        pygame.draw.rect(self.screen, health_color, (bar_x, bar_y, health_width, bar_height))
-        pygame.draw.rect(self.screen, WHITE, (bar_x, bar_y, bar_width, bar_height), 2)
+        health_color = HP_COLOR[min(100, max(0, math.ceil(self.player.health)))]
+        self._draw_bar(self.screen, self._bar_background(bar_width, bar_height, WHITE), bar_x, bar_y, health_width, health_color)
 
-        hp_text = self._cached_text("hp", f"HP: {int(max(0, self.player.health))}", self.small_font, WHITE)
+        hp_i = int(self.player.health) if self.player.health > 0 else 0
+        hp_text = self._cached_text_int("hp", (hp_i,), "HP: %d", self.small_font, WHITE)
         self.screen.blit(hp_text, (bar_x + 5, bar_y + 3))
 
         # Player 2 Health bar (in multiplayer modes)
@@ -6955,20 +7746,20 @@ class Game:
             p2_bar_x = SCREEN_WIDTH - bar_width - 20
             p2_bar_y = 20
 
-            p2_label = self._cached_text("p2_label", "P2", self.small_font, (255, 150, 150))
+            p2_label = self._hud_static["p2_label"]
             self.screen.blit(p2_label, (p2_bar_x, p2_bar_y - 18))
 
-            pygame.draw.rect(self.screen, DARK_GRAY, (p2_bar_x, p2_bar_y, bar_width, bar_height))
             p2_health_width = int((max(0, self.player2.health) / self.player2.max_health) * bar_width)
-            p2_health_color = GREEN if self.player2.health > 50 else YELLOW if self.player2.health > 25 else RED
-            pygame.draw.rect(self.screen, p2_health_color, (p2_bar_x, p2_bar_y, p2_health_width, bar_height))
-            pygame.draw.rect(self.screen, (255, 200, 200), (p2_bar_x, p2_bar_y, bar_width, bar_height), 2)
+            p2_health_color = HP_COLOR[min(100, max(0, math.ceil(self.player2.health)))]
+            p2_bar_bg = self._bar_background(bar_width, bar_height, (255, 200, 200))
+            self._draw_bar(self.screen, p2_bar_bg, p2_bar_x, p2_bar_y, p2_health_width, p2_health_color)
 
-            p2_hp_text = self._cached_text("p2_hp", f"HP: {int(max(0, self.player2.health))}", self.small_font, WHITE)
+            p2_hp_i = int(self.player2.health) if self.player2.health > 0 else 0
+            p2_hp_text = self._cached_text_int("p2_hp", (p2_hp_i,), "HP: %d", self.small_font, WHITE)
             self.screen.blit(p2_hp_text, (p2_bar_x + 5, p2_bar_y + 3))
 
             # P2 weapon info
-            p2_weapon_text = self._cached_text("p2_weapon", f"{self.player2.weapon['name']}: {self.player2.ammo}", self.small_font, (255, 150, 150))
+            p2_weapon_text = self._cached_text_int("p2_weapon", (self.player2.weapon["name"], self.player2.ammo), "%s: %d", self.small_font, (255, 150, 150))
             self.screen.blit(p2_weapon_text, (p2_bar_x, p2_bar_y + 30))
 
         # Weapon and Ammo with reloads on the right
@@ -6984,124 +7775,85 @@ class Game:
         else:
             reload_str = str(reloads)
 
-        weapon_text = self._cached_text("weapon", f"{weapon_name}: {self.player.ammo}/{self.player.max_ammo}", self.font, weapon_color)
+        weapon_text = self._cached_text_int("weapon", (weapon_name, self.player.ammo, self.player.max_ammo), "%s: %d/%d", self.font, weapon_color)
         self.screen.blit(weapon_text, (20, 55))
 
         # Reloads display on the right of ammo
-        reload_color = GREEN if reloads > 2 or self.player.weapon.get("melee", False) else YELLOW if reloads > 0 else RED
-        reload_text = self._cached_text("reloads", f"[{reload_str}]", self.small_font, reload_color)
+        reload_color = GREEN if self.player.weapon.get("melee", False) else RELOAD_COLOR[min(15, reloads)]
+        reload_text = self._cached_text_int("reloads", (reload_str,), "[%s]", self.small_font, reload_color)
         self.screen.blit(reload_text, (20 + weapon_text.get_width() + 10, 60))
 
         # Switch weapon hint
-        switch_text = self._cached_text("switch", "[Q/E] Switch", self.small_font, GRAY)
+        switch_text = self._hud_static["switch"]
         self.screen.blit(switch_text, (20, 95))
 
         # Coins display (top right corner)
         coin_color = YELLOW if self.player.coins < 10 else GREEN
-        coin_text = self._cached_text("coins", f"Coins: {self.player.coins}", self.font, coin_color)
-        self.screen.blit(coin_text, (SCREEN_WIDTH - 220 - coin_text.get_width()//2, 230))
+        self.screen.blit(*self._cached_label_at("coins", (self.player.coins,), "Coins: %d", self.font, coin_color, SCREEN_WIDTH - 220, 230))
 
         # Shotgun status
-        shotgun_txt = "Shotgun OK" if self.player.has_shotgun else "Shotgun: 10"
-        shotgun_color = GREEN if self.player.has_shotgun else GRAY
-        shotgun_text = self._cached_text("shotgun", shotgun_txt, self.small_font, shotgun_color)
-        self.screen.blit(shotgun_text, (SCREEN_WIDTH - 220 - shotgun_text.get_width()//2, 265))
+        shotgun_key = "shotgun_ok" if self.player.has_shotgun else "shotgun_locked"
+        self.screen.blit(self._hud_static[shotgun_key], self._hud_static_pos[shotgun_key])
 
         # RPG status
-        rpg_txt = "RPG OK" if self.player.has_rpg else "RPG: 50"
-        rpg_color = GREEN if self.player.has_rpg else GRAY
-        rpg_text = self._cached_text("rpg", rpg_txt, self.small_font, rpg_color)
-        self.screen.blit(rpg_text, (SCREEN_WIDTH - 220 - rpg_text.get_width()//2, 290))
+        rpg_key = "rpg_ok" if self.player.has_rpg else "rpg_locked"
+        self.screen.blit(self._hud_static[rpg_key], self._hud_static_pos[rpg_key])
 
         # Medkit charges
         medkit_color = GREEN if self.player.medkit_charges > 0 else GRAY
-        medkit_text = self._cached_text("medkit", f"Med: {self.player.medkit_charges} [H]", self.small_font, medkit_color)
-        self.screen.blit(medkit_text, (SCREEN_WIDTH - 220 - medkit_text.get_width()//2, 315))
+        self.screen.blit(*self._cached_label_at("medkit", (self.player.medkit_charges,), "Med: %d [H]", self.small_font, medkit_color, SCREEN_WIDTH - 220, 315))
 
         # Score and kills
-        score_text = self._cached_text("score", f"Score: {self.score} | K: {self.kills}", self.small_font, YELLOW)
+        score_text = self._cached_text_int("score", (self.score, self.kills), "Score: %d | K: %d", self.small_font, YELLOW)
         self.screen.blit(score_text, (20, SCREEN_HEIGHT - 40))
 
         # Robots remaining
-        robots_text = self._cached_text("robots", f"Bots: {len(self.robots)}", self.small_font, ORANGE)
+        robots_text = self._cached_text_int("robots", (len(self.robots),), "Bots: %d", self.small_font, ORANGE)
         self.screen.blit(robots_text, (20, SCREEN_HEIGHT - 70))
 
         # Wave info for impossible mode
         if self.difficulty == "impossible":
-            wave_text = self._cached_text("wave", f"Wave {self.current_wave}/{self.max_waves}", self.font, (150, 0, 150))
-            self.screen.blit(wave_text, (SCREEN_WIDTH // 2 - wave_text.get_width() // 2, 10))
+            self.screen.blit(*self._cached_label_at("wave", (self.current_wave, self.max_waves), "Wave %d/%d", self.font, (150, 0, 150), SCREEN_WIDTH // 2, 10))
 
             # Wave complete message
             if len(self.robots) == 0 and self.boss is None and self.current_wave < self.max_waves:
-                next_wave_text = self._cached_text("wave_complete", "Wave Complete!", self.font, GREEN)
-                self.screen.blit(next_wave_text, (SCREEN_WIDTH // 2 - next_wave_text.get_width() // 2, 130))
+                self.screen.blit(self._hud_static["wave_complete"], self._hud_static_pos["wave_complete"])
 
         # Show game mode (simplified)
-        if self.game_mode in ["online_coop", "online_pvp", "coop", "pvp"]:
-            mode_map = {"online_coop": ("ONLINE CO-OP", (100, 200, 255)),
-                       "online_pvp": ("ONLINE PVP", (255, 100, 100)),
-                       "coop": ("LOCAL CO-OP", (100, 255, 100)),
-                       "pvp": ("LOCAL PVP", (255, 150, 100))}
-            mode_txt, mode_color = mode_map[self.game_mode]
-            mode_text = self._cached_text("mode", mode_txt, self.small_font, mode_color)
-            self.screen.blit(mode_text, (SCREEN_WIDTH // 2 - mode_text.get_width() // 2, 50))
+        if self.game_mode in ("online_coop", "online_pvp", "coop", "pvp"):
+            mode_key = "mode_" + self.game_mode
+            self.screen.blit(self._hud_static[mode_key], self._hud_static_pos[mode_key])
 
         # Reload hint
         if self.player.ammo == 0:
-            reload_hint = self._cached_text("reload_hint", "Press R to Reload!", self.font, RED)
-            self.screen.blit(reload_hint, (SCREEN_WIDTH // 2 - reload_hint.get_width() // 2, 100))
+            self.screen.blit(self._hud_static["reload_hint"], self._hud_static_pos["reload_hint"])
 
         # Save message
         if self.show_save_message > 0:
-            save_text = self._cached_text("saved", "Game Saved!", self.font, GREEN)
-            self.screen.blit(save_text, (SCREEN_WIDTH // 2 - save_text.get_width() // 2, 140))
+            self.screen.blit(self._hud_static["saved"], self._hud_static_pos["saved"])
             self.show_save_message -= 1
 
-        # Shop button on middle left side with shopping cart icon
-        shop_btn_width = 60
-        shop_btn_height = 70
-        shop_btn_x = 20
-        shop_btn_y = SCREEN_HEIGHT // 2 - shop_btn_height // 2
-        self.shop_btn_rect = pygame.Rect(shop_btn_x, shop_btn_y, shop_btn_width, shop_btn_height)
-
-        pygame.draw.rect(self.screen, DARK_GRAY, self.shop_btn_rect)
-        pygame.draw.rect(self.screen, YELLOW, self.shop_btn_rect, 3)
-
-        # "SHOP" text above cart
-        shop_label = self._cached_text("shop_label", "SHOP", self.small_font, YELLOW)
-        self.screen.blit(shop_label, (shop_btn_x + shop_btn_width // 2 - shop_label.get_width() // 2, shop_btn_y + 5))
-
-        # Draw shopping cart icon
-        cart_x = shop_btn_x + shop_btn_width // 2
-        cart_y = shop_btn_y + 45
-
-        # Cart body (trapezoid shape)
-        cart_points = [
-            (cart_x - 15, cart_y - 12),  # Top left
-            (cart_x + 15, cart_y - 12),  # Top right
-            (cart_x + 12, cart_y + 5),   # Bottom right
-            (cart_x - 12, cart_y + 5),   # Bottom left
-        ]
-        pygame.draw.polygon(self.screen, YELLOW, cart_points, 2)
-
-        # Cart handle
-        pygame.draw.line(self.screen, YELLOW, (cart_x - 15, cart_y - 12), (cart_x - 20, cart_y - 20), 2)
-
-        # Cart wheels
-        pygame.draw.circle(self.screen, YELLOW, (cart_x - 8, cart_y + 10), 4)
-        pygame.draw.circle(self.screen, YELLOW, (cart_x + 8, cart_y + 10), 4)
+        # Shop button on middle left side with shopping cart icon (pre-rendered)
+        shop_btn = self.shop_btn_rect
+        self.screen.blit(self._shop_button_surf, (shop_btn.x - self._shop_button_pad, shop_btn.y))
 
     def draw_login_screen(self):
         """Draw login/register screen"""
-        # Enable text input for mobile keyboard
-        pygame.key.start_text_input()
-        self.screen.fill(DARK_GRAY)
+        state_key = (self.login_mode, self.active_input, self.username_input,
+                     len(self.passcode_input), self.login_message, current_user)
+        if self._screen_unchanged(("login", state_key)):
+            return []
+        self.screen.blit(self._cached_screen("login", state_key, self._render_login_screen), (0, 0))
+        return None
+
+    def _render_login_screen(self, surface):
+        surface.fill(DARK_GRAY)
 
         # Title
         title = self.big_font.render("ARENA SHOOTER 2D", True, RED)
         subtitle = self.font.render("ROBOT BATTLE", True, WHITE)
-        self.screen.blit(title, (SCREEN_WIDTH // 2 - title.get_width() // 2, 80))
-        self.screen.blit(subtitle, (SCREEN_WIDTH // 2 - subtitle.get_width() // 2, 150))
+        surface.blit(title, (SCREEN_WIDTH // 2 - title.get_width() // 2, 80))
+        surface.blit(subtitle, (SCREEN_WIDTH // 2 - subtitle.get_width() // 2, 150))
 
         # Login box
         box_width = 450
@@ -7109,118 +7861,115 @@ class Game:
         box_x = SCREEN_WIDTH // 2 - box_width // 2
         box_y = 200
 
-        pygame.draw.rect(self.screen, (40, 40, 50), (box_x, box_y, box_width, box_height))
-        pygame.draw.rect(self.screen, LIGHT_BLUE, (box_x, box_y, box_width, box_height), 3)
+        pygame.draw.rect(surface, (40, 40, 50), (box_x, box_y, box_width, box_height))
+        pygame.draw.rect(surface, LIGHT_BLUE, (box_x, box_y, box_width, box_height), 3)
 
         # Mode title
         mode_text = "LOGIN" if self.login_mode == "login" else "REGISTER"
         mode_render = self.font.render(mode_text, True, LIGHT_BLUE)
-        self.screen.blit(mode_render, (SCREEN_WIDTH // 2 - mode_render.get_width() // 2, box_y + 15))
+        surface.blit(mode_render, (SCREEN_WIDTH // 2 - mode_render.get_width() // 2, box_y + 15))
 
         # Username field
         username_y = box_y + 70
         username_label = self.small_font.render("Username:", True, WHITE)
-        self.screen.blit(username_label, (box_x + 25, username_y))
+        surface.blit(username_label, (box_x + 25, username_y))
 
         username_box_color = GREEN if self.active_input == "username" else GRAY
-        pygame.draw.rect(self.screen, (30, 30, 40), (box_x + 25, username_y + 25, box_width - 50, 35))
-        pygame.draw.rect(self.screen, username_box_color, (box_x + 25, username_y + 25, box_width - 50, 35), 2)
+        pygame.draw.rect(surface, (30, 30, 40), self.username_field_rect)
+        pygame.draw.rect(surface, username_box_color, self.username_field_rect, 2)
 
-        username_text = self.font.render(self.username_input, True, WHITE)
-        self.screen.blit(username_text, (box_x + 35, username_y + 28))
+        # Typed text is only re-rendered when it changes
+        if self._username_text_cached != self.username_input:
+            self._username_surf = self.font.render(self.username_input, True, WHITE)
+            self._username_text_cached = self.username_input
+        username_text = self._username_surf
+        surface.blit(username_text, (box_x + 35, username_y + 28))
 
         # Cursor for username
         if self.active_input == "username":
             cursor_x = box_x + 35 + username_text.get_width()
-            pygame.draw.line(self.screen, WHITE, (cursor_x, username_y + 28), (cursor_x, username_y + 52), 2)
+            pygame.draw.line(surface, WHITE, (cursor_x, username_y + 28), (cursor_x, username_y + 52), 2)
 
         # Passcode field
         passcode_y = box_y + 150
         passcode_label = self.small_font.render("Passcode:", True, WHITE)
-        self.screen.blit(passcode_label, (box_x + 25, passcode_y))
+        surface.blit(passcode_label, (box_x + 25, passcode_y))
 
         passcode_box_color = GREEN if self.active_input == "passcode" else GRAY
-        pygame.draw.rect(self.screen, (30, 30, 40), (box_x + 25, passcode_y + 25, box_width - 50, 35))
-        pygame.draw.rect(self.screen, passcode_box_color, (box_x + 25, passcode_y + 25, box_width - 50, 35), 2)
+        pygame.draw.rect(surface, (30, 30, 40), self.passcode_field_rect)
+        pygame.draw.rect(surface, passcode_box_color, self.passcode_field_rect, 2)
 
         # Show passcode as asterisks
-        passcode_display = "*" * len(self.passcode_input)
-        passcode_text = self.font.render(passcode_display, True, WHITE)
-        self.screen.blit(passcode_text, (box_x + 35, passcode_y + 28))
+        if self._passcode_len_cached != len(self.passcode_input):
+            self._passcode_surf = self.font.render("*" * len(self.passcode_input), True, WHITE)
+            self._passcode_len_cached = len(self.passcode_input)
+        passcode_text = self._passcode_surf
+        surface.blit(passcode_text, (box_x + 35, passcode_y + 28))
 
         # Cursor for passcode
         if self.active_input == "passcode":
             cursor_x = box_x + 35 + passcode_text.get_width()
-            pygame.draw.line(self.screen, WHITE, (cursor_x, passcode_y + 28), (cursor_x, passcode_y + 52), 2)
-
-        # Message (success/error)
-        if self.login_message:
-            msg_color = GREEN if "success" in self.login_message.lower() or "created" in self.login_message.lower() else RED
-            msg_render = self.small_font.render(self.login_message, True, msg_color)
-            self.screen.blit(msg_render, (SCREEN_WIDTH // 2 - msg_render.get_width() // 2, box_y + 235))
-
-        # Touch-friendly buttons
-        btn_y = box_y + 230
-        btn_height = 40
-        btn_margin = 10
+            pygame.draw.line(surface, WHITE, (cursor_x, passcode_y + 28), (cursor_x, passcode_y + 52), 2)
 
+        # Touch-friendly buttons (rects are laid out in _init_button_rects)
         # Submit button
-        submit_btn_x = box_x + 25
-        submit_btn_width = (box_width - 60) // 2
-        pygame.draw.rect(self.screen, (50, 150, 50), (submit_btn_x, btn_y, submit_btn_width, btn_height))
-        pygame.draw.rect(self.screen, GREEN, (submit_btn_x, btn_y, submit_btn_width, btn_height), 2)
+        submit_btn = self.login_submit_btn
+        pygame.draw.rect(surface, (50, 150, 50), submit_btn)
+        pygame.draw.rect(surface, GREEN, submit_btn, 2)
         submit_text = self.font.render("SUBMIT", True, WHITE)
-        self.screen.blit(submit_text, (submit_btn_x + submit_btn_width // 2 - submit_text.get_width() // 2, btn_y + 8))
-        self.login_submit_btn = pygame.Rect(submit_btn_x, btn_y, submit_btn_width, btn_height)
+        surface.blit(submit_text, (submit_btn.centerx - submit_text.get_width() // 2, submit_btn.y + 8))
 
         # Register/Login toggle button
-        toggle_btn_x = box_x + 25 + submit_btn_width + btn_margin
+        toggle_btn = self.login_toggle_btn
         toggle_text_str = "REGISTER" if self.login_mode == "login" else "LOGIN"
-        pygame.draw.rect(self.screen, (100, 100, 150), (toggle_btn_x, btn_y, submit_btn_width, btn_height))
-        pygame.draw.rect(self.screen, LIGHT_BLUE, (toggle_btn_x, btn_y, submit_btn_width, btn_height), 2)
+        pygame.draw.rect(surface, (100, 100, 150), toggle_btn)
+        pygame.draw.rect(surface, LIGHT_BLUE, toggle_btn, 2)
         toggle_text = self.font.render(toggle_text_str, True, WHITE)
-        self.screen.blit(toggle_text, (toggle_btn_x + submit_btn_width // 2 - toggle_text.get_width() // 2, btn_y + 8))
-        self.login_toggle_btn = pygame.Rect(toggle_btn_x, btn_y, submit_btn_width, btn_height)
+        surface.blit(toggle_text, (toggle_btn.centerx - toggle_text.get_width() // 2, toggle_btn.y + 8))
 
         # Guest button (full width below)
-        guest_btn_y = btn_y + btn_height + btn_margin
-        guest_btn_width = box_width - 50
-        pygame.draw.rect(self.screen, (150, 100, 50), (box_x + 25, guest_btn_y, guest_btn_width, btn_height))
-        pygame.draw.rect(self.screen, ORANGE, (box_x + 25, guest_btn_y, guest_btn_width, btn_height), 2)
+        guest_btn = self.login_guest_btn
+        pygame.draw.rect(surface, (150, 100, 50), guest_btn)
+        pygame.draw.rect(surface, ORANGE, guest_btn, 2)
         guest_text = self.font.render("PLAY AS GUEST", True, WHITE)
-        self.screen.blit(guest_text, (SCREEN_WIDTH // 2 - guest_text.get_width() // 2, guest_btn_y + 8))
-        self.login_guest_btn = pygame.Rect(box_x + 25, guest_btn_y, guest_btn_width, btn_height)
-
-        # Store input field rects for touch
-        self.username_field_rect = pygame.Rect(box_x + 25, username_y + 25, box_width - 50, 35)
-        self.passcode_field_rect = pygame.Rect(box_x + 25, passcode_y + 25, box_width - 50, 35)
+        surface.blit(guest_text, (SCREEN_WIDTH // 2 - guest_text.get_width() // 2, guest_btn.y + 8))
 
         # Message (success/error)
         if self.login_message:
-            msg_color = GREEN if "success" in self.login_message.lower() or "created" in self.login_message.lower() else RED
-            msg_render = self.small_font.render(self.login_message, True, msg_color)
-            self.screen.blit(msg_render, (SCREEN_WIDTH // 2 - msg_render.get_width() // 2, guest_btn_y + btn_height + 10))
+            if self._login_msg_cached != self.login_message:
+                msg_lower = self.login_message.lower()
+                msg_color = GREEN if "success" in msg_lower or "created" in msg_lower else RED
+                self._login_msg_surf = self.small_font.render(self.login_message, True, msg_color)
+                self._login_msg_cached = self.login_message
+            msg_render = self._login_msg_surf
+            surface.blit(msg_render, (SCREEN_WIDTH // 2 - msg_render.get_width() // 2, guest_btn.bottom + 10))
 
         # Show current user if logged in
         if current_user:
             user_text = self.small_font.render(f"Logged in as: {current_user}", True, GREEN)
-            self.screen.blit(user_text, (SCREEN_WIDTH // 2 - user_text.get_width() // 2, box_y + box_height + 30))
+            surface.blit(user_text, (SCREEN_WIDTH // 2 - user_text.get_width() // 2, box_y + box_height + 30))
 
     def draw_menu(self):
-        self.screen.fill((25, 25, 35))  # Darker background
+        state_key = (self.selected_map, self.mobile_controls, current_user)
+        if self._screen_unchanged(("menu", state_key)):
+            return []
+        self.screen.blit(self._cached_screen("menu", state_key, self._render_menu), (0, 0))
+        return None
+
+    def _render_menu(self, surface):
+        surface.fill((25, 25, 35))  # Darker background
 
         # Title area with decorative line
         title = self.big_font.render("ARENA SHOOTER 2D", True, RED)
         subtitle = self.font.render("ROBOT BATTLE", True, (200, 200, 200))
-        self.screen.blit(title, (SCREEN_WIDTH // 2 - title.get_width() // 2, 30))
-        self.screen.blit(subtitle, (SCREEN_WIDTH // 2 - subtitle.get_width() // 2, 85))
+        surface.blit(title, (SCREEN_WIDTH // 2 - title.get_width() // 2, 30))
+        surface.blit(subtitle, (SCREEN_WIDTH // 2 - subtitle.get_width() // 2, 85))
 
         # Decorative line under title
-        pygame.draw.line(self.screen, (60, 60, 80), (SCREEN_WIDTH // 2 - 200, 115), (SCREEN_WIDTH // 2 + 200, 115), 2)
+        pygame.draw.line(surface, (60, 60, 80), (SCREEN_WIDTH // 2 - 200, 115), (SCREEN_WIDTH // 2 + 200, 115), 2)
 
         # Version in corner
-        version = self.small_font.render("v3.0", True, (100, 100, 100))
-        self.screen.blit(version, (SCREEN_WIDTH - version.get_width() - 10, 10))
+        surface.blit(self._version_surf, (SCREEN_WIDTH - self._version_surf.get_width() - 10, 10))
 
         # Two column layout
         left_col = SCREEN_WIDTH // 2 - 160
@@ -7229,16 +7978,16 @@ class Game:
         btn_h = 32
 
         def draw_btn(text, x, y, color, bg_color, btn_name, width=btn_w):
-            pygame.draw.rect(self.screen, bg_color, (x, y, width, btn_h), border_radius=4)
-            pygame.draw.rect(self.screen, color, (x, y, width, btn_h), 2, border_radius=4)
+            pygame.draw.rect(surface, bg_color, (x, y, width, btn_h), border_radius=4)
+            pygame.draw.rect(surface, color, (x, y, width, btn_h), 2, border_radius=4)
             txt = self.small_font.render(text, True, color)
-            self.screen.blit(txt, (x + width // 2 - txt.get_width() // 2, y + 6))
+            surface.blit(txt, (x + width // 2 - txt.get_width() // 2, y + 6))
             self.menu_buttons[btn_name] = pygame.Rect(x, y, width, btn_h)
 
         def draw_section(text, x, y, color, width=btn_w):
-            header = self.small_font.render(text, True, color)
-            self.screen.blit(header, (x + width // 2 - header.get_width() // 2, y))
-            pygame.draw.line(self.screen, (50, 50, 60), (x, y + 22), (x + width, y + 22), 1)
+            header = self._section_surfs[text]
+            surface.blit(header, (x + width // 2 - header.get_width() // 2, y))
+            pygame.draw.line(surface, (50, 50, 60), (x, y + 22), (x + width, y + 22), 1)
 
         # ===== SOLO MODE (Left Column) =====
         draw_section("SOLO", left_col, 135, LIGHT_BLUE)
@@ -7269,13 +8018,13 @@ class Game:
         draw_btn("<", left_col, map_y, (100, 180, 255), (30, 40, 60), "map_left", 40)
         # Map name (centered)
         map_name = self.font.render(self.selected_map.upper(), True, (100, 180, 255))
-        self.screen.blit(map_name, (SCREEN_WIDTH // 2 - map_name.get_width() // 2, map_y + 4))
+        surface.blit(map_name, (SCREEN_WIDTH // 2 - map_name.get_width() // 2, map_y + 4))
         # Right arrow
         draw_btn(">", right_col + btn_w - 40, map_y, (100, 180, 255), (30, 40, 60), "map_right", 40)
 
         # ===== SETTINGS ROW =====
         settings_y = 555
-        pygame.draw.line(self.screen, (50, 50, 60), (left_col, settings_y - 10), (right_col + btn_w, settings_y - 10), 1)
+        pygame.draw.line(surface, (50, 50, 60), (left_col, settings_y - 10), (right_col + btn_w, settings_y - 10), 1)
 
         # Touch controls toggle
         touch_status = "ON" if self.mobile_controls else "OFF"
@@ -7291,18 +8040,20 @@ class Game:
 
         # Controls hint (only on desktop)
         if not IS_MOBILE:
-            controls_hint = self.small_font.render("P1: WASD+Mouse | P2: IJKL+NumPad", True, GRAY)
-            self.screen.blit(controls_hint, (SCREEN_WIDTH // 2 - controls_hint.get_width() // 2, 690))
+            controls_hint = self._controls_hint_surf
+            surface.blit(controls_hint, (SCREEN_WIDTH // 2 - controls_hint.get_width() // 2, 690))
 
     def draw_gameover(self):
         # Darken screen
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-        overlay.fill(BLACK)
-        overlay.set_alpha(180)
-        self.screen.blit(overlay, (0, 0))
+        self.screen.blit(self._gameover_overlay, (0, 0))
 
+        # Result text only changes with the outcome, so it is rendered once
+        state_key = (self.game_mode, self.pvp_winner, len(self.robots) == 0, self.score, self.kills)
+        self.screen.blit(self._cached_screen("gameover", state_key, self._render_gameover_text, True), (0, 0))
+
+    def _render_gameover_text(self, surface):
         # Result - different for PvP mode
-        if self.game_mode in ["pvp", "online_pvp"] and self.pvp_winner:
+        if self.is_pvp and self.pvp_winner:
             if self.game_mode == "online_pvp":
                 # For online PvP, show YOU WIN! or YOU LOSE! based on who won
                 if self.pvp_winner == "Player 1":
@@ -7315,9 +8066,9 @@ class Game:
                 # Local PvP shows Player 1/2 wins
                 result = self.big_font.render(f"{self.pvp_winner} WINS!", True, GREEN)
                 subtitle = self.font.render("PvP Battle Complete", True, YELLOW)
-            self.screen.blit(result, (SCREEN_WIDTH // 2 - result.get_width() // 2, 280))
-            self.screen.blit(subtitle, (SCREEN_WIDTH // 2 - subtitle.get_width() // 2, 360))
-        elif self.game_mode == "coop" or self.game_mode == "online_coop":
+            surface.blit(result, (SCREEN_WIDTH // 2 - result.get_width() // 2, 280))
+            surface.blit(subtitle, (SCREEN_WIDTH // 2 - subtitle.get_width() // 2, 360))
+        elif self.is_coop:
             # Co-op mode (local or online)
             if len(self.robots) == 0:
                 result = self.big_font.render("VICTORY!", True, GREEN)
@@ -7328,33 +8079,96 @@ class Game:
             else:
                 result = self.big_font.render("GAME OVER", True, RED)
                 subtitle = self.font.render("Both players defeated!", True, RED)
-            self.screen.blit(result, (SCREEN_WIDTH // 2 - result.get_width() // 2, 280))
-            self.screen.blit(subtitle, (SCREEN_WIDTH // 2 - subtitle.get_width() // 2, 360))
+            surface.blit(result, (SCREEN_WIDTH // 2 - result.get_width() // 2, 280))
+            surface.blit(subtitle, (SCREEN_WIDTH // 2 - subtitle.get_width() // 2, 360))
             # Score
             score = self.font.render(f"Score: {self.score} | Kills: {self.kills}", True, WHITE)
-            self.screen.blit(score, (SCREEN_WIDTH // 2 - score.get_width() // 2, 410))
+            surface.blit(score, (SCREEN_WIDTH // 2 - score.get_width() // 2, 410))
         else:
             # Solo mode
             if len(self.robots) == 0:
                 result = self.big_font.render("VICTORY!", True, GREEN)
             else:
                 result = self.big_font.render("GAME OVER", True, RED)
-            self.screen.blit(result, (SCREEN_WIDTH // 2 - result.get_width() // 2, 300))
+            surface.blit(result, (SCREEN_WIDTH // 2 - result.get_width() // 2, 300))
             # Score
             score = self.font.render(f"Score: {self.score} | Kills: {self.kills}", True, WHITE)
-            self.screen.blit(score, (SCREEN_WIDTH // 2 - score.get_width() // 2, 400))
+            surface.blit(score, (SCREEN_WIDTH // 2 - score.get_width() // 2, 400))
 
         # Options
         retry = self.small_font.render("[R] Play Again | [ESC] Menu", True, GRAY)
-        self.screen.blit(retry, (SCREEN_WIDTH // 2 - retry.get_width() // 2, 500))
+        surface.blit(retry, (SCREEN_WIDTH // 2 - retry.get_width() // 2, 500))
 
     def draw_online_menu(self):
+        state_key = (self.online_game_mode, self.online_difficulty, self.online_input_active,
+                     self.online_input_code, self.online_message)
+        if self._screen_unchanged(("online_menu", state_key)):
+            return []
+        self.screen.blit(self._cached_screen("online_menu", state_key, self._render_online_menu), (0, 0))
+        return None
+
+    def _build_menu_backgrounds(self):
+        """Pre-render the static chrome of the shop, avatar shop and waiting screens"""
+        # Shop panel: box, border, title and footer (positions match draw_shop)
+        box_width = 1100
+        box_height = 650
+        box_x = SCREEN_WIDTH // 2 - box_width // 2
+        bg = pygame.Surface((box_width, box_height)).convert()
+        bg.fill(DARK_GRAY)
+        pygame.draw.rect(bg, YELLOW, (0, 0, box_width, box_height), 4)
+        title = self.big_font.render("SHOP", True, YELLOW)
+        bg.blit(title, (SCREEN_WIDTH // 2 - title.get_width() // 2 - box_x, 10))
+        avatar_text = self.font.render("[A] Avatar Shop", True, (150, 200, 255))
+        bg.blit(avatar_text, (30, box_height - 45))
+        close_text = self.font.render("[ESC] Close Shop", True, RED)
+        bg.blit(close_text, (SCREEN_WIDTH // 2 - close_text.get_width() // 2 + 100 - box_x, box_height - 45))
+        self._shop_bg = bg
+
+        # Avatar shop panel: box, border and title
+        box_width = 900
+        box_height = 550
+        box_x = SCREEN_WIDTH // 2 - box_width // 2
+        bg = pygame.Surface((box_width, box_height)).convert()
+        bg.fill(DARK_GRAY)
+        pygame.draw.rect(bg, (150, 200, 255), (0, 0, box_width, box_height), 4)
+        title = self.big_font.render("AVATAR SHOP", True, (150, 200, 255))
+        bg.blit(title, (SCREEN_WIDTH // 2 - title.get_width() // 2 - box_x, 15))
+        self._avatar_shop_bg = bg
+
+        # Waiting screen: background and cancel hint
+        bg = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)).convert()
+        bg.fill((20, 20, 40))
+        cancel_text = self.small_font.render("[ESC] Cancel", True, RED)
+        bg.blit(cancel_text, (SCREEN_WIDTH // 2 - cancel_text.get_width() // 2, 500))
+        self._waiting_bg = bg
+
+    def _txt(self, text, font, color):
+        """Rendered surface for a fixed menu/shop string, rendered on first use"""
+        return self._txt_centered(text, font, color)[0]
+
+    def _txt_centered(self, text, font, color):
+        """Cached fixed string plus the x that centers it on the screen"""
+        key = (text, id(font), color)
+        entry = self._text_cache.get(key)
+        if entry is None:
+            surf = font.render(text, True, color).convert_alpha()
+            entry = (surf, SCREEN_WIDTH // 2 - surf.get_width() // 2)
+            self._text_cache[key] = entry
+        return entry
+
+    def _draw_mode_button(self, surface, rect, label, color):
+        """Online menu mode button: dark box, colored outline, centered label"""
+        pygame.draw.rect(surface, (30, 30, 50), rect)
+        pygame.draw.rect(surface, color, rect, 2)
+        surface.blit(label, (rect.centerx - label.get_width()//2, rect.centery - label.get_height()//2))
+
+    def _render_online_menu(self, surface):
         # Background
-        self.screen.fill((20, 20, 40))
+        surface.fill((20, 20, 40))
 
         # Title
-        title = self.big_font.render("ONLINE MULTIPLAYER", True, (0, 200, 255))
-        self.screen.blit(title, (SCREEN_WIDTH // 2 - title.get_width() // 2, 40))
+        title = self._txt("ONLINE MULTIPLAYER", self.big_font, (0, 200, 255))
+        surface.blit(title, (SCREEN_WIDTH // 2 - title.get_width() // 2, 40))
 
         # Box
         box_width = 550
@@ -7362,60 +8176,28 @@ class Game:
         box_x = SCREEN_WIDTH // 2 - box_width // 2
         box_y = 100
 
-        pygame.draw.rect(self.screen, (40, 40, 60), (box_x, box_y, box_width, box_height))
-        pygame.draw.rect(self.screen, (0, 200, 255), (box_x, box_y, box_width, box_height), 3)
+        pygame.draw.rect(surface, (40, 40, 60), (box_x, box_y, box_width, box_height))
+        pygame.draw.rect(surface, (0, 200, 255), (box_x, box_y, box_width, box_height), 3)
 
         # Game mode selection - with touch buttons
-        mode_label = self.font.render("Game Mode:", True, WHITE)
-        self.screen.blit(mode_label, (box_x + 30, box_y + 15))
-
-        # Row 1: Co-op, PvP - as buttons
-        btn_w = 120
-        btn_h = 35
+        mode_label = self._txt("Game Mode:", self.font, WHITE)
+        surface.blit(mode_label, (box_x + 30, box_y + 15))
 
-        # CO-OP button
-        coop_rect = pygame.Rect(box_x + 30, box_y + 50, btn_w, btn_h)
-        coop_color = GREEN if self.online_game_mode == "coop" else GRAY
-        pygame.draw.rect(self.screen, (30, 30, 50), coop_rect)
-        pygame.draw.rect(self.screen, coop_color, coop_rect, 2)
-        coop_text = self.small_font.render("CO-OP", True, coop_color)
-        self.screen.blit(coop_text, (coop_rect.centerx - coop_text.get_width()//2, coop_rect.centery - coop_text.get_height()//2))
-        self.online_coop_btn = coop_rect
-
-        # PVP button
-        pvp_rect = pygame.Rect(box_x + 170, box_y + 50, btn_w, btn_h)
-        pvp_color = RED if self.online_game_mode == "pvp" else GRAY
-        pygame.draw.rect(self.screen, (30, 30, 50), pvp_rect)
-        pygame.draw.rect(self.screen, pvp_color, pvp_rect, 2)
-        pvp_text = self.small_font.render("PVP", True, pvp_color)
-        self.screen.blit(pvp_text, (pvp_rect.centerx - pvp_text.get_width()//2, pvp_rect.centery - pvp_text.get_height()//2))
-        self.online_pvp_btn = pvp_rect
-
-        # 2v2 button
-        btn_2v2_rect = pygame.Rect(box_x + 310, box_y + 50, btn_w, btn_h)
-        color_2v2 = (255, 200, 50) if self.online_game_mode == "2v2" else GRAY
-        pygame.draw.rect(self.screen, (30, 30, 50), btn_2v2_rect)
-        pygame.draw.rect(self.screen, color_2v2, btn_2v2_rect, 2)
-        text_2v2 = self.small_font.render("2v2", True, color_2v2)
-        self.screen.blit(text_2v2, (btn_2v2_rect.centerx - text_2v2.get_width()//2, btn_2v2_rect.centery - text_2v2.get_height()//2))
-        self.online_2v2_btn = btn_2v2_rect
-
-        # 2v1 button
-        btn_2v1_rect = pygame.Rect(box_x + 440, box_y + 50, btn_w - 20, btn_h)
-        color_2v1 = (200, 100, 255) if self.online_game_mode == "2v1" else GRAY
-        pygame.draw.rect(self.screen, (30, 30, 50), btn_2v1_rect)
-        pygame.draw.rect(self.screen, color_2v1, btn_2v1_rect, 2)
-        text_2v1 = self.small_font.render("2v1", True, color_2v1)
-        self.screen.blit(text_2v1, (btn_2v1_rect.centerx - text_2v1.get_width()//2, btn_2v1_rect.centery - text_2v1.get_height()//2))
-        self.online_2v1_btn = btn_2v1_rect
+        # Row 1: Co-op, PvP, 2v2, 2v1 - as buttons (rects laid out in _init_button_rects)
+        selected_mode = self.online_game_mode
+        for mode, _, rect_attr, selected_color in ONLINE_MODE_BUTTONS:
+            selected = mode == selected_mode
+            self._draw_mode_button(surface, getattr(self, rect_attr),
+                                   self._online_mode_surfs[(mode, selected)],
+                                   selected_color if selected else GRAY)
 
         # Separator after mode selection
-        pygame.draw.line(self.screen, GRAY, (box_x + 20, box_y + 95), (box_x + box_width - 20, box_y + 95), 1)
+        pygame.draw.line(surface, GRAY, (box_x + 20, box_y + 95), (box_x + box_width - 20, box_y + 95), 1)
 
         # Difficulty selection (for co-op and 2v2/2v1 modes)
-        if self.online_game_mode in ["coop", "2v2", "2v1"]:
-            diff_label = self.font.render("Difficulty:", True, WHITE)
-            self.screen.blit(diff_label, (box_x + 30, box_y + 105))
+        if self.online_game_mode in ("coop", "2v2", "2v1"):
+            diff_label = self._txt("Difficulty:", self.font, WHITE)
+            surface.blit(diff_label, (box_x + 30, box_y + 105))
 
             # Arrow buttons and difficulty display
             diff_name = self.online_difficulty.upper()
@@ -7423,27 +8205,26 @@ class Game:
             diff_color = diff_colors.get(self.online_difficulty, WHITE)
 
             # Left arrow button
-            left_btn = pygame.Rect(box_x + 200, box_y + 105, 40, 35)
-            pygame.draw.rect(self.screen, (30, 30, 50), left_btn)
-            pygame.draw.rect(self.screen, YELLOW, left_btn, 2)
-            left_arrow = self.font.render("<", True, YELLOW)
-            self.screen.blit(left_arrow, (left_btn.centerx - left_arrow.get_width()//2, left_btn.centery - left_arrow.get_height()//2))
-            self.online_diff_left_btn = left_btn
+            left_btn = self.online_diff_left_btn
+            pygame.draw.rect(surface, (30, 30, 50), left_btn)
+            pygame.draw.rect(surface, YELLOW, left_btn, 2)
+            left_arrow = self._txt("<", self.font, YELLOW)
+            surface.blit(left_arrow, (left_btn.centerx - left_arrow.get_width()//2, left_btn.centery - left_arrow.get_height()//2))
 
             # Difficulty text
             diff_text = self.font.render(diff_name, True, diff_color)
-            self.screen.blit(diff_text, (box_x + 260, box_y + 108))
+            surface.blit(diff_text, (box_x + 260, box_y + 108))
 
             # Right arrow button
             right_btn = pygame.Rect(box_x + 260 + diff_text.get_width() + 15, box_y + 105, 40, 35)
-            pygame.draw.rect(self.screen, (30, 30, 50), right_btn)
-            pygame.draw.rect(self.screen, YELLOW, right_btn, 2)
-            right_arrow = self.font.render(">", True, YELLOW)
-            self.screen.blit(right_arrow, (right_btn.centerx - right_arrow.get_width()//2, right_btn.centery - right_arrow.get_height()//2))
+            pygame.draw.rect(surface, (30, 30, 50), right_btn)
+            pygame.draw.rect(surface, YELLOW, right_btn, 2)
+            right_arrow = self._txt(">", self.font, YELLOW)
+            surface.blit(right_arrow, (right_btn.centerx - right_arrow.get_width()//2, right_btn.centery - right_arrow.get_height()//2))
             self.online_diff_right_btn = right_btn
 
             # Second separator
-            pygame.draw.line(self.screen, GRAY, (box_x + 20, box_y + 150), (box_x + box_width - 20, box_y + 150), 1)
+            pygame.draw.line(surface, GRAY, (box_x + 20, box_y + 150), (box_x + box_width - 20, box_y + 150), 1)
             options_start_y = box_y + 160
         else:
             # PvP mode - no difficulty selector
@@ -7451,78 +8232,84 @@ class Game:
 
         # HOST GAME button
         host_btn = pygame.Rect(box_x + 30, options_start_y, box_width - 60, 55)
-        pygame.draw.rect(self.screen, (20, 60, 20), host_btn)
-        pygame.draw.rect(self.screen, GREEN, host_btn, 2)
-        host_text = self.font.render("HOST GAME", True, GREEN)
-        host_desc = self.small_font.render("Create a room and share code", True, GRAY)
-        self.screen.blit(host_text, (host_btn.centerx - host_text.get_width()//2, host_btn.y + 5))
-        self.screen.blit(host_desc, (host_btn.centerx - host_desc.get_width()//2, host_btn.y + 32))
+        pygame.draw.rect(surface, (20, 60, 20), host_btn)
+        pygame.draw.rect(surface, GREEN, host_btn, 2)
+        host_text = self._txt("HOST GAME", self.font, GREEN)
+        host_desc = self._txt("Create a room and share code", self.small_font, GRAY)
+        surface.blit(host_text, (host_btn.centerx - host_text.get_width()//2, host_btn.y + 5))
+        surface.blit(host_desc, (host_btn.centerx - host_desc.get_width()//2, host_btn.y + 32))
         self.online_host_btn = host_btn
 
         # JOIN GAME button
         join_btn = pygame.Rect(box_x + 30, options_start_y + 65, box_width - 60, 55)
-        pygame.draw.rect(self.screen, (60, 60, 20), join_btn)
-        pygame.draw.rect(self.screen, YELLOW, join_btn, 2)
-        join_text = self.font.render("JOIN GAME", True, YELLOW)
-        join_desc = self.small_font.render("Enter 4-digit room code", True, GRAY)
-        self.screen.blit(join_text, (join_btn.centerx - join_text.get_width()//2, join_btn.y + 5))
-        self.screen.blit(join_desc, (join_btn.centerx - join_desc.get_width()//2, join_btn.y + 32))
+        pygame.draw.rect(surface, (60, 60, 20), join_btn)
+        pygame.draw.rect(surface, YELLOW, join_btn, 2)
+        join_text = self._txt("JOIN GAME", self.font, YELLOW)
+        join_desc = self._txt("Enter 4-digit room code", self.small_font, GRAY)
+        surface.blit(join_text, (join_btn.centerx - join_text.get_width()//2, join_btn.y + 5))
+        surface.blit(join_desc, (join_btn.centerx - join_desc.get_width()//2, join_btn.y + 32))
         self.online_join_btn = join_btn
 
         # Room code input (if joining)
         if self.online_input_active or len(self.online_input_code) > 0:
-            code_label = self.font.render("Room Code:", True, WHITE)
-            self.screen.blit(code_label, (box_x + 30, options_start_y + 135))
+            code_label = self._txt("Room Code:", self.font, WHITE)
+            surface.blit(code_label, (box_x + 30, options_start_y + 135))
 
             # Code input box
             code_box = pygame.Rect(box_x + 200, options_start_y + 130, 150, 40)
-            pygame.draw.rect(self.screen, (60, 60, 80), code_box)
-            pygame.draw.rect(self.screen, YELLOW, code_box, 2)
+            pygame.draw.rect(surface, (60, 60, 80), code_box)
+            pygame.draw.rect(surface, YELLOW, code_box, 2)
 
             code_text = self.big_font.render(self.online_input_code, True, WHITE)
-            self.screen.blit(code_text, (code_box.x + 20, code_box.y + 5))
+            surface.blit(code_text, (code_box.x + 20, code_box.y + 5))
 
             if len(self.online_input_code) == 4:
-                enter_hint = self.small_font.render("Press ENTER to join", True, GREEN)
-                self.screen.blit(enter_hint, (box_x + 200, options_start_y + 175))
+                enter_hint = self._txt("Press ENTER to join", self.small_font, GREEN)
+                surface.blit(enter_hint, (box_x + 200, options_start_y + 175))
 
         # Message
         if self.online_message:
             msg = self.font.render(self.online_message, True, ORANGE)
-            self.screen.blit(msg, (SCREEN_WIDTH // 2 - msg.get_width() // 2, options_start_y + 210))
+            surface.blit(msg, (SCREEN_WIDTH // 2 - msg.get_width() // 2, options_start_y + 210))
 
         # Back button
         back_btn = pygame.Rect(SCREEN_WIDTH // 2 - 100, options_start_y + 250, 200, 40)
-        pygame.draw.rect(self.screen, (60, 20, 20), back_btn)
-        pygame.draw.rect(self.screen, RED, back_btn, 2)
-        back_text = self.small_font.render("Back to Menu", True, RED)
-        self.screen.blit(back_text, (back_btn.centerx - back_text.get_width()//2, back_btn.centery - back_text.get_height()//2))
+        pygame.draw.rect(surface, (60, 20, 20), back_btn)
+        pygame.draw.rect(surface, RED, back_btn, 2)
+        back_text = self._txt("Back to Menu", self.small_font, RED)
+        surface.blit(back_text, (back_btn.centerx - back_text.get_width()//2, back_btn.centery - back_text.get_height()//2))
         self.online_back_btn = back_btn
 
         # Version
-        version = self.small_font.render("v3.0", True, WHITE)
-        self.screen.blit(version, (10, 10))
+        version = self._txt("v3.0", self.small_font, WHITE)
+        surface.blit(version, (10, 10))
 
     def draw_waiting_screen(self):
-        # Background
-        self.screen.fill((20, 20, 40))
+        # Only the status line and the animated dots change, a few times per second
+        dots = "." * ((pygame.time.get_ticks() // 500) % 4) if self.online_status == "connecting" else ""
+        state_key = ("waiting", self.is_host, self.online_room_code, self.online_message, self.online_status, dots)
+        if self._screen_unchanged(state_key):
+            return []
+
+        # Background and cancel hint are pre-rendered
+        self.screen.blit(self._waiting_bg, (0, 0))
 
         # Title
         if self.is_host:
-            title = self.big_font.render("HOSTING GAME", True, GREEN)
+            title = self._txt("HOSTING GAME", self.big_font, GREEN)
         else:
-            title = self.big_font.render("JOINING GAME", True, YELLOW)
+            title = self._txt("JOINING GAME", self.big_font, YELLOW)
         self.screen.blit(title, (SCREEN_WIDTH // 2 - title.get_width() // 2, 120))
 
         # Room code display (for host)
         if self.is_host and self.online_room_code:
-            code_label = self.font.render("Room Code:", True, WHITE)
+            code_label = self._txt("Room Code:", self.font, WHITE)
             self.screen.blit(code_label, (SCREEN_WIDTH // 2 - code_label.get_width() // 2, 200))
 
             code_text = self.big_font.render(self.online_room_code, True, (0, 255, 200))
             self.screen.blit(code_text, (SCREEN_WIDTH // 2 - code_text.get_width() // 2, 240))
 
-            share_text = self.small_font.render("Share this code with your friend!", True, GRAY)
+            share_text = self._txt("Share this code with your friend!", self.small_font, GRAY)
             self.screen.blit(share_text, (SCREEN_WIDTH // 2 - share_text.get_width() // 2, 300))
 
         # Status message
@@ -7532,40 +8319,27 @@ class Game:
         # Connection status indicator
         if self.online_status == "connecting":
             # Animated dots
-            dots = "." * ((pygame.time.get_ticks() // 500) % 4)
-            waiting = self.font.render(f"Waiting{dots}", True, YELLOW)
+            waiting = self._txt(f"Waiting{dots}", self.font, YELLOW)
             self.screen.blit(waiting, (SCREEN_WIDTH // 2 - waiting.get_width() // 2, 420))
         elif self.online_status == "connected":
-            connected = self.font.render("Connected! Starting game...", True, GREEN)
+            connected = self._txt("Connected! Starting game...", self.font, GREEN)
             self.screen.blit(connected, (SCREEN_WIDTH // 2 - connected.get_width() // 2, 420))
-
-        # Cancel option
-        cancel_text = self.small_font.render("[ESC] Cancel", True, RED)
-        self.screen.blit(cancel_text, (SCREEN_WIDTH // 2 - cancel_text.get_width() // 2, 500))
+        return None
 
     def draw_shop(self):
         # Darken screen
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-        overlay.fill(BLACK)
-        overlay.set_alpha(200)
-        self.screen.blit(overlay, (0, 0))
+        self.screen.blit(self._dim_overlay, (0, 0))
 
-        # Shop box - 2 columns layout
+        # Shop box - 2 columns layout (box, title and footer are pre-rendered)
         box_width = 1100
         box_height = 650
         box_x = SCREEN_WIDTH // 2 - box_width // 2
         box_y = SCREEN_HEIGHT // 2 - box_height // 2
-
-        pygame.draw.rect(self.screen, DARK_GRAY, (box_x, box_y, box_width, box_height))
-        pygame.draw.rect(self.screen, YELLOW, (box_x, box_y, box_width, box_height), 4)
-
-        # Title
-        title = self.big_font.render("SHOP", True, YELLOW)
-        self.screen.blit(title, (SCREEN_WIDTH // 2 - title.get_width() // 2, box_y + 10))
+        self.screen.blit(self._shop_bg, (box_x, box_y))
 
         # Coins
-        coins = self.font.render(f"Your Coins: {self.player.coins}", True, GREEN)
-        self.screen.blit(coins, (SCREEN_WIDTH // 2 - coins.get_width() // 2, box_y + 50))
+        self.screen.blit(*self._cached_label_at("shop_coins", (self.player.coins,), "Your Coins: %d",
+                                                self.font, GREEN, SCREEN_WIDTH // 2, box_y + 50))
 
         # Column settings
         col1_x = box_x + 25
@@ -7573,79 +8347,82 @@ class Game:
         item_height = 48
         start_y = box_y + 90
 
+        # Item rows are collected and drawn with one blits() call
+        blit_list = []
+
         # Left column items
         item_y = start_y
 
         # Item 1: Shotgun
         if not self.player.has_shotgun:
             color = WHITE if self.player.coins >= 10 else GRAY
-            text = self.small_font.render("[1] Shotgun - 10c", True, color)
-            desc = self.small_font.render("Spread shot | 8 shells | High damage", True, ORANGE)
+            text = self._txt("[1] Shotgun - 10c", self.small_font, color)
+            desc = self._txt("Spread shot | 8 shells | High damage", self.small_font, ORANGE)
         else:
-            text = self.small_font.render("[1] Shotgun - OWNED", True, GREEN)
-            desc = self.small_font.render("Unlocked!", True, GREEN)
-        self.screen.blit(text, (col1_x, item_y))
-        self.screen.blit(desc, (col1_x, item_y + 20))
+            text = self._txt("[1] Shotgun - OWNED", self.small_font, GREEN)
+            desc = self._txt("Unlocked!", self.small_font, GREEN)
+        blit_list.append((text, (col1_x, item_y)))
+        blit_list.append((desc, (col1_x, item_y + 20)))
 
         # Item 2: RPG
         item_y += item_height
         if not self.player.has_rpg:
             color = WHITE if self.player.coins >= 50 else GRAY
-            text = self.small_font.render("[2] RPG - 50c", True, color)
-            desc = self.small_font.render("Explosive | 200 Dmg | 8 rockets", True, RED)
+            text = self._txt("[2] RPG - 50c", self.small_font, color)
+            desc = self._txt("Explosive | 200 Dmg | 8 rockets", self.small_font, RED)
         else:
-            text = self.small_font.render("[2] RPG - OWNED", True, GREEN)
-            desc = self.small_font.render("Unlocked!", True, GREEN)
-        self.screen.blit(text, (col1_x, item_y))
-        self.screen.blit(desc, (col1_x, item_y + 20))
+            text = self._txt("[2] RPG - OWNED", self.small_font, GREEN)
+            desc = self._txt("Unlocked!", self.small_font, GREEN)
+        blit_list.append((text, (col1_x, item_y)))
+        blit_list.append((desc, (col1_x, item_y + 20)))
 
         # Item 3: Medkit
         item_y += item_height
         if self.player.medkit_charges > 0:
             text = self.small_font.render(f"[3] First Aid Kit - {self.player.medkit_charges} uses", True, GREEN)
-            desc = self.small_font.render("Press H to heal to full", True, GREEN)
+            desc = self._txt("Press H to heal to full", self.small_font, GREEN)
         else:
             color = WHITE if self.player.coins >= 90 else GRAY
-            text = self.small_font.render("[3] First Aid Kit - 90c", True, color)
-            desc = self.small_font.render("3 uses | Full heal | Press H", True, (0, 200, 0))
-        self.screen.blit(text, (col1_x, item_y))
-        self.screen.blit(desc, (col1_x, item_y + 20))
+            text = self._txt("[3] First Aid Kit - 90c", self.small_font, color)
+            desc = self._txt("3 uses | Full heal | Press H", self.small_font, (0, 200, 0))
+        blit_list.append((text, (col1_x, item_y)))
+        blit_list.append((desc, (col1_x, item_y + 20)))
 
         # Item 4: Sniper
         item_y += item_height
         if not self.player.has_sniper:
             color = WHITE if self.player.coins >= 150 else GRAY
-            text = self.small_font.render("[4] Sniper - 150c", True, color)
-            desc = self.small_font.render("180 Dmg | Headshot bonus | 10 rounds", True, (0, 255, 255))
+            text = self._txt("[4] Sniper - 150c", self.small_font, color)
+            desc = self._txt("180 Dmg | Headshot bonus | 10 rounds", self.small_font, (0, 255, 255))
         else:
-            text = self.small_font.render("[4] Sniper - OWNED", True, GREEN)
-            desc = self.small_font.render("Unlocked!", True, GREEN)
-        self.screen.blit(text, (col1_x, item_y))
-        self.screen.blit(desc, (col1_x, item_y + 20))
+            text = self._txt("[4] Sniper - OWNED", self.small_font, GREEN)
+            desc = self._txt("Unlocked!", self.small_font, GREEN)
+        blit_list.append((text, (col1_x, item_y)))
+        blit_list.append((desc, (col1_x, item_y + 20)))
 
         # Item 5: Dual Pistols
         item_y += item_height
         if not self.player.has_dual_pistols:
             color = WHITE if self.player.coins >= 60 else GRAY
-            text = self.small_font.render("[5] Dual Pistols - 60c", True, color)
-            desc = self.small_font.render("35 Dmg x2 | Fast fire | 14 rounds", True, (255, 215, 0))
+            text = self._txt("[5] Dual Pistols - 60c", self.small_font, color)
+            desc = self._txt("35 Dmg x2 | Fast fire | 14 rounds", self.small_font, (255, 215, 0))
         else:
-            text = self.small_font.render("[5] Dual Pistols - OWNED", True, GREEN)
-            desc = self.small_font.render("Unlocked!", True, GREEN)
-        self.screen.blit(text, (col1_x, item_y))
-        self.screen.blit(desc, (col1_x, item_y + 20))
+            text = self._txt("[5] Dual Pistols - OWNED", self.small_font, GREEN)
+            desc = self._txt("Unlocked!", self.small_font, GREEN)
+        blit_list.append((text, (col1_x, item_y)))
+        blit_list.append((desc, (col1_x, item_y + 20)))
 
         # Item 6: Throwing Knives
         item_y += item_height
         if not self.player.has_throwing_knives:
             color = WHITE if self.player.coins >= 70 else GRAY
-            text = self.small_font.render("[6] Throwing Knives - 70c", True, color)
-            desc = self.small_font.render("50 Dmg | Silent | 16 knives", True, (192, 192, 192))
+            text = self._txt("[6] Throwing Knives - 70c", self.small_font, color)
+            desc = self._txt("50 Dmg | Silent | 16 knives", self.small_font, (192, 192, 192))
         else:
-            text = self.small_font.render("[6] Throwing Knives - OWNED", True, GREEN)
-            desc = self.small_font.render("Unlocked!", True, GREEN)
-        self.screen.blit(text, (col1_x, item_y))
-        self.screen.blit(desc, (col1_x, item_y + 20))
+            text = self._txt("[6] Throwing Knives - OWNED", self.small_font, GREEN)
+            desc = self._txt("Unlocked!", self.small_font, GREEN)
+        blit_list.append((text, (col1_x, item_y)))
+        blit_list.append((desc, (col1_x, item_y + 20)))
 
         # Right column items
         item_y = start_y
@@ -7653,89 +8430,97 @@ class Game:
         # Item 7: Flamethrower
         if not self.player.has_flamethrower:
             color = WHITE if self.player.coins >= 80 else GRAY
-            text = self.small_font.render("[7] Flamethrower - 80c", True, color)
-            desc = self.small_font.render("Continuous fire | 100 fuel", True, (255, 100, 0))
+            text = self._txt("[7] Flamethrower - 80c", self.small_font, color)
+            desc = self._txt("Continuous fire | 100 fuel", self.small_font, (255, 100, 0))
         else:
-            text = self.small_font.render("[7] Flamethrower - OWNED", True, GREEN)
-            desc = self.small_font.render("Unlocked!", True, GREEN)
-        self.screen.blit(text, (col2_x, item_y))
-        self.screen.blit(desc, (col2_x, item_y + 20))
+            text = self._txt("[7] Flamethrower - OWNED", self.small_font, GREEN)
+            desc = self._txt("Unlocked!", self.small_font, GREEN)
+        blit_list.append((text, (col2_x, item_y)))
+        blit_list.append((desc, (col2_x, item_y + 20)))
 
         # Item 8: Crossbow
         item_y += item_height
         if not self.player.has_crossbow:
             color = WHITE if self.player.coins >= 100 else GRAY
-            text = self.small_font.render("[8] Crossbow - 100c", True, color)
-            desc = self.small_font.render("90 Dmg | Slow | 12 bolts", True, (139, 69, 19))
+            text = self._txt("[8] Crossbow - 100c", self.small_font, color)
+            desc = self._txt("90 Dmg | Slow | 12 bolts", self.small_font, (139, 69, 19))
         else:
-            text = self.small_font.render("[8] Crossbow - OWNED", True, GREEN)
-            desc = self.small_font.render("Unlocked!", True, GREEN)
-        self.screen.blit(text, (col2_x, item_y))
-        self.screen.blit(desc, (col2_x, item_y + 20))
+            text = self._txt("[8] Crossbow - OWNED", self.small_font, GREEN)
+            desc = self._txt("Unlocked!", self.small_font, GREEN)
+        blit_list.append((text, (col2_x, item_y)))
+        blit_list.append((desc, (col2_x, item_y + 20)))
 
         # Item 9: Freeze Ray
         item_y += item_height
         if not self.player.has_freeze:
             color = WHITE if self.player.coins >= 110 else GRAY
-            text = self.small_font.render("[9] Freeze Ray - 110c", True, color)
-            desc = self.small_font.render("Slows enemies | 40 shots", True, (150, 220, 255))
+            text = self._txt("[9] Freeze Ray - 110c", self.small_font, color)
+            desc = self._txt("Slows enemies | 40 shots", self.small_font, (150, 220, 255))
         else:
-            text = self.small_font.render("[9] Freeze Ray - OWNED", True, GREEN)
-            desc = self.small_font.render("Unlocked!", True, GREEN)
-        self.screen.blit(text, (col2_x, item_y))
-        self.screen.blit(desc, (col2_x, item_y + 20))
+            text = self._txt("[9] Freeze Ray - OWNED", self.small_font, GREEN)
+            desc = self._txt("Unlocked!", self.small_font, GREEN)
+        blit_list.append((text, (col2_x, item_y)))
+        blit_list.append((desc, (col2_x, item_y + 20)))
 
         # Item 0: Laser Gun
         item_y += item_height
         if not self.player.has_laser:
             color = WHITE if self.player.coins >= 120 else GRAY
-            text = self.small_font.render("[0] Laser Gun - 120c", True, color)
-            desc = self.small_font.render("Fast beam | 50 charge", True, (0, 255, 0))
+            text = self._txt("[0] Laser Gun - 120c", self.small_font, color)
+            desc = self._txt("Fast beam | 50 charge", self.small_font, (0, 255, 0))
         else:
-            text = self.small_font.render("[0] Laser Gun - OWNED", True, GREEN)
-            desc = self.small_font.render("Unlocked!", True, GREEN)
-        self.screen.blit(text, (col2_x, item_y))
-        self.screen.blit(desc, (col2_x, item_y + 20))
+            text = self._txt("[0] Laser Gun - OWNED", self.small_font, GREEN)
+            desc = self._txt("Unlocked!", self.small_font, GREEN)
+        blit_list.append((text, (col2_x, item_y)))
+        blit_list.append((desc, (col2_x, item_y + 20)))
 
         # Item E: Electric Gun
         item_y += item_height
         if not self.player.has_electric:
             color = WHITE if self.player.coins >= 140 else GRAY
-            text = self.small_font.render("[E] Electric Gun - 140c", True, color)
-            desc = self.small_font.render("Chain lightning | 30 Dmg | 30 shots", True, (100, 150, 255))
+            text = self._txt("[E] Electric Gun - 140c", self.small_font, color)
+            desc = self._txt("Chain lightning | 30 Dmg | 30 shots", self.small_font, (100, 150, 255))
         else:
-            text = self.small_font.render("[E] Electric Gun - OWNED", True, GREEN)
-            desc = self.small_font.render("Unlocked!", True, GREEN)
-        self.screen.blit(text, (col2_x, item_y))
-        self.screen.blit(desc, (col2_x, item_y + 20))
+            text = self._txt("[E] Electric Gun - OWNED", self.small_font, GREEN)
+            desc = self._txt("Unlocked!", self.small_font, GREEN)
+        blit_list.append((text, (col2_x, item_y)))
+        blit_list.append((desc, (col2_x, item_y + 20)))
 
         # Item M: Minigun
         item_y += item_height
         if not self.player.has_minigun:
             color = WHITE if self.player.coins >= 200 else GRAY
-            text = self.small_font.render("[M] Minigun - 200c", True, color)
-            desc = self.small_font.render("Very fast fire | 200 rounds", True, (180, 180, 180))
+            text = self._txt("[M] Minigun - 200c", self.small_font, color)
+            desc = self._txt("Very fast fire | 200 rounds", self.small_font, (180, 180, 180))
         else:
-            text = self.small_font.render("[M] Minigun - OWNED", True, GREEN)
-            desc = self.small_font.render("Unlocked!", True, GREEN)
-        self.screen.blit(text, (col2_x, item_y))
-        self.screen.blit(desc, (col2_x, item_y + 20))
-
-        # Avatar shop link
-        avatar_text = self.font.render("[A] Avatar Shop", True, (150, 200, 255))
-        self.screen.blit(avatar_text, (box_x + 30, box_y + box_height - 45))
-
-        # Close option
-        close_text = self.font.render("[ESC] Close Shop", True, RED)
-        self.screen.blit(close_text, (SCREEN_WIDTH // 2 - close_text.get_width() // 2 + 100, box_y + box_height - 45))
+            text = self._txt("[M] Minigun - OWNED", self.small_font, GREEN)
+            desc = self._txt("Unlocked!", self.small_font, GREEN)
+        blit_list.append((text, (col2_x, item_y)))
+        blit_list.append((desc, (col2_x, item_y + 20)))
+
+        self.screen.blits(blit_list, False)
+
+    def _mini_avatar(self, avatar_type):
+        """Static carousel preview of an avatar type, rendered once"""
+        surf = self._mini_avatar_cache.get(avatar_type)
+        if surf is None:
+            mini_avatar = Avatar(avatar_type)
+            mini_avatar.head_radius = 5
+            mini_avatar.torso_width = 9
+            mini_avatar.torso_height = 8
+            mini_avatar.arm_length = 8
+            mini_avatar.leg_length = 7
+            mini_avatar.hand_radius = 3
+            w, h = MINI_AVATAR_SIZE
+            surf = pygame.Surface((w, h), pygame.SRCALPHA).convert_alpha()
+            mini_avatar.draw(surf, w // 2, h // 2, 0, anim_timer=0)
+            self._mini_avatar_cache[avatar_type] = surf
+        return surf
 
     def draw_avatar_shop(self):
         """Draw the avatar shop screen"""
         # Darken screen
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-        overlay.fill(BLACK)
-        overlay.set_alpha(200)
-        self.screen.blit(overlay, (0, 0))
+        self.screen.blit(self._dim_overlay, (0, 0))
 
         # Shop box
         box_width = 900
@@ -7743,16 +8528,12 @@ class Game:
         box_x = SCREEN_WIDTH // 2 - box_width // 2
         box_y = SCREEN_HEIGHT // 2 - box_height // 2
 
-        pygame.draw.rect(self.screen, DARK_GRAY, (box_x, box_y, box_width, box_height))
-        pygame.draw.rect(self.screen, (150, 200, 255), (box_x, box_y, box_width, box_height), 4)
-
-        # Title
-        title = self.big_font.render("AVATAR SHOP", True, (150, 200, 255))
-        self.screen.blit(title, (SCREEN_WIDTH // 2 - title.get_width() // 2, box_y + 15))
+        # Box and title are pre-rendered
+        self.screen.blit(self._avatar_shop_bg, (box_x, box_y))
 
         # Coins
-        coins = self.font.render(f"Your Coins: {self.player.coins}", True, GREEN)
-        self.screen.blit(coins, (SCREEN_WIDTH // 2 - coins.get_width() // 2, box_y + 60))
+        self.screen.blit(*self._cached_label_at("avatar_coins", (self.player.coins,), "Your Coins: %d",
+                                                self.font, GREEN, SCREEN_WIDTH // 2, box_y + 60))
 
         # Get avatar list
         avatar_keys = list(AVATAR_TYPES.keys())
@@ -7776,29 +8557,30 @@ class Game:
                                          "Rifle", is_reloading=False, reload_phase=0)
 
         # Avatar name and info
-        name_text = self.big_font.render(selected_data["name"], True, WHITE)
-        self.screen.blit(name_text, (SCREEN_WIDTH // 2 - name_text.get_width() // 2, preview_y + 60))
+        name_text, name_x = self._txt_centered(selected_data["name"], self.big_font, WHITE)
+        self.screen.blit(name_text, (name_x, preview_y + 60))
 
         # Description
-        desc_text = self.small_font.render(selected_data["description"], True, (200, 200, 200))
-        self.screen.blit(desc_text, (SCREEN_WIDTH // 2 - desc_text.get_width() // 2, preview_y + 100))
+        desc_text, desc_x = self._txt_centered(selected_data["description"], self.small_font, (200, 200, 200))
+        self.screen.blit(desc_text, (desc_x, preview_y + 100))
 
         # Price / Owned status
         if selected_type in self.player.owned_avatars:
             if self.player.avatar_type == selected_type:
-                status_text = self.font.render("EQUIPPED", True, GREEN)
+                status_text, status_x = self._txt_centered("EQUIPPED", self.font, GREEN)
             else:
-                status_text = self.font.render("OWNED - Press ENTER to Equip", True, (100, 255, 100))
+                status_text, status_x = self._txt_centered("OWNED - Press ENTER to Equip", self.font, (100, 255, 100))
+            self.screen.blit(status_text, (status_x, preview_y + 135))
         else:
             price = selected_data["price"]
             color = GREEN if self.player.coins >= price else RED
-            status_text = self.font.render(f"Price: {price} coins - Press ENTER to Buy", True, color)
-        self.screen.blit(status_text, (SCREEN_WIDTH // 2 - status_text.get_width() // 2, preview_y + 135))
+            self.screen.blit(*self._cached_label_at("avatar_price", (price,), "Price: %d coins - Press ENTER to Buy",
+                                                    self.font, color, SCREEN_WIDTH // 2, preview_y + 135))
 
         # Navigation arrows and avatar carousel
         arrow_y = preview_y
-        left_arrow = self.big_font.render("<", True, WHITE)
-        right_arrow = self.big_font.render(">", True, WHITE)
+        left_arrow = self._txt("<", self.big_font, WHITE)
+        right_arrow = self._txt(">", self.big_font, WHITE)
         self.screen.blit(left_arrow, (box_x + 50, arrow_y - 20))
         self.screen.blit(right_arrow, (box_x + box_width - 80, arrow_y - 20))
 
@@ -7812,184 +8594,184 @@ class Game:
             mini_x = preview_x + offset * 120
             mini_y = preview_y
 
-            # Draw mini avatar (smaller scale indicated by position)
-            mini_avatar = Avatar(mini_type)
-            mini_avatar.head_radius = 5
-            mini_avatar.torso_width = 9
-            mini_avatar.torso_height = 8
-            mini_avatar.arm_length = 8
-            mini_avatar.leg_length = 7
-            mini_avatar.hand_radius = 3
-
-            # Dim non-selected avatars
+            # Draw mini avatar (smaller scale indicated by position), pre-rendered per type
             if offset != 0:
-                mini_avatar.draw(self.screen, mini_x, mini_y, 0, anim_timer=0)
+                mini_surf = self._mini_avatar(mini_type)
+                self.screen.blit(mini_surf, (mini_x - MINI_AVATAR_SIZE[0] // 2,
+                                             mini_y - MINI_AVATAR_SIZE[1] // 2))
 
                 # Show owned indicator
                 if mini_type in self.player.owned_avatars:
-                    owned_dot = pygame.Surface((10, 10), pygame.SRCALPHA)
-                    pygame.draw.circle(owned_dot, GREEN, (5, 5), 5)
-                    self.screen.blit(owned_dot, (int(mini_x - 5), int(mini_y + 25)))
+                    self.screen.blit(self._owned_dot, (int(mini_x - 5), int(mini_y + 25)))
 
         # Instructions
-        nav_text = self.small_font.render("LEFT/RIGHT: Browse | ENTER: Buy/Equip | ESC: Back to Weapons", True, (180, 180, 180))
-        self.screen.blit(nav_text, (SCREEN_WIDTH // 2 - nav_text.get_width() // 2, box_y + box_height - 35))
+        nav_text, nav_x = self._txt_centered("LEFT/RIGHT: Browse | ENTER: Buy/Equip | ESC: Back to Weapons",
+                                             self.small_font, (180, 180, 180))
+        self.screen.blit(nav_text, (nav_x, box_y + box_height - 35))
 
         # Show avatar index
-        index_text = self.small_font.render(f"{self.selected_avatar_index + 1} / {len(avatar_keys)}", True, (150, 150, 150))
-        self.screen.blit(index_text, (SCREEN_WIDTH // 2 - index_text.get_width() // 2, box_y + box_height - 60))
+        self.screen.blit(*self._cached_label_at("avatar_index", (self.selected_avatar_index + 1, len(avatar_keys)), "%d / %d",
+                                                self.small_font, (150, 150, 150), SCREEN_WIDTH // 2, box_y + box_height - 60))
 
     def draw(self):
+        # Static screens return [] when nothing changed since the last frame, None for a full repaint
+        render = self._draw_dispatch.get(self.state)
+        dirty = render() if render is not None else None
+
+        # Gameplay repaints the whole screen (world + HUD + minimap) and flips;
+        # unchanged menu screens present nothing
+        self.present(dirty is None)
+
+    def _draw_loading(self):
+        # Simple loading screen to prevent freeze
+        self._shown_key = None
+        self.screen.fill((25, 25, 35))
+        loading_text, loading_x = self._txt_centered("LOADING...", self.big_font, (200, 200, 200))
+        self.screen.blit(loading_text, (loading_x, SCREEN_HEIGHT // 2 - 30))
+
+    def _draw_gameplay(self):
+        """World, HUD and the overlay screens drawn on top of it (gameover, shops)"""
+        # Full rendering
+        self._shown_key = None
+        if self.split_screen and self.player2:
+            # Split-screen rendering for local multiplayer
+            half_width = SCREEN_WIDTH // 2
 
-        if self.state == "login":
-            self.draw_login_screen()
-
-        elif self.state == "menu":
-            self.draw_menu()
-
-        elif self.state == "online_menu":
-            self.draw_online_menu()
-
-        elif self.state == "waiting":
-            self.draw_waiting_screen()
-
-        elif self.state == "loading":
-            # Simple loading screen to prevent freeze
-            self.screen.fill((25, 25, 35))
-            loading_text = self.big_font.render("LOADING...", True, (200, 200, 200))
-            self.screen.blit(loading_text, (SCREEN_WIDTH // 2 - loading_text.get_width() // 2, SCREEN_HEIGHT // 2 - 30))
-            pygame.display.flip()
-            return  # Skip rest of draw while loading
-
-        elif self.state == "playing" or self.state == "gameover" or self.state == "shop" or self.state == "avatar_shop":
-            # Full rendering
-            if self.split_screen and self.player2:
-                # Split-screen rendering for local multiplayer
-                half_width = SCREEN_WIDTH // 2
-
-                # Create surfaces for each player's view
-                surface1 = pygame.Surface((half_width, SCREEN_HEIGHT))
-                surface2 = pygame.Surface((half_width, SCREEN_HEIGHT))
-
-                # Draw world from player 1's perspective
-                self.draw_world_to_surface(surface1, self.camera)
-                self.draw_split_screen_hud(surface1, self.player, True, half_width)
-
-                # Draw world from player 2's perspective
-                self.draw_world_to_surface(surface2, self.camera2)
-                self.draw_split_screen_hud(surface2, self.player2, False, half_width)
-
-                # Blit both surfaces to screen
-                self.screen.blit(surface1, (0, 0))
-                self.screen.blit(surface2, (half_width, 0))
-
-                # Draw divider line
-                pygame.draw.line(self.screen, WHITE, (half_width, 0), (half_width, SCREEN_HEIGHT), 4)
-
-                # Draw score/kills in center bottom
-                score_text = self.small_font.render(f"Score: {self.score} | Kills: {self.kills}", True, YELLOW)
-                self.screen.blit(score_text, (SCREEN_WIDTH // 2 - score_text.get_width() // 2, SCREEN_HEIGHT - 30))
-
-                # Draw robots remaining
-                robots_text = self.small_font.render(f"Robots: {len(self.robots)}", True, ORANGE)
-                self.screen.blit(robots_text, (SCREEN_WIDTH // 2 - robots_text.get_width() // 2, SCREEN_HEIGHT - 55))
-            else:
-                # Standard single-screen rendering
-                self.draw_background()
-
-                # Draw obstacles
-                for obs in self.obstacles:
-                    obs.draw(self.screen, self.camera)
-
-                # Draw pickups - DISABLED
-                # for pickup in self.pickups:
-                #     pickup.draw(self.screen, self.camera)
-
-                # Draw bullets
-                for bullet in self.bullets:
-                    bullet.draw(self.screen, self.camera)
-
-                # Draw grenades
-                for grenade in self.grenades:
-                    grenade.draw(self.screen, self.camera)
-
-                # Draw smoke grenades
-                for smoke in self.smoke_grenades:
-                    smoke.draw(self.screen, self.camera)
-
-                # Draw smoke clouds
-                for cloud in self.smoke_clouds:
-                    cloud.draw(self.screen, self.camera)
-
-                # Draw explosions
-                for explosion in self.explosions:
-                    explosion.draw(self.screen, self.camera)
-
-                # Draw robots - set sniper target visibility based on player's current weapon
-                player1_has_sniper = self.player.weapon["name"] == "Sniper"
-                player2_has_sniper = self.player2 and self.player2.weapon["name"] == "Sniper"
-                has_sniper = player1_has_sniper or player2_has_sniper
-                for robot in self.robots:
-                    robot.show_sniper_target = has_sniper
-                    robot.draw(self.screen, self.camera)
-
-                # Draw boss
-                if self.boss:
-                    self.boss.show_sniper_target = has_sniper
-                    self.boss.draw(self.screen, self.camera)
-
-                # Draw shell casings (on ground, behind player)
-                for casing in self.shell_casings:
-                    casing.draw(self.screen, self.camera)
-
-                # Draw player
-                self.player.draw(self.screen, self.camera)
-
-                # Draw Player 2 (in multiplayer modes)
-                if self.player2 and self.player2.health > 0:
-                    self.player2.draw(self.screen, self.camera)
-
-                # Draw muzzle flashes (in front of player)
-                for flash in self.muzzle_flashes:
-                    flash.draw(self.screen, self.camera)
-
-                # Draw healing effects
-                for effect in self.healing_effects:
-                    effect.draw(self.screen, self.camera)
+            # Reuse preallocated surfaces for each player's view
+            surface1, surface2 = self._split_surfaces()
 
-                # Draw HUD
-                self.draw_hud()
+            # Draw world from player 1's perspective
+            self.draw_world_to_surface(surface1, self.camera)
+            self.draw_split_screen_hud(surface1, self.player, True, half_width)
 
-                # Draw minimap
-                self.draw_minimap()
+            # Draw world from player 2's perspective
+            self.draw_world_to_surface(surface2, self.camera2)
+            self.draw_split_screen_hud(surface2, self.player2, False, half_width)
 
-            # Draw mobile controls
-            if self.mobile_controls and self.state == "playing":
-                self.joystick.draw(self.screen)
-                self.aim_joystick.draw(self.screen)
-                self.shoot_btn.draw(self.screen)
-                self.reload_btn.draw(self.screen)
-                self.switch_btn.draw(self.screen)
-                self.medkit_btn.draw(self.screen)
+            # Blit both views and the divider line in one call
+            self.screen.blits(((surface1, (0, 0)), (surface2, (half_width, 0)),
+                               (self._split_divider, (half_width - 1, 0))), False)
 
-            if self.state == "gameover":
-                self.draw_gameover()
-            elif self.state == "shop":
-                self.draw_shop()
-            elif self.state == "avatar_shop":
-                self.draw_avatar_shop()
+            # Draw score/kills in center bottom
+            self.screen.blit(*self._cached_label_at("split_score", (self.score, self.kills), "Score: %d | Kills: %d",
+                                                    self.small_font, YELLOW, SCREEN_WIDTH // 2, SCREEN_HEIGHT - 30))
 
-        pygame.display.flip()
+            # Draw robots remaining
+            self.screen.blit(*self._cached_label_at("split_robots", (len(self.robots),), "Robots: %d",
+                                                    self.small_font, ORANGE, SCREEN_WIDTH // 2, SCREEN_HEIGHT - 55))
+        else:
+            # Standard single-screen rendering
+            self.draw_background()
+
+            # Draw obstacles
+            Obstacle.draw_batch(self.screen, self.camera, self._visible_obstacles(self.camera))
+
+            # Draw pickups - DISABLED
+            # for pickup in self.pickups:
+            #     pickup.draw(self.screen, self.camera)
+
+            # Draw bullets
+            for bullet in self._on_screen(self.bullets, self.camera, 20):
+                bullet.draw(self.screen, self.camera)
+
+            # Draw grenades
+            for grenade in self.grenades:
+                grenade.draw(self.screen, self.camera)
+
+            # Draw smoke grenades
+            for smoke in self.smoke_grenades:
+                smoke.draw(self.screen, self.camera)
+
+            # Draw smoke clouds
+            for cloud in self.smoke_clouds:
+                cloud.draw(self.screen, self.camera)
+
+            # Draw explosions
+            for explosion in self.explosions:
+                explosion.draw(self.screen, self.camera)
+
+            # Draw robots - show sniper target dots when a player has the sniper equipped
+            player1_has_sniper = self.player.weapon["name"] == "Sniper"
+            player2_has_sniper = self.player2 and self.player2.weapon["name"] == "Sniper"
+            has_sniper = player1_has_sniper or player2_has_sniper
+            for robot in self._on_screen(self.robots, self.camera, 50):
+                robot.draw(self.screen, self.camera, has_sniper)
+
+            # Draw boss
+            if self.boss:
+                self.boss.draw(self.screen, self.camera, has_sniper)
+
+            # Draw shell casings (on ground, behind player)
+            ShellCasing.draw_batch(self.screen, self.camera, self.shell_casings)
+
+            # Draw player
+            self.player.draw(self.screen, self.camera)
+
+            # Draw Player 2 (in multiplayer modes)
+            if self.player2 and self.player2.health > 0:
+                self.player2.draw(self.screen, self.camera)
+
+            # Draw muzzle flashes (in front of player)
+            for flash in self.muzzle_flashes:
+                flash.draw(self.screen, self.camera)
+
+            # Draw healing effects
+            for effect in self.healing_effects:
+                effect.draw(self.screen, self.camera)
+
+            # Draw HUD
+            self.draw_hud()
+
+            # Draw minimap
+            self.draw_minimap()
+
+        # Draw mobile controls
+        if self.mobile_controls and self.state == "playing":
+            self.joystick.draw(self.screen)
+            self.aim_joystick.draw(self.screen)
+            self.shoot_btn.draw(self.screen)
+            self.reload_btn.draw(self.screen)
+            self.switch_btn.draw(self.screen)
+            self.medkit_btn.draw(self.screen)
+
+        overlay = self._overlay_dispatch.get(self.state)
+        if overlay is not None:
+            overlay()
+
+    def present(self, changed=True):
+        """Show the frame - a full flip, or nothing when the screen did not change"""
+        if changed:
+            pygame.display.flip()
 
     async def run(self):
         running = True
+        last_state = self.state
         while running:
+            frame_start = pygame.time.get_ticks()
             running = self.handle_events()
+            if not pygame.display.get_active():
+                # Minimized or hidden: the frame-based simulation is paused, only events
+                # are serviced, at a lower rate. The tab may be closed from here, so
+                # write any coalesced coin save now
+                flush_save(force=True)
+                self._shown_key = None  # Repaint static screens once visible again
+                await asyncio.sleep(HIDDEN_FRAME_MS / 1000)
+                continue
             self.update()
+            # Game over, leaving a round or entering the shop: don't leave coins unsaved
+            flush_save(force=self.state != last_state)
+            last_state = self.state
             self.draw()
-            self.clock.tick(60)
-            await asyncio.sleep(0)  # Required for Pygbag
+            if IS_BROWSER:
+                # Hand the rest of the frame budget back to the browser instead of
+                # blocking its single thread inside clock.tick's SDL_Delay
+                elapsed = pygame.time.get_ticks() - frame_start
+                await asyncio.sleep(max(0, FRAME_MS - elapsed) / 1000)
+            else:
+                self.clock.tick(FPS)
+                await asyncio.sleep(0)  # Required for Pygbag
 
+        flush_save(force=True)
         pygame.quit()
 
 